@@ -0,0 +1,456 @@
+import re
+import json
+import hashlib
+import time
+import shutil
+import subprocess
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(content_length) if content_length else b""
+        status, response_body, headers = self.server.fake_server.dispatch(self.command, self.path, body, self.headers.get("If-None-Match"))
+        payload = b""
+        if response_body is not None:
+            payload = response_body.encode() if isinstance(response_body, str) else json.dumps(response_body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if isinstance(response_body, str) else "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeServer:
+
+    # whether a 304 response counts against the rate limit
+    CHARGES_NOT_MODIFIED = True
+
+    def __init__(self, latency=0, rate_limit=None, rate_limit_window=1):
+        self._latency = latency
+        self._rate_limit = rate_limit
+        self._rate_limit_window = rate_limit_window
+        self._routes = []
+        self._lock = threading.Lock()
+        self._window_started_at = time.time()
+        self._window_requests_count = 0
+        self.requests_count = 0
+        self.rate_limited_count = 0
+        self.not_modified_count = 0
+        self._http_server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.fake_server = self
+        self._thread = None
+
+    def get_url(self):
+        host, port = self._http_server.server_address
+        return f"http://{host}:{port}"
+
+    def get_host(self):
+        host, port = self._http_server.server_address
+        return f"{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+    def add_route(self, method, path_pattern, handler):
+        self._routes.append((method, re.compile(f"^{path_pattern}$"), handler))
+
+    def _get_rate_limit_state(self):
+        # a fixed window per server, like the hourly budget of github scaled down to the benchmark
+        with self._lock:
+            now = time.time()
+            if now - self._window_started_at >= self._rate_limit_window:
+                self._window_started_at = now
+                self._window_requests_count = 0
+            self._window_requests_count += 1
+            remaining = self._rate_limit - self._window_requests_count
+            return remaining, self._window_started_at + self._rate_limit_window
+
+    def get_rate_limited_response(self, reset_at):
+        return 429, {"errors": [{"message": "Rate limit exceeded"}]}, {"Retry-After": str(max(1, int(reset_at - time.time()) + 1))}
+
+    def get_rate_limit_headers(self, remaining, reset_at):
+        return {}
+
+    def _get_etag(self, response_body):
+        return '"' + hashlib.sha1(json.dumps(response_body, sort_keys=True).encode()).hexdigest() + '"'
+
+    def _get_response(self, method, path, body):
+        url_parts = urlsplit(path)
+        query = {name: values[0] for name, values in parse_qs(url_parts.query).items()}
+        data = json.loads(body) if body and body.startswith(b"{") else body.decode()
+        for route_method, path_pattern, handler in self._routes:
+            match = path_pattern.match(url_parts.path)
+            if route_method == method and match:
+                return handler(match, query, data)
+        return 404, {"errors": [{"message": f"No fake route for {method} {url_parts.path}"}]}, {}
+
+    def dispatch(self, method, path, body, if_none_match=None):
+        with self._lock:
+            self.requests_count += 1
+        if self._latency:
+            time.sleep(self._latency)
+        rate_limit_headers = {}
+        if self._rate_limit:
+            remaining, reset_at = self._get_rate_limit_state()
+            if remaining < 0:
+                with self._lock:
+                    self.rate_limited_count += 1
+                return self.get_rate_limited_response(reset_at)
+        status, response_body, headers = self._get_response(method, path, body)
+        if method == "GET" and status == 200:
+            headers = dict(headers, ETag=self._get_etag(response_body))
+            if if_none_match == headers["ETag"]:
+                status, response_body = 304, None
+                with self._lock:
+                    self.not_modified_count += 1
+                    if self._rate_limit and not self.CHARGES_NOT_MODIFIED:
+                        self._window_requests_count -= 1
+                        remaining += 1
+        if self._rate_limit:
+            rate_limit_headers = self.get_rate_limit_headers(remaining, reset_at)
+        return status, response_body, dict(rate_limit_headers, **headers)
+
+class FakeBitbucketServer(FakeServer):
+
+    def __init__(self, project_key, repositories, latency=0, rate_limit=None, rate_limit_window=1):
+        super().__init__(latency, rate_limit, rate_limit_window)
+        self._project_key = project_key
+        self._repositories = repositories
+        self._repository_permissions = {
+            repository["name"]: {
+                "groups": {"developers": "REPO_WRITE", "readers": "REPO_READ"},
+                "users": {f"user_{index}": "REPO_ADMIN" for index in range(repository.get("users_count", 2))}
+            }
+            for repository in repositories
+        }
+        self._project_permissions = {"groups": {"developers": "PROJECT_WRITE"}, "users": {"admin": "PROJECT_ADMIN"}}
+        repos_path = f"/rest/api/latest/projects/{project_key}/repos"
+        self.add_route("GET", repos_path, self._get_repositories)
+        self.add_route("GET", f"{repos_path}/([^/]+)/pull-requests", self._get_pull_requests)
+        self.add_route("GET", f"{repos_path}/([^/]+)/(branches|tags)", self._get_refs)
+        self.add_route("GET", f"/projects/{project_key}/repos/([^/]+)/sizes", self._get_sizes)
+        self.add_route("GET", f"{repos_path}/([^/]+)/permissions/(groups|users)", self._get_repository_permissions)
+        self.add_route("PUT", f"{repos_path}/([^/]+)/permissions/(groups|users)", self._set_repository_permission)
+        self.add_route("GET", f"/rest/api/latest/projects/{project_key}/permissions/(groups|users)", self._get_project_permissions)
+        self.add_route("PUT", f"/rest/api/latest/projects/{project_key}/permissions/(groups|users)", self._set_project_permission)
+
+    def _get_page(self, values, query):
+        start = int(query.get("start", 0))
+        limit = int(query.get("limit", 25))
+        page_values = values[start:start + limit]
+        page = {"values": page_values, "start": start, "limit": limit, "size": len(page_values), "isLastPage": start + limit >= len(values)}
+        if not page["isLastPage"]:
+            page["nextPageStart"] = start + limit
+        return 200, page, {}
+
+    def _get_repository(self, repo_name):
+        for repository in self._repositories:
+            if repository["name"] == repo_name:
+                return repository
+        return None
+
+    def _get_repositories(self, match, query, data):
+        return self._get_page([{"name": repository["name"], "slug": repository["name"]} for repository in self._repositories], query)
+
+    def _get_pull_request(self, repo_name, pull_request_id):
+        return {
+            "id": pull_request_id,
+            "title": f"Change {pull_request_id} of {repo_name}",
+            "createdDate": 1700000000000 + pull_request_id * 1000,
+            "updatedDate": 1700000500000 + pull_request_id * 1000,
+            "author": {"user": {"displayName": f"Author {pull_request_id % 7}", "emailAddress": f"author{pull_request_id % 7}@example.com", "name": f"author{pull_request_id % 7}"}},
+            "reviewers": [{"user": {"displayName": f"Reviewer {index}"}} for index in range(pull_request_id % 3)],
+            "links": {"self": [{"href": f"{self.get_url()}/projects/{self._project_key}/repos/{repo_name}/pull-requests/{pull_request_id}"}]},
+            "fromRef": {"displayId": f"feature/{pull_request_id}"},
+            "toRef": {"displayId": "main"},
+            "properties": {"commentCount": pull_request_id % 5}
+        }
+
+    def _get_pull_requests(self, match, query, data):
+        repository = self._get_repository(match.group(1))
+        if not repository:
+            return 404, {"errors": [{"message": "Repository not found"}]}, {}
+        pull_requests = [self._get_pull_request(repository["name"], pull_request_id) for pull_request_id in range(1, repository.get("pull_requests_count", 0) + 1)]
+        return self._get_page(pull_requests, query)
+
+    def _get_refs(self, match, query, data):
+        repository = self._get_repository(match.group(1))
+        if not repository:
+            return 404, {"errors": [{"message": "Repository not found"}]}, {}
+        refs_count = repository.get("branches_count", 1) if match.group(2) == "branches" else repository.get("tags_count", 0)
+        return self._get_page([{"displayId": f"{match.group(2)}-{index}"} for index in range(refs_count)], query)
+
+    def _get_sizes(self, match, query, data):
+        repository = self._get_repository(match.group(1))
+        if not repository:
+            return 404, {"errors": [{"message": "Repository not found"}]}, {}
+        return 200, {"repository": repository.get("size", 0), "attachments": 0}, {}
+
+    def _get_permissions_page(self, permissions, principal_type, query):
+        principal_key = principal_type.removesuffix("s")
+        grants = [{principal_key: {"name": name}, "permission": permission} for name, permission in sorted(permissions[principal_type].items())]
+        return self._get_page(grants, query)
+
+    def _get_repository_permissions(self, match, query, data):
+        return self._get_permissions_page(self._repository_permissions[match.group(1)], match.group(2), query)
+
+    def _set_repository_permission(self, match, query, data):
+        with self._lock:
+            self._repository_permissions[match.group(1)][match.group(2)][query["name"]] = query["permission"]
+        return 204, None, {}
+
+    def _get_project_permissions(self, match, query, data):
+        return self._get_permissions_page(self._project_permissions, match.group(1), query)
+
+    def _set_project_permission(self, match, query, data):
+        with self._lock:
+            self._project_permissions[match.group(1)][query["name"]] = query["permission"]
+        return 204, None, {}
+
+class FakeGithubServer(FakeServer):
+
+    CHARGES_NOT_MODIFIED = False
+
+    def __init__(self, organization, team, repositories_directory, latency=0, rate_limit=None, rate_limit_window=1):
+        super().__init__(latency, rate_limit, rate_limit_window)
+        self._organization = organization
+        self._team = team
+        self._repositories_directory = repositories_directory
+        self._repositories = {}
+        self.add_route("GET", f"/orgs/{organization}/repos", self._get_repositories)
+        self.add_route("POST", f"/orgs/{organization}/repos", self._create_repository)
+        self.add_route("PUT", f"/orgs/{organization}/teams/{team}/repos/{organization}/([^/]+)", self._add_repository_to_team)
+        self.add_route("GET", f"/repos/{organization}/([^/]+)", self._get_repository)
+        self.add_route("DELETE", f"/repos/{organization}/([^/]+)", self._delete_repository)
+        self.add_route("POST", "/graphql", self._execute_graphql_query)
+        self.graphql_requests_count = 0
+
+    def get_rate_limited_response(self, reset_at):
+        return 403, {"message": "API rate limit exceeded"}, self.get_rate_limit_headers(0, reset_at)
+
+    def get_rate_limit_headers(self, remaining, reset_at):
+        return {"X-RateLimit-Remaining": str(max(0, remaining)), "X-RateLimit-Reset": str(int(reset_at) + 1)}
+
+    def get_repository_path(self, repo_name):
+        return f"{self._repositories_directory}/{repo_name}.git"
+
+    def _get_repositories(self, match, query, data):
+        page = int(query.get("page", 1))
+        per_page = int(query.get("per_page", 30))
+        with self._lock:
+            repositories = sorted(self._repositories.values(), key=lambda repository: repository["name"])
+        last_page = max(1, (len(repositories) + per_page - 1) // per_page)
+        headers = {}
+        if last_page > 1:
+            headers["Link"] = f"<{self.get_url()}/orgs/{self._organization}/repos?type={query.get('type', 'all')}&per_page={per_page}&page={last_page}>; rel=\"last\""
+        return 200, repositories[(page - 1) * per_page:page * per_page], headers
+
+    def _add_repository(self, repo_name, is_private):
+        with self._lock:
+            if repo_name.lower() in self._repositories:
+                return None
+            repository = {"name": repo_name, "full_name": f"{self._organization}/{repo_name}", "private": is_private, "node_id": f"R_{repo_name}"}
+            self._repositories[repo_name.lower()] = repository
+        # the pushes of the migration go to a local bare repository standing in for the github one
+        subprocess.run(["git", "init", "--bare", "--quiet", "--initial-branch=main", self.get_repository_path(repo_name)], check=True)
+        return repository
+
+    def _create_repository(self, match, query, data):
+        repository = self._add_repository(data["name"], data.get("private", False))
+        if not repository:
+            return 422, {"message": "Repository creation failed.", "errors": [{"message": "name already exists on this account"}]}, {}
+        return 201, repository, {}
+
+    def _execute_graphql_query(self, match, query, data):
+        # only the queries sent by the github connector are understood, their aliases are found with regular expressions
+        with self._lock:
+            self.graphql_requests_count += 1
+        variables = data.get("variables", {})
+        if data["query"].startswith("query"):
+            return 200, {"data": {"organization": {"id": f"O_{self._organization}", "team": {"id": f"T_{self._team}"}}}}, {}
+        result = {"data": {}, "errors": []}
+        for alias, name_variable in re.findall(r"(\w+): createRepository\(input: \{name: \$(\w+)", data["query"]):
+            repository = self._add_repository(variables[name_variable], True)
+            if repository:
+                result["data"][alias] = {"repository": {"id": repository["node_id"], "name": repository["name"], "url": f"https://github.com/{repository['full_name']}"}}
+            else:
+                result["data"][alias] = None
+                result["errors"].append({"path": [alias], "message": "Name already exists on this account"})
+        for alias, repository_variable in re.findall(r"(\w+): updateTeamsRepository\(input: \{teamIds: \$teamIds, repositoryId: \$(\w+)", data["query"]):
+            with self._lock:
+                is_existing = any(repository["node_id"] == variables[repository_variable] for repository in self._repositories.values())
+            if is_existing:
+                result["data"][alias] = {"clientMutationId": None}
+            else:
+                result["data"][alias] = None
+                result["errors"].append({"path": [alias], "message": "Could not resolve to a node"})
+        if not result["errors"]:
+            del result["errors"]
+        return 200, result, {"X-RateLimit-Resource": "graphql"}
+
+    def _add_repository_to_team(self, match, query, data):
+        with self._lock:
+            if match.group(1).lower() not in self._repositories:
+                return 404, {"message": "Not Found"}, {}
+        return 204, None, {}
+
+    def _get_repository(self, match, query, data):
+        with self._lock:
+            repository = self._repositories.get(match.group(1).lower())
+        if not repository:
+            return 404, {"message": "Not Found"}, {}
+        return 200, repository, {}
+
+    def _delete_repository(self, match, query, data):
+        with self._lock:
+            repository = self._repositories.pop(match.group(1).lower(), None)
+        if not repository:
+            return 404, {"message": "Not Found"}, {}
+        shutil.rmtree(self.get_repository_path(repository["name"]), ignore_errors=True)
+        return 204, None, {}
+
+class FakeTeamcityServer(FakeServer):
+
+    def __init__(self, root_project_id, bitbucket_clone_base_url, bitbucket_host, repo_names, subprojects_count=4, latency=0, rate_limit=None, rate_limit_window=1):
+        super().__init__(latency, rate_limit, rate_limit_window)
+        self._root_project_id = root_project_id
+        self._projects = {root_project_id: []}
+        self._vcs_roots = {}
+        self._buildtypes = {}
+        subprojects_ids = [f"{root_project_id}_Sub{index}" for index in range(subprojects_count)]
+        self._projects[root_project_id] = subprojects_ids
+        for subproject_id in subprojects_ids:
+            self._projects[subproject_id] = []
+        # every repository gets a vcs root and a build type with a bitbucket commit status publisher
+        for index, repo_name in enumerate(repo_names):
+            project_id = subprojects_ids[index % subprojects_count] if subprojects_ids else root_project_id
+            vcs_root_id = f"{project_id}_{re.sub(r'[^A-Za-z0-9]', '', repo_name)}"
+            self._vcs_roots[vcs_root_id] = {
+                "project_id": project_id,
+                "properties": [
+                    {"name": "url", "value": f"{bitbucket_clone_base_url}/{repo_name}.git"},
+                    {"name": "branch", "value": "refs/heads/main"},
+                    {"name": "authMethod", "value": "PASSWORD"},
+                    {"name": "secure:password", "value": "credentials"}
+                ]
+            }
+            self._buildtypes[f"{vcs_root_id}_Build"] = {
+                "project_id": project_id,
+                "features": [
+                    {
+                        "id": "BUILD_EXT_1",
+                        "type": "commit-status-publisher",
+                        "properties": {"property": [
+                            {"name": "publisherId", "value": "atlassianStashPublisher"},
+                            {"name": "stashBaseUrl", "value": f"https://{bitbucket_host}"},
+                            {"name": "vcsRootId", "value": vcs_root_id}
+                        ]}
+                    }
+                ]
+            }
+        self.add_route("GET", r"/app/rest/projects/id:([^/]+)", self._get_project)
+        self.add_route("GET", r"/app/rest/projects/id:([^/]+)/buildTypes", self._get_project_buildtypes)
+        self.add_route("GET", r"/app/rest/vcs-roots", self._get_vcs_roots)
+        self.add_route("GET", r"/app/rest/vcs-roots/(?:id:)?([^/]+)/properties", self._get_vcs_root_properties)
+        self.add_route("PUT", r"/app/rest/vcs-roots/(?:id:)?([^/]+)/properties", self._set_vcs_root_properties)
+        self.add_route("GET", r"/app/rest/buildTypes", self._get_buildtypes)
+        self.add_route("GET", r"/app/rest/buildTypes/id:([^/]+)/features", self._get_buildtype_features)
+        self.add_route("PUT", r"/app/rest/buildTypes/id:([^/]+)/features", self._set_buildtype_features)
+
+    def _get_affected_projects(self, project_id):
+        affected_projects = [project_id]
+        for subproject_id in self._projects.get(project_id, []):
+            affected_projects.extend(self._get_affected_projects(subproject_id))
+        return affected_projects
+
+    def _get_locator_project(self, locator, locator_type):
+        match = re.search(rf"{locator_type}:\(id:([^)]+)\)", locator)
+        return match.group(1) if match else None
+
+    def _get_project(self, match, query, data):
+        project_id = match.group(1)
+        if project_id not in self._projects:
+            return 404, "Project not found", {}
+        return 200, {"id": project_id, "projects": {"project": [{"id": subproject_id} for subproject_id in self._projects[project_id]]}}, {}
+
+    def _get_project_buildtypes(self, match, query, data):
+        return 200, {"buildType": [
+            {"id": buildtype_id, "href": f"/app/rest/buildTypes/id:{buildtype_id}"}
+            for buildtype_id, buildtype in self._buildtypes.items() if buildtype["project_id"] == match.group(1)
+        ]}, {}
+
+    def _get_vcs_roots(self, match, query, data):
+        locator = query.get("locator", "")
+        affected_project_id = self._get_locator_project(locator, "affectedProject")
+        if affected_project_id:
+            projects_ids = self._get_affected_projects(affected_project_id)
+            with self._lock:
+                return 200, {"vcs-root": [
+                    {"id": vcs_root_id, "href": f"/app/rest/vcs-roots/id:{vcs_root_id}", "properties": {"property": list(vcs_root["properties"])}}
+                    for vcs_root_id, vcs_root in self._vcs_roots.items() if vcs_root["project_id"] in projects_ids
+                ]}, {}
+        project_id = self._get_locator_project(locator, "project")
+        return 200, {"vcs-root": [
+            {"id": vcs_root_id, "href": f"/app/rest/vcs-roots/id:{vcs_root_id}"}
+            for vcs_root_id, vcs_root in self._vcs_roots.items() if vcs_root["project_id"] == project_id
+        ]}, {}
+
+    def _get_vcs_root_properties(self, match, query, data):
+        with self._lock:
+            vcs_root = self._vcs_roots.get(match.group(1))
+            if not vcs_root:
+                return 404, "VCS root not found", {}
+            return 200, {"property": list(vcs_root["properties"])}, {}
+
+    def _set_vcs_root_properties(self, match, query, data):
+        with self._lock:
+            vcs_root = self._vcs_roots.get(match.group(1))
+            if not vcs_root:
+                return 404, "VCS root not found", {}
+            vcs_root["properties"] = data["property"]
+            return 200, {"property": data["property"]}, {}
+
+    def _get_buildtypes(self, match, query, data):
+        projects_ids = self._get_affected_projects(self._get_locator_project(query.get("locator", ""), "affectedProject"))
+        with self._lock:
+            return 200, {"buildType": [
+                {"id": buildtype_id, "features": {"feature": list(buildtype["features"])}}
+                for buildtype_id, buildtype in self._buildtypes.items() if buildtype["project_id"] in projects_ids
+            ]}, {}
+
+    def _get_buildtype_features(self, match, query, data):
+        with self._lock:
+            buildtype = self._buildtypes.get(match.group(1))
+            if not buildtype:
+                return 404, "Build type not found", {}
+            return 200, {"feature": list(buildtype["features"])}, {}
+
+    def _set_buildtype_features(self, match, query, data):
+        with self._lock:
+            buildtype = self._buildtypes.get(match.group(1))
+            if not buildtype:
+                return 404, "Build type not found", {}
+            buildtype["features"] = data["feature"]
+            return 200, {"feature": data["feature"]}, {}
@@ -0,0 +1,65 @@
+import os
+import random
+import subprocess
+
+FIXTURE_COMMITTER = "Benchmark <benchmark@example.com>"
+
+def _get_file_contents(random_generator, file_size, urls):
+    # random words do not compress away, so the generated size is close to the transferred size
+    words = []
+    words_size = 0
+    while words_size < file_size:
+        word = "".join(random_generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(random_generator.randint(3, 10)))
+        words.append(word)
+        words_size += len(word) + 1
+    lines = [" ".join(words[index:index + 12]) for index in range(0, len(words), 12)]
+    for url in urls:
+        lines.insert(random_generator.randint(0, len(lines)), f"See {url} for details")
+    return ("\n".join(lines) + "\n").encode()
+
+def _get_fast_import_data(commit_data, contents):
+    return f"data {len(contents)}\n".encode() + contents + b"\n" if commit_data else contents
+
+def create_bare_repository(
+        repository_path,
+        commits_count=20,
+        files_count=10,
+        file_size=4096,
+        branches_count=2,
+        tags_count=2,
+        urls=None,
+        seed=0
+    ):
+    random_generator = random.Random(seed)
+    urls = urls if urls else []
+    os.makedirs(os.path.dirname(repository_path), exist_ok=True)
+    subprocess.run(["git", "init", "--bare", "--quiet", "--initial-branch=main", repository_path], check=True)
+    stream = []
+    timestamp = 1700000000
+    for commit_index in range(commits_count):
+        stream.append(f"commit refs/heads/main\nmark :{commit_index + 1}\ncommitter {FIXTURE_COMMITTER} {timestamp + commit_index * 60} +0000\n".encode())
+        stream.append(_get_fast_import_data(True, f"Generated commit {commit_index + 1}".encode()))
+        if commit_index:
+            stream.append(f"from :{commit_index}\n".encode())
+        # the first commit writes every file, later commits rewrite a few of them
+        changed_files = range(files_count) if commit_index == 0 else random_generator.sample(range(files_count), min(files_count, 2))
+        for file_index in changed_files:
+            file_urls = urls if file_index == 0 else []
+            contents = _get_file_contents(random_generator, file_size, file_urls)
+            file_path = "README.md" if file_index == 0 else f"src/module_{file_index}.txt"
+            stream.append(f"M 100644 inline {file_path}\n".encode())
+            stream.append(_get_fast_import_data(True, contents))
+        stream.append(b"\n")
+    for branch_index in range(branches_count):
+        stream.append(f"reset refs/heads/release/{branch_index}\nfrom :{random_generator.randint(1, commits_count)}\n\n".encode())
+    for tag_index in range(tags_count):
+        stream.append(f"reset refs/tags/v{tag_index}.0\nfrom :{random_generator.randint(1, commits_count)}\n\n".encode())
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=repository_path, input=b"".join(stream), check=True)
+    return repository_path
+
+def get_repository_size(repository_path):
+    size = 0
+    for root, _, files in os.walk(repository_path):
+        for file in files:
+            size += os.path.getsize(os.path.join(root, file))
+    return size
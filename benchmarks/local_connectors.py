@@ -0,0 +1,31 @@
+from src.connectors.bitbucket_connector import BitbucketConnector
+from src.connectors.github_connector import GithubConnector
+from src.connectors.teamcity_connector import TeamcityConnector
+
+class LocalBitbucketConnector(BitbucketConnector):
+
+    def __init__(self, bitbucket_server, repositories_directory, configurations=None):
+        super().__init__(configurations=configurations)
+        # the api is served over plain http and the repositories are cloned from the local file system
+        self.base_url = bitbucket_server.get_url()
+        self.base_url_repos = f"{self.base_url}/rest/api/latest"
+        self._repositories_directory = repositories_directory
+
+    def _get_clone_url(self, repo_name):
+        return f"{self._repositories_directory}/{repo_name}.git"
+
+class LocalGithubConnector(GithubConnector):
+
+    def __init__(self, github_server, configurations=None):
+        super().__init__(configurations=configurations)
+        self._github_api_base_url = github_server.get_url()
+        self._github_server = github_server
+
+    def _get_push_url(self, repo_name):
+        return self._github_server.get_repository_path(repo_name)
+
+class LocalTeamcityConnector(TeamcityConnector):
+
+    def __init__(self, teamcity_server, configurations=None):
+        super().__init__(configurations=configurations)
+        self._base_url = f"{teamcity_server.get_url()}/app/rest"
@@ -0,0 +1,355 @@
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import tracemalloc
+import contextlib
+import dataclasses
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.configs.configurations import ConfigurationsSnapshot
+from src.connectors.http_transport import HttpTransport
+from src.connectors.github_rate_governor import GithubRateGovernor
+from src.connectors.git_executor import GitExecutor
+from src.connectors.metrics_registry import MetricsRegistry
+from src.models.github_migration_model import GithubMigrationModel
+from benchmarks.fake_servers import FakeBitbucketServer, FakeGithubServer, FakeTeamcityServer
+from benchmarks.git_fixtures import create_bare_repository, get_repository_size
+from benchmarks.local_connectors import LocalBitbucketConnector, LocalGithubConnector, LocalTeamcityConnector
+
+BITBUCKET_SERVER_HOST = "bitbucket.benchmark.local"
+BITBUCKET_CLONE_URI = "/scm/bench/"
+BITBUCKET_PROJECT_KEY = "BENCH"
+GITHUB_ORGANIZATION = "benchmark-org"
+GITHUB_TEAM = "benchmark-team"
+GITHUB_API_TOKEN = "benchmark-token"
+TEAMCITY_PROJECT_ID = "Benchmark"
+# metrics compared against the baseline, and whether a higher value is better
+COMPARED_METRICS = {"duration_seconds": False, "repositories_per_hour": True, "peak_memory_mb": False}
+
+def _get_arguments():
+    parser = argparse.ArgumentParser(description="Run the migration end to end against local stand-in Bitbucket, GitHub and TeamCity servers.")
+    parser.add_argument("--repositories", type=int, default=20, help="number of generated repositories")
+    parser.add_argument("--commits", type=int, default=30, help="commits per generated repository")
+    parser.add_argument("--files", type=int, default=10, help="files per generated repository")
+    parser.add_argument("--file-size", type=int, default=8192, help="size in bytes of each generated file")
+    parser.add_argument("--pull-requests", type=int, default=5, help="open pull requests per repository")
+    parser.add_argument("--latency-ms", type=float, default=20, help="latency added to every api call of the fake servers")
+    parser.add_argument("--github-rate-limit", type=int, default=0, help="github api calls allowed per rate limit window, 0 for no limit")
+    parser.add_argument("--bitbucket-rate-limit", type=int, default=0, help="bitbucket api calls allowed per rate limit window, 0 for no limit")
+    parser.add_argument("--teamcity-rate-limit", type=int, default=0, help="teamcity api calls allowed per rate limit window, 0 for no limit")
+    parser.add_argument("--rate-limit-window", type=float, default=1, help="rate limit window in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="migration workers count")
+    parser.add_argument("--pipeline", action="store_true", help="migrate with the staged pipeline, --workers is used as the workers count of every stage")
+    parser.add_argument("--bulk-create", action="store_true", help="create the github repositories with batched GraphQL mutations before migrating them")
+    parser.add_argument("--disk-admission", action="store_true", help="admit repositories according to the free disk space, without keeping any space free")
+    parser.add_argument("--content-creation-interval", type=float, default=0, help="seconds between github content creating requests")
+    parser.add_argument("--http-cache", action="store_true", help="enable the http response cache of the connectors")
+    parser.add_argument("--scenarios", default="csv,migrate,update_urls", help="comma separated scenarios to run")
+    parser.add_argument("--output", help="json file to save the results to")
+    parser.add_argument("--baseline", help="json results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression against the baseline")
+    parser.add_argument("--keep-directory", action="store_true", help="keep the working directory with the logs and repositories")
+    parser.add_argument("--verbose", action="store_true", help="print the migration output instead of saving it to the log file")
+    return parser.parse_args()
+
+def _get_repositories(arguments, bitbucket_repositories_directory):
+    repo_names = [f"repo-{index:04d}" for index in range(arguments.repositories)]
+    repositories = []
+    for index, repo_name in enumerate(repo_names):
+        # every readme references two other repositories with both bitbucket url forms
+        referenced_repo_names = [repo_names[(index + 1) % len(repo_names)], repo_names[(index + 2) % len(repo_names)]]
+        urls = []
+        for referenced_repo_name in referenced_repo_names:
+            urls.append(f"https://{BITBUCKET_SERVER_HOST}/projects/{BITBUCKET_PROJECT_KEY}/repos/{referenced_repo_name}")
+            urls.append(f"https://{BITBUCKET_SERVER_HOST}{BITBUCKET_CLONE_URI}{referenced_repo_name}.git")
+        # sizes vary from one to three times the configured commits so that the planner has something to order
+        repository_path = create_bare_repository(
+            f"{bitbucket_repositories_directory}/{repo_name}.git",
+            commits_count=arguments.commits * (1 + index % 3),
+            files_count=arguments.files,
+            file_size=arguments.file_size,
+            branches_count=1 + index % 4,
+            tags_count=index % 5,
+            urls=urls,
+            seed=index
+        )
+        repositories.append({
+            "name": repo_name,
+            "size": get_repository_size(repository_path),
+            "branches_count": 2 + index % 4,
+            "tags_count": index % 5,
+            "pull_requests_count": arguments.pull_requests
+        })
+    return repositories
+
+def _get_configurations(arguments, working_directory):
+    return ConfigurationsSnapshot(
+        git_repos_directory=f"{working_directory}/migration",
+        bitbucket_username="benchmark",
+        bitbucket_password="benchmark",
+        bitbucket_server_host=BITBUCKET_SERVER_HOST,
+        bitbucket_clone_url=BITBUCKET_CLONE_URI,
+        bitbucket_project_key=BITBUCKET_PROJECT_KEY,
+        teamcity_token="benchmark",
+        teamcity_server_host="teamcity.benchmark.local",
+        teamcity_project_id=TEAMCITY_PROJECT_ID,
+        github_api_token=GITHUB_API_TOKEN,
+        github_organization=GITHUB_ORGANIZATION,
+        github_team=GITHUB_TEAM,
+        github_ssh_private_key="benchmark",
+        migration_workers_count=arguments.workers,
+        github_content_creation_interval_seconds=arguments.content_creation_interval,
+        ff_enable_http_cache=arguments.http_cache,
+        ff_enable_migration_pipeline=arguments.pipeline,
+        ff_enable_github_bulk_create=arguments.bulk_create,
+        ff_enable_disk_admission=arguments.disk_admission,
+        disk_admission_min_free_gb=0,
+        migration_pipeline_fetch_workers=arguments.workers,
+        migration_pipeline_create_workers=arguments.workers,
+        migration_pipeline_push_workers=arguments.workers,
+        migration_pipeline_post_workers=arguments.workers,
+        http_backoff_factor_seconds=0.05
+    )
+
+def _set_shared_connections(configurations):
+    # the shared transport, governor and git executor would otherwise be configured from the .env file
+    HttpTransport._shared_transport = HttpTransport(configurations=configurations)
+    GitExecutor._shared_executor = GitExecutor(configurations=configurations)
+    GithubRateGovernor._shared_governors[configurations.github_api_token] = GithubRateGovernor(configurations=configurations)
+
+def _write_repositories_csv(csv_file_path, repositories):
+    with open(csv_file_path, mode="w", newline='') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=["bitbucket_repository", "github_repository"])
+        writer.writeheader()
+        for repository in repositories:
+            writer.writerow({"bitbucket_repository": repository["name"], "github_repository": repository["name"]})
+
+class BenchmarkContext:
+
+    def __init__(self, arguments, working_directory, servers, configurations, repositories_csv_file):
+        self.arguments = arguments
+        self.working_directory = working_directory
+        self.servers = servers
+        self.configurations = configurations
+        self.repositories_csv_file = repositories_csv_file
+        self.bitbucket_repositories_directory = f"{working_directory}/bitbucket"
+
+    def get_bitbucket_connector(self, configurations=None):
+        return LocalBitbucketConnector(self.servers["bitbucket"], self.bitbucket_repositories_directory, configurations=configurations if configurations else self.configurations)
+
+    def get_github_connector(self, configurations=None):
+        return LocalGithubConnector(self.servers["github"], configurations=configurations if configurations else self.configurations)
+
+    def get_teamcity_connector(self, configurations=None):
+        return LocalTeamcityConnector(self.servers["teamcity"], configurations=configurations if configurations else self.configurations)
+
+    def get_migration_model(self, configurations):
+        return GithubMigrationModel(
+            self.repositories_csv_file,
+            configurations=configurations,
+            bitbucket_connector=self.get_bitbucket_connector(configurations),
+            github_connector=self.get_github_connector(configurations),
+            teamcity_connector=self.get_teamcity_connector(configurations)
+        )
+
+def run_csv_scenario(context):
+    csv_directory = f"{context.working_directory}/csv"
+    os.makedirs(csv_directory, exist_ok=True)
+    bitbucket_connector = context.get_bitbucket_connector()
+    teamcity_connector = context.get_teamcity_connector()
+    bitbucket_connector.generate_repository_list_csv(f"{csv_directory}/bitbucket_repositories.csv")
+    bitbucket_connector.generate_open_pull_requests_csv(f"{csv_directory}/bitbucket_open_pull_requests.csv")
+    teamcity_connector.generate_vcs_roots_csv(TEAMCITY_PROJECT_ID, f"{csv_directory}/teamcity_vcs_roots.csv")
+    teamcity_connector.generate_buildtypes_csv(TEAMCITY_PROJECT_ID, f"{csv_directory}/teamcity_buildtypes.csv")
+    return 0
+
+def run_migrate_scenario(context):
+    configurations = dataclasses.replace(
+        context.configurations,
+        ff_enable_migration_planner=True,
+        ff_enable_bitbucket_set_repo_read_only=True,
+        ff_enable_teamcity_update_vcs_url=True,
+        ff_enable_teamcity_update_commit_status_publisher=True,
+        ff_enable_bitbukcet_set_project_to_read_only=True
+    )
+    results = context.get_migration_model(configurations).migrate_repositories()
+    failed_results = [result for result in results if result["status"] == "failed"]
+    if failed_results:
+        raise RuntimeError(f"{len(failed_results)} repositories have failed to migrate, first error: {failed_results[0]['error']}")
+    return len(results)
+
+def run_update_urls_scenario(context):
+    configurations = dataclasses.replace(context.configurations, ff_enable_update_urls_in_all_files=True)
+    migration_model = context.get_migration_model(configurations)
+    migration_model.update_repositories_urls()
+    return context.arguments.repositories
+
+SCENARIOS = {
+    "csv": run_csv_scenario,
+    "migrate": run_migrate_scenario,
+    "update_urls": run_update_urls_scenario
+}
+
+def _get_api_calls(metrics_registry):
+    return {service: metrics_registry.get_counter_total("migration_api_calls", {"service": service}) for service in ["bitbucket", "github", "teamcity"]}
+
+def _get_http_cache_requests(metrics_registry):
+    return {result: metrics_registry.get_counter_total("migration_http_cache_requests", {"result": result}) for result in ["hit", "revalidated", "miss"]}
+
+def _run_scenario(name, context, log_file):
+    metrics_registry = MetricsRegistry.shared()
+    api_calls_before = _get_api_calls(metrics_registry)
+    http_cache_requests_before = _get_http_cache_requests(metrics_registry)
+    server_requests_before = {server_name: server.requests_count for server_name, server in context.servers.items()}
+    rate_limited_before = {server_name: server.rate_limited_count for server_name, server in context.servers.items()}
+    tracemalloc.reset_peak()
+    start_time = time.time()
+    with contextlib.redirect_stdout(log_file) if log_file else contextlib.nullcontext():
+        repositories_count = SCENARIOS[name](context)
+    duration = time.time() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    api_calls_after = _get_api_calls(metrics_registry)
+    http_cache_requests_after = _get_http_cache_requests(metrics_registry)
+    result = {
+        "duration_seconds": round(duration, 3),
+        "api_calls": {service: api_calls_after[service] - api_calls_before[service] for service in api_calls_after},
+        "server_requests": {server_name: server.requests_count - server_requests_before[server_name] for server_name, server in context.servers.items()},
+        "http_cache_requests": {result: http_cache_requests_after[result] - http_cache_requests_before[result] for result in http_cache_requests_after},
+        "rate_limited_requests": {server_name: server.rate_limited_count - rate_limited_before[server_name] for server_name, server in context.servers.items()},
+        "peak_memory_mb": round(peak_memory / 1024 ** 2, 2)
+    }
+    if repositories_count:
+        result["repositories_per_hour"] = round(repositories_count / duration * 3600, 1)
+    return result
+
+def _get_max_rss_mb():
+    # ru_maxrss is in KiB on linux, git subprocesses are accounted as children
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    }
+
+def _print_results(results):
+    headers = ["scenario", "duration", "repos/hour", "bitbucket", "github", "teamcity", "cache hits", "rate limited", "peak memory"]
+    rows = []
+    for name, result in results["scenarios"].items():
+        rows.append([
+            name,
+            f"{result['duration_seconds']:.1f}s",
+            f"{result['repositories_per_hour']:.0f}" if "repositories_per_hour" in result else "-",
+            str(result["api_calls"]["bitbucket"]),
+            str(result["api_calls"]["github"]),
+            str(result["api_calls"]["teamcity"]),
+            str(result["http_cache_requests"]["hit"] + result["http_cache_requests"]["revalidated"]),
+            str(sum(result["rate_limited_requests"].values())),
+            f"{result['peak_memory_mb']:.1f} MB"
+        ])
+    MetricsRegistry.print_table(headers, rows)
+    print(f"Max RSS: {results['max_rss_mb']['self']} MB (benchmark process), {results['max_rss_mb']['children']} MB (git subprocesses)")
+
+def _get_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results["scenarios"].items():
+        baseline_result = baseline.get("scenarios", {}).get(name)
+        if not baseline_result:
+            continue
+        for metric, is_higher_better in COMPARED_METRICS.items():
+            if metric not in result or not baseline_result.get(metric):
+                continue
+            change = (result[metric] - baseline_result[metric]) / baseline_result[metric]
+            if (is_higher_better and change < -tolerance) or (not is_higher_better and change > tolerance):
+                regressions.append(f"{name} {metric}: {baseline_result[metric]} -> {result[metric]} ({change:+.0%})")
+    return regressions
+
+def main():
+    arguments = _get_arguments()
+    scenarios = [scenario.strip() for scenario in arguments.scenarios.split(",") if scenario.strip()]
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{scenario}', expected one of: {', '.join(SCENARIOS)}")
+    working_directory = tempfile.mkdtemp(prefix="migration_benchmark_")
+    # the github connector writes its ssh key in the home directory, a dummy one keeps the real one untouched
+    os.environ["HOME"] = f"{working_directory}/home"
+    os.makedirs(f"{working_directory}/home/.ssh")
+    with open(f"{working_directory}/home/.ssh/id_rsa", "w") as ssh_key_file:
+        ssh_key_file.write("benchmark")
+    for variable, value in [("GIT_AUTHOR_NAME", "Benchmark"), ("GIT_AUTHOR_EMAIL", "benchmark@example.com"), ("GIT_COMMITTER_NAME", "Benchmark"), ("GIT_COMMITTER_EMAIL", "benchmark@example.com")]:
+        os.environ[variable] = value
+
+    print(f"Generating {arguments.repositories} repositories in '{working_directory}'...")
+    bitbucket_repositories_directory = f"{working_directory}/bitbucket"
+    repositories = _get_repositories(arguments, bitbucket_repositories_directory)
+    latency = arguments.latency_ms / 1000
+    servers = {
+        "bitbucket": FakeBitbucketServer(BITBUCKET_PROJECT_KEY, repositories, latency, arguments.bitbucket_rate_limit, arguments.rate_limit_window),
+        "github": FakeGithubServer(GITHUB_ORGANIZATION, GITHUB_TEAM, f"{working_directory}/github", latency, arguments.github_rate_limit, arguments.rate_limit_window),
+        "teamcity": FakeTeamcityServer(
+            TEAMCITY_PROJECT_ID,
+            f"https://{BITBUCKET_SERVER_HOST}{BITBUCKET_CLONE_URI.removesuffix('/')}",
+            BITBUCKET_SERVER_HOST,
+            [repository["name"] for repository in repositories],
+            latency=latency,
+            rate_limit=arguments.teamcity_rate_limit,
+            rate_limit_window=arguments.rate_limit_window
+        )
+    }
+    os.makedirs(f"{working_directory}/github")
+    for server in servers.values():
+        server.start()
+    configurations = _get_configurations(arguments, working_directory)
+    _set_shared_connections(configurations)
+    repositories_csv_file = f"{working_directory}/repositories.csv"
+    _write_repositories_csv(repositories_csv_file, repositories)
+    context = BenchmarkContext(arguments, working_directory, servers, configurations, repositories_csv_file)
+
+    results = {
+        "parameters": {key: value for key, value in vars(arguments).items() if key not in ["output", "baseline", "keep_directory", "verbose"]},
+        "scenarios": {}
+    }
+    log_file_path = f"{working_directory}/benchmark.log"
+    tracemalloc.start()
+    try:
+        with open(log_file_path, "w") as log_file:
+            for scenario in scenarios:
+                print(f"Running '{scenario}' scenario...")
+                results["scenarios"][scenario] = _run_scenario(scenario, context, None if arguments.verbose else log_file)
+    except Exception as e:
+        print(f"Error: Benchmark has failed: {e}, see the log file '{log_file_path}'")
+        arguments.keep_directory = True
+        raise
+    finally:
+        tracemalloc.stop()
+        for server in servers.values():
+            server.stop()
+        if arguments.keep_directory:
+            print(f"Working directory kept in '{working_directory}'")
+        else:
+            shutil.rmtree(working_directory, ignore_errors=True)
+    results["max_rss_mb"] = _get_max_rss_mb()
+    _print_results(results)
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+        print(f"Benchmark results saved to '{arguments.output}'")
+    if arguments.baseline:
+        with open(arguments.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = _get_regressions(results, baseline, arguments.tolerance)
+        if regressions:
+            print(f"Error: Performance regressions beyond {arguments.tolerance:.0%} of the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No performance regression beyond {arguments.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
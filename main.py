@@ -18,6 +18,10 @@ def set_bitbucket_repository_to_read_only(repo_name):
     bitbucket_connector = BitbucketConnector()
     bitbucket_connector.set_repository_read_only(repo_name)
   
+def set_csv_repositories_to_read_only_on_bitbucket(repositories_csv_file, snapshot_file_path):
+    github_migrator = GithubMigrationModel(repositories_csv_file)
+    github_migrator.set_csv_repositories_read_only_on_bitbucket(snapshot_file_path)
+
 def set_bitbucket_project_to_read_only():
     bitbucket_connector = BitbucketConnector()
     bitbucket_connector.set_project_read_only()
@@ -38,6 +42,10 @@ def update_buildtype_commit_status_publisher(buildtype_id):
     teamcity_connector = TeamcityConnector()
     teamcity_connector.update_buildtype_commit_status_publisher(buildtype_id)
 
+def update_project_buildtypes_commit_status_publisher(project_id):
+    teamcity_connector = TeamcityConnector()
+    teamcity_connector.update_buildtypes_commit_status_publisher(project_id)
+
 def generate_teamcity_buildtype_csv(project_id, output_csv_file_path):
     teamcity_connector = TeamcityConnector()
     teamcity_connector.generate_buildtypes_csv(project_id, output_csv_file_path)
@@ -59,6 +67,10 @@ def migrate_repositories(input_csv_file_path):
     github_migrator.print_repositories()
     github_migrator.migrate_repositories()
 
+def plan_migration(input_csv_file_path, output_csv_file_path):
+    github_migrator = GithubMigrationModel(input_csv_file_path)
+    github_migrator.plan_migration(output_csv_file_path)
+
 def generate_open_pull_requests_in_bitbucket_csv(output_csv_file_path):
     bitbucket_connector = BitbucketConnector()
     bitbucket_connector.generate_open_pull_requests_csv(output_csv_file_path)
@@ -75,6 +87,10 @@ def delete_testing_repositories_on_github(repositories_csv_file, prefix):
     github_migrator = GithubMigrationModel(repositories_csv_file)
     github_migrator.delete_testing_repositories_on_github(prefix)
 
+def get_bitbucket_repositories_vcs_roots(repositories_csv_file):
+    github_migrator = GithubMigrationModel(repositories_csv_file)
+    github_migrator.get_bitbucket_repositories_vcs_roots()
+
 def main_functionality():
     if not os.path.exists(CSV_FILES_DIRECTORY):
         os.makedirs(CSV_FILES_DIRECTORY)
@@ -87,6 +103,11 @@ def main_functionality():
     # repo_name = "hazem_test"
     # set_bitbucket_repository_to_read_only(repo_name)
     
+    # # ===================================================================
+    # input_csv_file_path = f"{CSV_FILES_DIRECTORY}/repositories.csv"
+    # snapshot_file_path = f"{CSV_FILES_DIRECTORY}/bitbucket_permissions_snapshot.json"
+    # set_csv_repositories_to_read_only_on_bitbucket(input_csv_file_path, snapshot_file_path)
+    
     # # ===================================================================
     # project_id = "Mapping_Playground"
     # output_csv_file_path = f"{CSV_FILES_DIRECTORY}/vcs_roots.csv"
@@ -101,6 +122,10 @@ def main_functionality():
     # buildtype_id = ""
     # update_buildtype_commit_status_publisher(buildtype_id)
     
+    # # ===================================================================
+    # project_id = "Mapping_Playground"
+    # update_project_buildtypes_commit_status_publisher(project_id)
+    
     # # ===================================================================
     # project_id = "Mapping_Playground"
     # output_csv_file_path = f"{CSV_FILES_DIRECTORY}/buildtypes.csv"
@@ -132,6 +157,11 @@ def main_functionality():
     input_csv_file_path = f"{CSV_FILES_DIRECTORY}/repositories.csv"
     migrate_repositories(input_csv_file_path)
     
+    # # ===================================================================
+    # input_csv_file_path = f"{CSV_FILES_DIRECTORY}/repositories.csv"
+    # output_csv_file_path = f"{CSV_FILES_DIRECTORY}/migration_plan.csv"
+    # plan_migration(input_csv_file_path, output_csv_file_path)
+    
     # # ===================================================================
     # output_csv_file_path = f"{CSV_FILES_DIRECTORY}/open_pull_requests.csv"
     # generate_open_pull_requests_in_bitbucket_csv(output_csv_file_path)
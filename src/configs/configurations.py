@@ -1,86 +1,355 @@
 import os
-from dotenv import load_dotenv
+import time
+import threading
+from typing import Optional
+from dataclasses import dataclass, field, fields
+from dotenv import dotenv_values, find_dotenv
+
+@dataclass(frozen=True)
+class ConfigurationsSnapshot:
+    debug_enabled: bool = field(default=False, metadata={"variable": "DEBUG_ENABLED"})
+    git_repos_directory: Optional[str] = field(default=None, metadata={"variable": "GIT_REPOS_DIRECTORY"})
+    teams_webhook_url: Optional[str] = field(default=None, metadata={"variable": "TEAMS_WEBHOOK_URL"})
+    bitbucket_username: Optional[str] = field(default=None, metadata={"variable": "BITBUCKET_USERNAME"})
+    bitbucket_password: Optional[str] = field(default=None, metadata={"variable": "BITBUCKET_PASSWORD"})
+    bitbucket_server_host: Optional[str] = field(default=None, metadata={"variable": "BITBUCKET_SERVER_HOST"})
+    bitbucket_clone_url: Optional[str] = field(default=None, metadata={"variable": "BITBUCKET_CLONE_URI"})
+    bitbucket_project_key: Optional[str] = field(default=None, metadata={"variable": "BITBUCKET_PROJECT_KEY"})
+    teamcity_token: Optional[str] = field(default=None, metadata={"variable": "TEAMCITY_TOKEN"})
+    teamcity_server_host: Optional[str] = field(default=None, metadata={"variable": "TEAMCITY_SERVER_HOST"})
+    teamcity_project_id: Optional[str] = field(default=None, metadata={"variable": "TEAMCITY_PROJECT_ID"})
+    github_api_token: Optional[str] = field(default=None, metadata={"variable": "GITHUB_API_TOKEN"})
+    github_organization: Optional[str] = field(default=None, metadata={"variable": "GITHUB_ORGANIZATION"})
+    github_team: Optional[str] = field(default=None, metadata={"variable": "GITHUB_TEAM"})
+    github_ssh_private_key: Optional[str] = field(default=None, metadata={"variable": "GITHUB_SSH_PRIVATE_KEY"})
+    ff_cleanup_testing_repository: bool = field(default=False, metadata={"variable": "FF_CLEANUP_TESTING_REPOSITORY"})
+    ff_enable_bitbucket_set_repo_read_only: bool = field(default=False, metadata={"variable": "FF_ENABLE_BITBUCKET_SET_REPO_READ_ONLY"})
+    ff_enable_teamcity_update_vcs_url: bool = field(default=False, metadata={"variable": "FF_ENABLE_TEAMCITY_UPDATE_VCS_URL"})
+    ff_enable_teamcity_update_commit_status_publisher: bool = field(default=False, metadata={"variable": "FF_ENABLE_TEAMCITY_UPDATE_COMMIT_STATUS_PUBLISHER"})
+    ff_enable_update_urls_in_readme_file: bool = field(default=False, metadata={"variable": "FF_ENABLE_UPDATE_URLS_IN_README_FILE"})
+    ff_enable_update_urls_in_all_files: bool = field(default=False, metadata={"variable": "FF_ENABLE_UPDATE_URLS_IN_ALL_FILES"})
+    ff_enable_update_urls_in_map_repo: bool = field(default=False, metadata={"variable": "FF_ENABLE_UPDATE_URLS_IN_MAP_REPO"})
+    ff_enable_update_urls_in_confluence: bool = field(default=False, metadata={"variable": "FF_ENABLE_UPDATE_URLS_IN_CONFLUENCE"})
+    ff_enable_teams_notification: bool = field(default=False, metadata={"variable": "FF_ENABLE_TEAMS_NOTIFICATION"})
+    ff_enable_mock_migration: bool = field(default=False, metadata={"variable": "FF_ENABLE_MOCK_MIGRATION"})
+    ff_enable_bitbukcet_set_project_to_read_only: bool = field(default=False, metadata={"variable": "FF_ENABLE_BITBUKCET_SET_PROJECT_TO_READ_ONLY"})
+    migration_workers_count: int = field(default=1, metadata={"variable": "MIGRATION_WORKERS_COUNT"})
+    http_pool_size: int = field(default=10, metadata={"variable": "HTTP_POOL_SIZE"})
+    http_timeout_seconds: float = field(default=60.0, metadata={"variable": "HTTP_TIMEOUT_SECONDS"})
+    http_max_retries: int = field(default=5, metadata={"variable": "HTTP_MAX_RETRIES"})
+    http_backoff_factor_seconds: float = field(default=0.5, metadata={"variable": "HTTP_BACKOFF_FACTOR_SECONDS"})
+    http_max_backoff_seconds: float = field(default=30.0, metadata={"variable": "HTTP_MAX_BACKOFF_SECONDS"})
+    teamcity_max_concurrency: int = field(default=8, metadata={"variable": "TEAMCITY_MAX_CONCURRENCY"})
+    github_max_concurrency: int = field(default=8, metadata={"variable": "GITHUB_MAX_CONCURRENCY"})
+    github_content_creation_interval_seconds: float = field(default=1.0, metadata={"variable": "GITHUB_CONTENT_CREATION_INTERVAL_SECONDS"})
+    migration_journal_file: Optional[str] = field(default=None, metadata={"variable": "MIGRATION_JOURNAL_FILE"})
+    ff_enable_mirror_cache: bool = field(default=False, metadata={"variable": "FF_ENABLE_MIRROR_CACHE"})
+    mirror_cache_directory: Optional[str] = field(default=None, metadata={"variable": "MIRROR_CACHE_DIRECTORY"})
+    mirror_cache_max_size_gb: float = field(default=100.0, metadata={"variable": "MIRROR_CACHE_MAX_SIZE_GB"})
+    ff_enable_chunked_push: bool = field(default=False, metadata={"variable": "FF_ENABLE_CHUNKED_PUSH"})
+    github_push_chunk_size: int = field(default=5000, metadata={"variable": "GITHUB_PUSH_CHUNK_SIZE"})
+    github_push_refs_batch_size: int = field(default=100, metadata={"variable": "GITHUB_PUSH_REFS_BATCH_SIZE"})
+    bitbucket_max_concurrency: int = field(default=8, metadata={"variable": "BITBUCKET_MAX_CONCURRENCY"})
+    ff_enable_migration_planner: bool = field(default=False, metadata={"variable": "FF_ENABLE_MIGRATION_PLANNER"})
+    migration_estimated_throughput_mbps: float = field(default=10.0, metadata={"variable": "MIGRATION_ESTIMATED_THROUGHPUT_MBPS"})
+    migration_estimated_repository_overhead_seconds: float = field(default=10.0, metadata={"variable": "MIGRATION_ESTIMATED_REPOSITORY_OVERHEAD_SECONDS"})
+    migration_estimated_seconds_per_ref: float = field(default=0.05, metadata={"variable": "MIGRATION_ESTIMATED_SECONDS_PER_REF"})
+    configurations_reload_interval_seconds: float = field(default=0.0, metadata={"variable": "CONFIGURATIONS_RELOAD_INTERVAL_SECONDS"})
+    teams_notification_queue_size: int = field(default=1000, metadata={"variable": "TEAMS_NOTIFICATION_QUEUE_SIZE"})
+    teams_notification_digest_interval_seconds: float = field(default=30.0, metadata={"variable": "TEAMS_NOTIFICATION_DIGEST_INTERVAL_SECONDS"})
+    teams_notification_max_retries: int = field(default=5, metadata={"variable": "TEAMS_NOTIFICATION_MAX_RETRIES"})
+    metrics_textfile_path: Optional[str] = field(default=None, metadata={"variable": "METRICS_TEXTFILE_PATH"})
+    ff_enable_http_cache: bool = field(default=False, metadata={"variable": "FF_ENABLE_HTTP_CACHE"})
+    http_cache_directory: Optional[str] = field(default=None, metadata={"variable": "HTTP_CACHE_DIRECTORY"})
+    http_cache_max_entries: int = field(default=1000, metadata={"variable": "HTTP_CACHE_MAX_ENTRIES"})
+    git_command_timeout_seconds: float = field(default=0.0, metadata={"variable": "GIT_COMMAND_TIMEOUT_SECONDS"})
+    git_batch_max_processes: int = field(default=16, metadata={"variable": "GIT_BATCH_MAX_PROCESSES"})
+    ff_enable_migration_pipeline: bool = field(default=False, metadata={"variable": "FF_ENABLE_MIGRATION_PIPELINE"})
+    migration_pipeline_fetch_workers: int = field(default=2, metadata={"variable": "MIGRATION_PIPELINE_FETCH_WORKERS"})
+    migration_pipeline_create_workers: int = field(default=2, metadata={"variable": "MIGRATION_PIPELINE_CREATE_WORKERS"})
+    migration_pipeline_push_workers: int = field(default=2, metadata={"variable": "MIGRATION_PIPELINE_PUSH_WORKERS"})
+    migration_pipeline_post_workers: int = field(default=2, metadata={"variable": "MIGRATION_PIPELINE_POST_WORKERS"})
+    migration_pipeline_queue_size: int = field(default=2, metadata={"variable": "MIGRATION_PIPELINE_QUEUE_SIZE"})
+    ff_enable_disk_admission: bool = field(default=False, metadata={"variable": "FF_ENABLE_DISK_ADMISSION"})
+    disk_admission_min_free_gb: float = field(default=5.0, metadata={"variable": "DISK_ADMISSION_MIN_FREE_GB"})
+    trash_directory: Optional[str] = field(default=None, metadata={"variable": "TRASH_DIRECTORY"})
+    ff_enable_github_bulk_create: bool = field(default=False, metadata={"variable": "FF_ENABLE_GITHUB_BULK_CREATE"})
+    github_bulk_create_batch_size: int = field(default=25, metadata={"variable": "GITHUB_BULK_CREATE_BATCH_SIZE"})
 
 class Configurations:
+
+    _snapshot = None
+    _variables = {}
+    _dotenv_file_path = ""
+    _dotenv_file_mtime = None
+    _next_reload_check_at = 0
+    _snapshot_lock = threading.Lock()
+
+    def _get_dotenv_file_mtime(dotenv_file_path):
+        if not dotenv_file_path or not os.path.exists(dotenv_file_path):
+            return None
+        return os.path.getmtime(dotenv_file_path)
+
+    def _parse_variable_value(snapshot_field, value):
+        if snapshot_field.type is bool:
+            return value == "1"
+        if value is None or value == "":
+            return snapshot_field.default
+        variable_name = snapshot_field.metadata["variable"]
+        if snapshot_field.type is int:
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f"Invalid value '{value}' for {variable_name}, an integer is expected.")
+        if snapshot_field.type is float:
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Invalid value '{value}' for {variable_name}, a number is expected.")
+        return value
+
+    def _load_snapshot():
+        dotenv_file_path = find_dotenv()
+        # variables exported in the environment take precedence over the .env file, as with load_dotenv
+        variables = dict(dotenv_values(dotenv_file_path)) if dotenv_file_path else {}
+        variables.update(os.environ)
+        snapshot_values = {}
+        for snapshot_field in fields(ConfigurationsSnapshot):
+            variable_value = variables.get(snapshot_field.metadata["variable"])
+            snapshot_values[snapshot_field.name] = Configurations._parse_variable_value(snapshot_field, variable_value)
+        Configurations._snapshot = ConfigurationsSnapshot(**snapshot_values)
+        Configurations._variables = variables
+        Configurations._dotenv_file_path = dotenv_file_path
+        Configurations._dotenv_file_mtime = Configurations._get_dotenv_file_mtime(dotenv_file_path)
+        Configurations._next_reload_check_at = time.time() + Configurations._snapshot.configurations_reload_interval_seconds
+        return Configurations._snapshot
+
+    def snapshot():
+        # a reload only replaces the snapshot returned from now on, components keep the snapshot they were built with
+        current_snapshot = Configurations._snapshot
+        if current_snapshot is not None and current_snapshot.configurations_reload_interval_seconds <= 0:
+            return current_snapshot
+        with Configurations._snapshot_lock:
+            if Configurations._snapshot is None:
+                return Configurations._load_snapshot()
+            if time.time() >= Configurations._next_reload_check_at:
+                return Configurations._reload_if_changed()
+            return Configurations._snapshot
+
+    def _reload_if_changed():
+        Configurations._next_reload_check_at = time.time() + Configurations._snapshot.configurations_reload_interval_seconds
+        if Configurations._get_dotenv_file_mtime(Configurations._dotenv_file_path) == Configurations._dotenv_file_mtime:
+            return Configurations._snapshot
+        print(f"Configurations file '{Configurations._dotenv_file_path}' has changed, reloading configurations...")
+        return Configurations._load_snapshot()
+
+    def reload_if_changed():
+        with Configurations._snapshot_lock:
+            if Configurations._snapshot is None:
+                return Configurations._load_snapshot()
+            return Configurations._reload_if_changed()
+
     def _get_variable_value(variable_name):
-        load_dotenv()  # Load variables from .env file if present
-        return os.getenv(variable_name)
+        Configurations.snapshot()
+        return Configurations._variables.get(variable_name)
     
     def debug_enabled():
-        return Configurations._get_variable_value("DEBUG_ENABLED") == "1"
+        return Configurations.snapshot().debug_enabled
     
     def get_git_repos_directory():
-        return Configurations._get_variable_value("GIT_REPOS_DIRECTORY")
+        return Configurations.snapshot().git_repos_directory
     
     def get_teams_webhook_url():
-        return Configurations._get_variable_value("TEAMS_WEBHOOK_URL")
+        return Configurations.snapshot().teams_webhook_url
     
     def get_bitbucket_username():
-        return Configurations._get_variable_value("BITBUCKET_USERNAME")
+        return Configurations.snapshot().bitbucket_username
     
     def get_bitbucket_password():
-        return Configurations._get_variable_value("BITBUCKET_PASSWORD")
+        return Configurations.snapshot().bitbucket_password
     
     def get_bitbucket_server_host():
-        return Configurations._get_variable_value("BITBUCKET_SERVER_HOST")
+        return Configurations.snapshot().bitbucket_server_host
     
     def get_bitbucket_clone_url():
-        return Configurations._get_variable_value("BITBUCKET_CLONE_URI")
+        return Configurations.snapshot().bitbucket_clone_url
     
     def get_bitbucket_project_key():
-        return Configurations._get_variable_value("BITBUCKET_PROJECT_KEY")
-
+        return Configurations.snapshot().bitbucket_project_key
+    
     def get_teamcity_token():
-        return Configurations._get_variable_value("TEAMCITY_TOKEN")
+        return Configurations.snapshot().teamcity_token
     
     def get_teamcity_server_host():
-        return Configurations._get_variable_value("TEAMCITY_SERVER_HOST")
+        return Configurations.snapshot().teamcity_server_host
     
     def get_teamcity_project_id():
-        return Configurations._get_variable_value("TEAMCITY_PROJECT_ID")
+        return Configurations.snapshot().teamcity_project_id
     
     def get_github_api_token():
-        return Configurations._get_variable_value("GITHUB_API_TOKEN")
-
+        return Configurations.snapshot().github_api_token
+    
     def get_github_organization():
-        return Configurations._get_variable_value("GITHUB_ORGANIZATION")
+        return Configurations.snapshot().github_organization
     
     def get_github_team():
-        return Configurations._get_variable_value("GITHUB_TEAM")
+        return Configurations.snapshot().github_team
     
     def get_github_ssh_private_key():
-        return Configurations._get_variable_value("GITHUB_SSH_PRIVATE_KEY")
-
+        return Configurations.snapshot().github_ssh_private_key
+    
     def get_ff_cleanup_testing_repository():
-        return Configurations._get_variable_value("FF_CLEANUP_TESTING_REPOSITORY") == "1"
-
+        return Configurations.snapshot().ff_cleanup_testing_repository
+    
     def get_ff_enable_bitbucket_set_repo_read_only():
-        return Configurations._get_variable_value("FF_ENABLE_BITBUCKET_SET_REPO_READ_ONLY") == "1"
-
+        return Configurations.snapshot().ff_enable_bitbucket_set_repo_read_only
+    
     def get_ff_enable_teamcity_update_vcs_url():
-        return Configurations._get_variable_value("FF_ENABLE_TEAMCITY_UPDATE_VCS_URL") == "1"
-
+        return Configurations.snapshot().ff_enable_teamcity_update_vcs_url
+    
     def get_ff_enable_teamcity_update_commit_status_publisher():
-        return Configurations._get_variable_value("FF_ENABLE_TEAMCITY_UPDATE_COMMIT_STATUS_PUBLISHER") == "1"
-
+        return Configurations.snapshot().ff_enable_teamcity_update_commit_status_publisher
+    
     def get_ff_enable_update_urls_in_readme_file():
-        return Configurations._get_variable_value("FF_ENABLE_UPDATE_URLS_IN_README_FILE") == "1"
-
+        return Configurations.snapshot().ff_enable_update_urls_in_readme_file
+    
     def get_ff_enable_update_urls_in_all_files():
-        return Configurations._get_variable_value("FF_ENABLE_UPDATE_URLS_IN_ALL_FILES") == "1"
-
+        return Configurations.snapshot().ff_enable_update_urls_in_all_files
+    
     def get_ff_enable_update_urls_in_map_repo():
-        return Configurations._get_variable_value("FF_ENABLE_UPDATE_URLS_IN_MAP_REPO") == "1"
-
+        return Configurations.snapshot().ff_enable_update_urls_in_map_repo
+    
     def get_ff_enable_update_urls_in_confluence():
-        return Configurations._get_variable_value("FF_ENABLE_UPDATE_URLS_IN_CONFLUENCE") == "1"
-
+        return Configurations.snapshot().ff_enable_update_urls_in_confluence
+    
     def get_ff_enable_teams_notification():
-        return Configurations._get_variable_value("FF_ENABLE_TEAMS_NOTIFICATION") == "1"
-
+        return Configurations.snapshot().ff_enable_teams_notification
+    
     def get_ff_enable_mock_migration():
-        return Configurations._get_variable_value("FF_ENABLE_MOCK_MIGRATION") == "1"
-
+        return Configurations.snapshot().ff_enable_mock_migration
+    
     def get_ff_enable_bitbukcet_set_project_to_read_only():
-        return Configurations._get_variable_value("FF_ENABLE_BITBUKCET_SET_PROJECT_TO_READ_ONLY") == "1"
-
+        return Configurations.snapshot().ff_enable_bitbukcet_set_project_to_read_only
+    
+    def get_migration_workers_count():
+        return Configurations.snapshot().migration_workers_count
+    
+    def get_http_pool_size():
+        return Configurations.snapshot().http_pool_size
+    
+    def get_http_timeout_seconds():
+        return Configurations.snapshot().http_timeout_seconds
+    
+    def get_http_max_retries():
+        return Configurations.snapshot().http_max_retries
+    
+    def get_http_backoff_factor_seconds():
+        return Configurations.snapshot().http_backoff_factor_seconds
+    
+    def get_http_max_backoff_seconds():
+        return Configurations.snapshot().http_max_backoff_seconds
+    
+    def get_teamcity_max_concurrency():
+        return Configurations.snapshot().teamcity_max_concurrency
+    
+    def get_github_max_concurrency():
+        return Configurations.snapshot().github_max_concurrency
+    
+    def get_github_content_creation_interval_seconds():
+        return Configurations.snapshot().github_content_creation_interval_seconds
+    
+    def get_migration_journal_file():
+        return Configurations.snapshot().migration_journal_file
+    
+    def get_ff_enable_mirror_cache():
+        return Configurations.snapshot().ff_enable_mirror_cache
+    
+    def get_mirror_cache_directory():
+        return Configurations.snapshot().mirror_cache_directory
+    
+    def get_mirror_cache_max_size_gb():
+        return Configurations.snapshot().mirror_cache_max_size_gb
+    
+    def get_ff_enable_chunked_push():
+        return Configurations.snapshot().ff_enable_chunked_push
+    
+    def get_github_push_chunk_size():
+        return Configurations.snapshot().github_push_chunk_size
+    
+    def get_github_push_refs_batch_size():
+        return Configurations.snapshot().github_push_refs_batch_size
+    
+    def get_bitbucket_max_concurrency():
+        return Configurations.snapshot().bitbucket_max_concurrency
+    
+    def get_ff_enable_migration_planner():
+        return Configurations.snapshot().ff_enable_migration_planner
+    
+    def get_migration_estimated_throughput_mbps():
+        return Configurations.snapshot().migration_estimated_throughput_mbps
+    
+    def get_migration_estimated_repository_overhead_seconds():
+        return Configurations.snapshot().migration_estimated_repository_overhead_seconds
+    
+    def get_migration_estimated_seconds_per_ref():
+        return Configurations.snapshot().migration_estimated_seconds_per_ref
+    
+    def get_teams_notification_queue_size():
+        return Configurations.snapshot().teams_notification_queue_size
+    
+    def get_teams_notification_digest_interval_seconds():
+        return Configurations.snapshot().teams_notification_digest_interval_seconds
+    
+    def get_teams_notification_max_retries():
+        return Configurations.snapshot().teams_notification_max_retries
+    
+    def get_metrics_textfile_path():
+        return Configurations.snapshot().metrics_textfile_path
+    
+    def get_ff_enable_http_cache():
+        return Configurations.snapshot().ff_enable_http_cache
+    
+    def get_http_cache_directory():
+        return Configurations.snapshot().http_cache_directory
+    
+    def get_http_cache_max_entries():
+        return Configurations.snapshot().http_cache_max_entries
+    
+    def get_git_command_timeout_seconds():
+        return Configurations.snapshot().git_command_timeout_seconds
+    
+    def get_git_batch_max_processes():
+        return Configurations.snapshot().git_batch_max_processes
+    
+    def get_ff_enable_migration_pipeline():
+        return Configurations.snapshot().ff_enable_migration_pipeline
+    
+    def get_migration_pipeline_fetch_workers():
+        return Configurations.snapshot().migration_pipeline_fetch_workers
+    
+    def get_migration_pipeline_create_workers():
+        return Configurations.snapshot().migration_pipeline_create_workers
+    
+    def get_migration_pipeline_push_workers():
+        return Configurations.snapshot().migration_pipeline_push_workers
+    
+    def get_migration_pipeline_post_workers():
+        return Configurations.snapshot().migration_pipeline_post_workers
+    
+    def get_migration_pipeline_queue_size():
+        return Configurations.snapshot().migration_pipeline_queue_size
+    
+    def get_ff_enable_disk_admission():
+        return Configurations.snapshot().ff_enable_disk_admission
+    
+    def get_disk_admission_min_free_gb():
+        return Configurations.snapshot().disk_admission_min_free_gb
+    
+    def get_trash_directory():
+        return Configurations.snapshot().trash_directory
+    
+    def get_ff_enable_github_bulk_create():
+        return Configurations.snapshot().ff_enable_github_bulk_create
+    
+    def get_github_bulk_create_batch_size():
+        return Configurations.snapshot().github_bulk_create_batch_size
@@ -1,17 +1,30 @@
 import os
 import json
+import queue
+import threading
 import base64
 import shutil
-import subprocess
 from datetime import datetime
 import csv
 import requests
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from src.configs.configurations import Configurations
+from src.connectors.http_transport import HttpTransport
+from src.connectors.git_executor import GitExecutor
+from src.connectors.metrics_registry import MetricsRegistry
 
 class BitbucketConnector:
     
     REPO_READ_ONLY_PERMISSION = "REPO_READ"
     PROJECT_READ_ONLY_PERMISSION = "PROJECT_READ"
+    PERMISSION_PRINCIPAL_TYPES = ["group", "user"]
+    PAGE_LIMIT = 1000
+    # seconds a cached listing is served without asking bitbucket, writes of the connector invalidate it earlier
+    REPOSITORIES_CACHE_TTL_SECONDS = 300
+    PERMISSIONS_CACHE_TTL_SECONDS = 60
+    # path segments followed by an identifier, replaced in the metrics endpoint labels
+    ENDPOINT_IDENTIFIED_SEGMENTS = {"projects": 1, "repos": 1}
     
     def __init__(
             self, 
@@ -19,16 +32,21 @@ class BitbucketConnector:
             password=None, 
             server_host=None, 
             clone_uri=None, 
-            project_key=None
+            project_key=None,
+            configurations=None
         ):
-        self._username = username if username else Configurations.get_bitbucket_username()
-        self._password = password if password else Configurations.get_bitbucket_password()
-        self._server_host = server_host if server_host else Configurations.get_bitbucket_server_host()
-        self._clone_uri = clone_uri if clone_uri else Configurations.get_bitbucket_clone_url()
-        self._project_key = project_key if project_key else Configurations.get_bitbucket_project_key()
+        self._configurations = configurations if configurations else Configurations.snapshot()
+        self._username = username if username else self._configurations.bitbucket_username
+        self._password = password if password else self._configurations.bitbucket_password
+        self._server_host = server_host if server_host else self._configurations.bitbucket_server_host
+        self._clone_uri = clone_uri if clone_uri else self._configurations.bitbucket_clone_url
+        self._project_key = project_key if project_key else self._configurations.bitbucket_project_key
         if not all([self._username, self._password, self._server_host]):
             raise ValueError("Missing required parameters in .env file or in the exported envionment variables.")
-        self.base_url_repos = f"https://{self._server_host}/rest/api/latest"
+        self.base_url = f"https://{self._server_host}"
+        self.base_url_repos = f"{self.base_url}/rest/api/latest"
+        self._http_transport = HttpTransport.shared()
+        self._git_executor = GitExecutor.shared()
         
     def get_repository_base_url(self):
         return f"https://{self._server_host}/projects/{self._project_key}/repos".removesuffix('/')
@@ -36,23 +54,27 @@ class BitbucketConnector:
     def get_repository_clone_base_url(self):
         return f"https://{self._server_host}{self._clone_uri}".removesuffix('/')
 
-    def _execute_bitbucket_command(self, uri, method="GET", data=None):
+    def _get_authorization(self):
         auth_string = base64.b64encode(f"{self._username}:{self._password}".encode()).decode()
+        return f"Basic {auth_string}"
+
+    def _execute_bitbucket_command(self, uri, method="GET", data=None, base_url=None, cache_ttl=None):
         headers = {
-            "Authorization": f"Basic {auth_string}",
+            "Authorization": self._get_authorization(),
             "Content-Type": "application/json",
         }
-        url = f"{self.base_url_repos}{uri}"
+        url = f"{base_url if base_url else self.base_url_repos}{uri}"
+        endpoint = MetricsRegistry.get_endpoint_label(uri, BitbucketConnector.ENDPOINT_IDENTIFIED_SEGMENTS)
         response = None
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers, data=data)
+                response = self._http_transport.request("GET", url, headers=headers, data=data, service="bitbucket", endpoint=endpoint, cache_ttl=cache_ttl)
             elif method == "POST":
-                response = requests.post(url, headers=headers, json=data)
+                response = self._http_transport.request("POST", url, headers=headers, json=data, service="bitbucket", endpoint=endpoint)
             elif method == "DELETE":
-                response = requests.delete(url, headers=headers)
+                response = self._http_transport.request("DELETE", url, headers=headers, service="bitbucket", endpoint=endpoint)
             elif method == "PUT":
-                response = requests.put(url, headers=headers)
+                response = self._http_transport.request("PUT", url, headers=headers, service="bitbucket", endpoint=endpoint)
             else:
                 raise ValueError('Request method not supported in code')
 
@@ -61,109 +83,213 @@ class BitbucketConnector:
         
         except requests.exceptions.RequestException as e:
             print(f"Error executing Bitbucket command: {e}")
-            exit(1)
+            raise
     
     def _execute_git_command(self, command_list, repo_path=""):
-        if repo_path:
-            os.chdir(repo_path)
         command = " ".join(command_list)
-        result = subprocess.run(
-            command_list,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        result = self._git_executor.run(command_list, cwd=repo_path)
         if result.returncode == 0:
             print(f"Git command '{command}' succeeded")
         else:
             print(f"Git command '{command}' failed")
         return result
     
+    def _get_page_uri(self, uri, start):
+        separator = "&" if "?" in uri else "?"
+        return f"{uri}{separator}start={start}&limit={BitbucketConnector.PAGE_LIMIT}"
+
+    def _iterate_pages(self, uri, cache_ttl=None):
+        # the next page is fetched in the background while the caller consumes the current one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(self._execute_bitbucket_command, self._get_page_uri(uri, 0), cache_ttl=cache_ttl)
+            while next_page:
+                page = next_page.result()
+                next_page = None
+                if not page.get("isLastPage", True) and "nextPageStart" in page:
+                    next_page = executor.submit(self._execute_bitbucket_command, self._get_page_uri(uri, page["nextPageStart"]), cache_ttl=cache_ttl)
+                yield page.get("values", [])
+
+    def _iterate_repository_pages(self):
+        uri = f"/projects/{self._project_key}/repos"
+        return self._iterate_pages(uri, BitbucketConnector.REPOSITORIES_CACHE_TTL_SECONDS)
+
     def _get_repository_list(self):
-        uri = f"/projects/{self._project_key}/repos?limit=1000"
-        response = self._execute_bitbucket_command(uri)
-        repositories = response.get("values", [])
+        repositories = []
+        for repositories_page in self._iterate_repository_pages():
+            repositories.extend(repositories_page)
         return repositories
     
-    def _get_groups_list(self, uri):
-        groups = []
-        groups_response = self._execute_bitbucket_command(uri)
-        group_list = groups_response.get("values", [])
-        for group in group_list:
-            if "group" in group and "name" in group["group"]:
-                groups.append(group["group"])
-        return groups
-    
-    def _get_users_list(self, uri):
-        users = []
-        users_response = self._execute_bitbucket_command(uri)
-        user_list = users_response.get("values", [])
-        for user in user_list:
-            if "user" in user and "name" in user["user"]:
-                users.append(user["user"])
-        return users
-    
-    def _get_repo_access_groups_list(self, repo_name):
-        uri = f"/projects/{self._project_key}/repos/{repo_name}/permissions/groups"
-        return self._get_groups_list(uri)
-    
-    def _set_repo_group_access_read_only(self, repo_name, group_name):
-        uri = f"/projects/{self._project_key}/repos/{repo_name}/permissions/groups?name={group_name}&permission={BitbucketConnector.REPO_READ_ONLY_PERMISSION}"
-        self._execute_bitbucket_command(uri, method="PUT")
-    
-    def _get_repo_access_users_list(self, repo_name):
-        uri = f"/projects/{self._project_key}/repos/{repo_name}/permissions/users"
-        return self._get_users_list(uri)
-                
-    def _set_repo_user_access_read_only(self, repo_name, user_name):
-        uri = f"/projects/{self._project_key}/repos/{repo_name}/permissions/users?name={user_name}&permission={BitbucketConnector.REPO_READ_ONLY_PERMISSION}"
-        self._execute_bitbucket_command(uri, method="PUT")
-        
-    def _get_project_access_groups_list(self):
-        uri = f"/projects/{self._project_key}/permissions/groups"
-        return self._get_groups_list(uri)
-    
-    def _set_project_group_access_read_only(self, group_name):
-        uri = f"/projects/{self._project_key}/permissions/groups?name={group_name}&permission={BitbucketConnector.PROJECT_READ_ONLY_PERMISSION}"
-        self._execute_bitbucket_command(uri, method="PUT")
-    
-    def _get_project_access_users_list(self):
-        uri = f"/projects/{self._project_key}/permissions/users"
-        return self._get_users_list(uri)
-                
-    def _set_project_user_access_read_only(self, user_name):
-        uri = f"/projects/{self._project_key}/permissions/users?name={user_name}&permission={BitbucketConnector.PROJECT_READ_ONLY_PERMISSION}"
-        self._execute_bitbucket_command(uri, method="PUT")
-        
+    def _get_repo_permissions_uri(self, repo_name):
+        return f"/projects/{self._project_key}/repos/{repo_name}/permissions"
+
+    def _get_project_permissions_uri(self):
+        return f"/projects/{self._project_key}/permissions"
+
+    def _get_permission_grants(self, permissions_uri):
+        grants = []
+        for principal_type in BitbucketConnector.PERMISSION_PRINCIPAL_TYPES:
+            for grants_page in self._iterate_pages(f"{permissions_uri}/{principal_type}s", BitbucketConnector.PERMISSIONS_CACHE_TTL_SECONDS):
+                for grant in grants_page:
+                    if principal_type in grant and "name" in grant[principal_type]:
+                        grants.append({
+                            "type": principal_type,
+                            "name": grant[principal_type]["name"],
+                            "permission": grant.get("permission", "")
+                        })
+        return grants
+
+    def _set_permission(self, permissions_uri, grant, permission):
+        uri = f"{permissions_uri}/{grant['type']}s?name={quote(grant['name'])}&permission={permission}"
+        self._execute_bitbucket_command(uri, "PUT")
+
+    def _write_permissions_snapshot(self, snapshot_file_path, permission, permissions_snapshot):
+        snapshot_directory = os.path.dirname(snapshot_file_path)
+        if snapshot_directory:
+            os.makedirs(snapshot_directory, exist_ok=True)
+        with open(snapshot_file_path, "w") as snapshot_file:
+            json.dump({
+                "project_key": self._project_key,
+                "permission": permission,
+                "created_at": datetime.now().isoformat(),
+                "permissions": permissions_snapshot
+            }, snapshot_file, indent=4)
+        print(f"Permissions snapshot saved to '{snapshot_file_path}'")
+
+    def _set_permissions_read_only(self, permissions_uris, permission, snapshot_file_path=None):
+        summary = {"updated": 0, "skipped": 0, "failed": 0}
+        permissions_snapshot = {}
+        changes = []
+        with ThreadPoolExecutor(max_workers=max(1, self._configurations.bitbucket_max_concurrency)) as executor:
+            grants_futures = {name: executor.submit(self._get_permission_grants, uri) for name, uri in permissions_uris.items()}
+            for name, grants_future in grants_futures.items():
+                try:
+                    grants = grants_future.result()
+                except Exception as e:
+                    # nothing is changed on a target whose grants could not be read, it counts as one failure
+                    print(f"Error: Reading permissions of '{name}' has failed: {e}")
+                    summary["failed"] += 1
+                    continue
+                permissions_snapshot[name] = {"before": grants, "after": [dict(grant) for grant in grants]}
+                for grant in permissions_snapshot[name]["after"]:
+                    if grant["permission"] == permission:
+                        summary["skipped"] += 1
+                    else:
+                        changes.append((name, grant))
+            changes_futures = [executor.submit(self._set_permission, permissions_uris[name], grant, permission) for name, grant in changes]
+            for (name, grant), change_future in zip(changes, changes_futures):
+                try:
+                    change_future.result()
+                    grant["permission"] = permission
+                    summary["updated"] += 1
+                except Exception as e:
+                    print(f"Error: Setting {grant['type']} '{grant['name']}' to {permission} on '{name}' has failed: {e}")
+                    summary["failed"] += 1
+        if snapshot_file_path:
+            self._write_permissions_snapshot(snapshot_file_path, permission, permissions_snapshot)
+        return summary
+
+    def _iterate_open_pull_request_pages(self, repo_name):
+        uri = f"/projects/{self._project_key}/repos/{repo_name}/pull-requests?state=OPEN"
+        return self._iterate_pages(uri)
+
     def _get_open_pull_requests(self, repo_name):
-        uri = f"/projects/{self._project_key}/repos/{repo_name}/pull-requests?state=OPEN&limit=1000"
-        response = self._execute_bitbucket_command(uri)
-        pull_requests = response.get("values", [])
+        pull_requests = []
+        for pull_requests_page in self._iterate_open_pull_request_pages(repo_name):
+            pull_requests.extend(pull_requests_page)
         return pull_requests
 
+    def _count_items(self, uri):
+        items_count = 0
+        for items_page in self._iterate_pages(uri):
+            items_count += len(items_page)
+        return items_count
+
+    def get_repository_size(self, repo_name):
+        # the sizes endpoint is served outside of the rest api
+        uri = f"/projects/{self._project_key}/repos/{repo_name}/sizes"
+        sizes = self._execute_bitbucket_command(uri, base_url=self.base_url)
+        return sizes.get("repository", 0)
+
+    def get_repository_refs_count(self, repo_name):
+        branches_count = self._count_items(f"/projects/{self._project_key}/repos/{repo_name}/branches")
+        tags_count = self._count_items(f"/projects/{self._project_key}/repos/{repo_name}/tags")
+        return branches_count + tags_count
+
     def generate_repository_list_csv(self, csv_file_path):
         try:
-            repositories = self._get_repository_list()
             with open(csv_file_path, mode="w", newline='') as csv_file:
                 fieldnames = ["bitbucket_repository", "github_repository"]
                 writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
                 
                 writer.writeheader()
-                for repo in repositories:
-                    writer.writerow({
-                        "bitbucket_repository": repo["name"],
-                        "github_repository": repo["name"]
-                    })
+                for repositories in self._iterate_repository_pages():
+                    for repo in repositories:
+                        writer.writerow({
+                            "bitbucket_repository": repo["name"],
+                            "github_repository": repo["name"]
+                        })
+                    csv_file.flush()
             print(f"Repository list saved to '{csv_file_path}'")
         except Exception as e:
             print(f"Error: {e}")
             
-    import datetime
+    def _get_open_pull_request_row(self, repo_name, pull_request):
+        created_at = datetime.fromtimestamp(pull_request["createdDate"]/1000).strftime("%Y.%m.%d %H:%M:%S")
+        updated_at = datetime.fromtimestamp(pull_request["updatedDate"]/1000).strftime("%Y.%m.%d %H:%M:%S")
+        reviewers = []
+        for reviewer in pull_request["reviewers"]:
+            reviewers.append(reviewer["user"]["displayName"])
+        return {
+            "pull_request_repository": repo_name,
+            "pull_request_author_name": pull_request["author"]["user"]["displayName"],
+            "pull_request_author_email": pull_request["author"]["user"]["emailAddress"],
+            "pull_request_author_id": pull_request["author"]["user"]["name"],
+            "pull_request_title": pull_request["title"],
+            "pull_request_number": pull_request["id"],
+            "pull_request_url": pull_request["links"]["self"][0]["href"],
+            "pull_request_created_at": created_at,
+            "pull_request_updated_at": updated_at,
+            "pull_request_source_branch": pull_request["fromRef"]["displayId"],
+            "pull_request_target_branch": pull_request["toRef"]["displayId"],
+            "pull_request_reviewers": " - ".join(reviewers),
+            "pull_request_comments_count": pull_request["properties"]["commentCount"] if "commentCount" in pull_request["properties"] else 0,
+            "pull_request_open_task_count": pull_request["properties"]["openTaskCount"] if "openTaskCount" in pull_request["properties"] else 0
+        }
+
+    def _put_until_stopped(self, rows_queue, rows, stop_event):
+        while not stop_event.is_set():
+            try:
+                rows_queue.put(rows, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _queue_open_pull_request_rows(self, repo_name, rows_queue, stop_event, failed_repo_names):
+        try:
+            for pull_requests in self._iterate_open_pull_request_pages(repo_name):
+                rows = [self._get_open_pull_request_row(repo_name, pull_request) for pull_request in pull_requests]
+                if rows and not self._put_until_stopped(rows_queue, rows, stop_event):
+                    return
+        except Exception as e:
+            # the pages read before the failure are already written, the repository is reported once the file is complete
+            print(f"Error: Reading open pull requests of '{repo_name}' has failed: {e}")
+            failed_repo_names.append(repo_name)
+
+    def _write_open_pull_request_rows(self, csv_file, writer, rows_queue, stop_event, writer_errors):
+        try:
+            while True:
+                rows = rows_queue.get()
+                if rows is None:
+                    return
+                writer.writerows(rows)
+                csv_file.flush()
+        except Exception as e:
+            writer_errors.append(e)
+            stop_event.set()
 
     def generate_open_pull_requests_csv(self, csv_file_path):
         try:
-            repositories = self._get_repository_list()
             with open(csv_file_path, mode="w", newline='') as csv_file:
                 fieldnames = [
                         "pull_request_repository",
@@ -183,74 +309,88 @@ class BitbucketConnector:
                     ]
                 writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
                 writer.writeheader()
-                for repository in repositories:
-                    pull_requests = self._get_open_pull_requests(repository["name"])
-                    for pull_request in pull_requests:
-                        created_at = datetime.fromtimestamp(pull_request["createdDate"]/1000).strftime("%Y.%m.%d %H:%M:%S")
-                        updated_at = datetime.fromtimestamp(pull_request["updatedDate"]/1000).strftime("%Y.%m.%d %H:%M:%S")
-                        reviewers = []
-                        for reviewer in pull_request["reviewers"]:
-                            reviewers.append(reviewer["user"]["displayName"])
-                        writer.writerow({
-                            "pull_request_repository": repository["name"],
-                            "pull_request_author_name": pull_request["author"]["user"]["displayName"],
-                            "pull_request_author_email": pull_request["author"]["user"]["emailAddress"],
-                            "pull_request_author_id": pull_request["author"]["user"]["name"],
-                            "pull_request_title": pull_request["title"],
-                            "pull_request_number": pull_request["id"],
-                            "pull_request_url": pull_request["links"]["self"][0]["href"],
-                            "pull_request_created_at": created_at,
-                            "pull_request_updated_at": updated_at,
-                            "pull_request_source_branch": pull_request["fromRef"]["displayId"],
-                            "pull_request_target_branch": pull_request["toRef"]["displayId"],
-                            "pull_request_reviewers": " - ".join(reviewers),
-                            "pull_request_comments_count": pull_request["properties"]["commentCount"] if "commentCount" in pull_request["properties"] else 0,
-                            "pull_request_open_task_count": pull_request["properties"]["openTaskCount"] if "openTaskCount" in pull_request["properties"] else 0
-                        })
+                max_concurrency = max(1, self._configurations.bitbucket_max_concurrency)
+                # the repositories are read concurrently, a single thread writes their pages so the file stays consistent
+                # and the bounded queue keeps at most a few pages in memory
+                rows_queue = queue.Queue(maxsize=2 * max_concurrency)
+                stop_event = threading.Event()
+                writer_errors = []
+                failed_repo_names = []
+                writer_thread = threading.Thread(
+                    target=self._write_open_pull_request_rows,
+                    args=(csv_file, writer, rows_queue, stop_event, writer_errors)
+                )
+                writer_thread.start()
+                try:
+                    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                        for repositories in self._iterate_repository_pages():
+                            if stop_event.is_set():
+                                break
+                            for repository in repositories:
+                                executor.submit(self._queue_open_pull_request_rows, repository["name"], rows_queue, stop_event, failed_repo_names)
+                finally:
+                    self._put_until_stopped(rows_queue, None, stop_event)
+                    writer_thread.join()
+                if writer_errors:
+                    raise writer_errors[0]
+            if failed_repo_names:
+                raise RuntimeError(f"Open pull requests list '{csv_file_path}' is incomplete, {len(failed_repo_names)} repositories could not be read: {', '.join(sorted(failed_repo_names))}")
             print(f"Open pull requests list saved to '{csv_file_path}'")
         except Exception as e:
             print(f"Error: {e}")
 
+    def _get_clone_url(self, repo_name):
+        return f"https://{self._server_host}{self._clone_uri}{repo_name}.git"
+
+    def _get_git_environment(self):
+        # the credentials are given to git through its environment, the failed command of an error never contains them
+        return {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "http.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: {self._get_authorization()}"
+        }
+
     def clone_repository(self, repo_name, local_repo_path):
         if os.path.exists(local_repo_path):
             try:
+                self._git_executor.close(local_repo_path)
                 shutil.rmtree(local_repo_path)
             except Exception as e:
                 print(f"Error while deleting exiting repository in {local_repo_path}: {e}")
-                exit(1)
-        repo_url = f"https://{self._username}:{self._password}@{self._server_host}{self._clone_uri}{repo_name}.git"
-        result = subprocess.run(
-            ["git", "clone", "--mirror", repo_url, local_repo_path],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,  
-        )
+                raise
+        repo_url = self._get_clone_url(repo_name)
+        result = self._git_executor.run(["git", "clone", "--mirror", repo_url, local_repo_path], env=self._get_git_environment())
         if result.returncode == 0:
             print(f"Repository '{repo_name}' cloned successfully from Bitbucket.")
         else:
             print(f"Cloning '{repo_name}' from Bitbucket has failed")
 
+    def fetch_repository(self, repo_name, local_repo_path):
+        # the url is reset because mirrors cloned by older runs still have the credentials in their url
+        self._git_executor.run(["git", "remote", "set-url", "origin", self._get_clone_url(repo_name)], cwd=local_repo_path)
+        self._git_executor.run(["git", "fetch", "--prune", "origin"], cwd=local_repo_path, env=self._get_git_environment())
+        print(f"Repository '{repo_name}' fetched successfully from Bitbucket.")
+
+    def set_repositories_read_only(self, repo_names, snapshot_file_path=None):
+        permissions_uris = {repo_name: self._get_repo_permissions_uri(repo_name) for repo_name in repo_names}
+        summary = self._set_permissions_read_only(permissions_uris, BitbucketConnector.REPO_READ_ONLY_PERMISSION, snapshot_file_path)
+        print(f"{len(permissions_uris)} repositories set to read-only: {summary['updated']} permissions updated, {summary['skipped']} already read-only, {summary['failed']} failed.")
+        return summary
+
     def set_repository_read_only(self, repo_name):
-        try:
-            groups = self._get_repo_access_groups_list(repo_name)
-            for group in groups:
-                self._set_repo_group_access_read_only(repo_name, group["name"])
-            users = self._get_repo_access_users_list(repo_name)
-            for user in users:
-                self._set_repo_user_access_read_only(repo_name, user["name"])
-            print(f"Repository '{repo_name}' has been set to read-only for all groups and users.")
-        except Exception as e:
-            print(f"Error setting repository read-only: {e}")
+        permissions_uris = {repo_name: self._get_repo_permissions_uri(repo_name)}
+        summary = self._set_permissions_read_only(permissions_uris, BitbucketConnector.REPO_READ_ONLY_PERMISSION)
+        if summary["failed"]:
+            print(f"Error setting repository read-only: {summary['failed']} permissions of '{repo_name}' could not be updated.")
+            return False
+        print(f"Repository '{repo_name}' has been set to read-only for all groups and users.")
+        return True
 
-    def set_project_read_only(self):
-        try:
-            groups = self._get_project_access_groups_list()
-            for group in groups:
-                self._set_project_group_access_read_only(group["name"])
-            users = self._get_project_access_users_list()
-            for user in users:
-                self._set_project_user_access_read_only(user["name"])
-            print(f"Project {self._project_key} has been set to read-only for all groups and users.")
-        except Exception as e:
-            print(f"Error setting project read-only: {e}")
+    def set_project_read_only(self, snapshot_file_path=None):
+        permissions_uris = {self._project_key: self._get_project_permissions_uri()}
+        summary = self._set_permissions_read_only(permissions_uris, BitbucketConnector.PROJECT_READ_ONLY_PERMISSION, snapshot_file_path)
+        if summary["failed"]:
+            print(f"Error setting project read-only: {summary['failed']} permissions of '{self._project_key}' could not be updated.")
+            return False
+        print(f"Project {self._project_key} has been set to read-only for all groups and users.")
+        return True
@@ -0,0 +1,151 @@
+import os
+import threading
+import subprocess
+from collections import OrderedDict
+from src.configs.configurations import Configurations
+
+class GitBatchProcess:
+
+    # object names written before reading their answers, so that neither pipe fills up while the other is waited on
+    WRITE_CHUNK_SIZE = 256
+
+    def __init__(self, repo_path, environment):
+        self.repo_path = repo_path
+        self.lock = threading.Lock()
+        self._is_closed = False
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch-check"],
+            cwd=repo_path,
+            env=environment,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    def is_alive(self):
+        return self._process.poll() is None
+
+    def _read_object(self):
+        header = self._process.stdout.readline()
+        if not header:
+            raise RuntimeError(f"git cat-file --batch-check has exited in '{self.repo_path}'")
+        header_fields = header.decode(errors="surrogateescape").rstrip("\n").split(" ")
+        # missing or ambiguous objects are reported as "<name> missing" or "<name> ambiguous"
+        if len(header_fields) != 3:
+            return None
+        object_sha, object_type, object_size = header_fields
+        return {"sha": object_sha, "type": object_type, "size": int(object_size)}
+
+    def query(self, object_names):
+        objects = []
+        with self.lock:
+            if self._is_closed:
+                raise RuntimeError(f"git cat-file --batch-check has been closed in '{self.repo_path}'")
+            for chunk_start in range(0, len(object_names), GitBatchProcess.WRITE_CHUNK_SIZE):
+                chunk = object_names[chunk_start:chunk_start + GitBatchProcess.WRITE_CHUNK_SIZE]
+                self._process.stdin.write("".join(f"{object_name}\n" for object_name in chunk).encode(errors="surrogateescape"))
+                self._process.stdin.flush()
+                for _ in chunk:
+                    objects.append(self._read_object())
+        return objects
+
+    def close(self):
+        with self.lock:
+            self._is_closed = True
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+
+class GitExecutor:
+
+    _shared_executor = None
+    _shared_executor_lock = threading.Lock()
+
+    def __init__(self, timeout=None, max_batch_processes=None, configurations=None):
+        configurations = configurations if configurations else Configurations.snapshot()
+        self._timeout = timeout if timeout is not None else configurations.git_command_timeout_seconds
+        self._max_batch_processes = max(1, max_batch_processes if max_batch_processes else configurations.git_batch_max_processes)
+        self._batch_processes = OrderedDict()
+        self._batch_processes_lock = threading.Lock()
+
+    def shared():
+        with GitExecutor._shared_executor_lock:
+            if GitExecutor._shared_executor is None:
+                GitExecutor._shared_executor = GitExecutor()
+            return GitExecutor._shared_executor
+
+    def get_environment(self, env=None):
+        environment = dict(os.environ)
+        # a missing credential fails the command instead of waiting for a prompt nobody answers
+        environment["GIT_TERMINAL_PROMPT"] = "0"
+        if env:
+            environment.update(env)
+        return environment
+
+    def run(self, command_list, cwd=None, env=None, input=None, timeout=None, check=True, text=True):
+        # the working directory is passed to every command, the process working directory is never changed
+        timeout = timeout if timeout is not None else self._timeout
+        return subprocess.run(
+            command_list,
+            cwd=cwd if cwd else None,
+            env=self.get_environment(env),
+            input=input,
+            timeout=timeout if timeout else None,
+            check=check,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=text,
+        )
+
+    def _get_batch_process(self, repo_path):
+        key = os.path.abspath(repo_path)
+        closed_processes = []
+        with self._batch_processes_lock:
+            batch_process = self._batch_processes.get(key)
+            if batch_process and not batch_process.is_alive():
+                closed_processes.append(self._batch_processes.pop(key))
+                batch_process = None
+            if not batch_process:
+                batch_process = GitBatchProcess(key, self.get_environment())
+                self._batch_processes[key] = batch_process
+            self._batch_processes.move_to_end(key)
+            while len(self._batch_processes) > self._max_batch_processes:
+                _, evicted_process = self._batch_processes.popitem(last=False)
+                closed_processes.append(evicted_process)
+        for closed_process in closed_processes:
+            closed_process.close()
+        return batch_process
+
+    def _discard_batch_process(self, batch_process):
+        with self._batch_processes_lock:
+            if self._batch_processes.get(batch_process.repo_path) is batch_process:
+                del self._batch_processes[batch_process.repo_path]
+        batch_process.close()
+
+    def _query(self, repo_path, object_names):
+        batch_process = self._get_batch_process(repo_path)
+        try:
+            return batch_process.query(object_names)
+        except (RuntimeError, OSError, ValueError):
+            # the process was evicted by another thread or has died, its answers can no longer be trusted
+            self._discard_batch_process(batch_process)
+            return self._get_batch_process(repo_path).query(object_names)
+
+    def get_objects_info(self, repo_path, object_names):
+        # object names are any revision expressions (HEAD, sha^{commit}, branch:path), missing ones give None
+        return self._query(repo_path, list(object_names))
+
+    def get_object_info(self, repo_path, object_name):
+        return self.get_objects_info(repo_path, [object_name])[0]
+
+    def close(self, repo_path=None):
+        # the processes of a repository must be closed before its directory is removed
+        repo_path = os.path.abspath(repo_path) if repo_path else None
+        with self._batch_processes_lock:
+            closed_keys = [key for key in self._batch_processes if repo_path is None or key == repo_path]
+            closed_processes = [self._batch_processes.pop(key) for key in closed_keys]
+        for closed_process in closed_processes:
+            closed_process.close()
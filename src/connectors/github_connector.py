@@ -4,24 +4,49 @@ import time
 import subprocess
 import requests
 import json
+import threading
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.configs.configurations import Configurations
+from src.connectors.http_transport import HttpTransport
+from src.connectors.github_rate_governor import GithubRateGovernor
+from src.connectors.git_executor import GitExecutor
+from src.connectors.metrics_registry import MetricsRegistry
 
 class GithubConnector:
 
+    ORG_REPOS_PAGE_SIZE = 100
+    GRAPHQL_URI = "/graphql"
+    RATE_LIMIT_MAX_RETRIES = 5
+    # cached listings are always revalidated, github does not count 304 responses against the rate limit
+    CACHE_TTL_SECONDS = 0
+    # path segments followed by identifiers, replaced in the metrics endpoint labels
+    ENDPOINT_IDENTIFIED_SEGMENTS = {"repos": 2, "orgs": 1, "teams": 1, "users": 1}
+
     def __init__(
             self,
             api_token=None,
             organization=None,
-            team=None
+            team=None,
+            configurations=None
         ):
-        self._github_api_token = api_token if api_token else Configurations.get_github_api_token()
-        self._github_organization = organization if organization else Configurations.get_github_organization()
-        self._github_team = team if team else Configurations.get_github_team()
+        self._configurations = configurations if configurations else Configurations.snapshot()
+        self._github_api_token = api_token if api_token else self._configurations.github_api_token
+        self._github_organization = organization if organization else self._configurations.github_organization
+        self._github_team = team if team else self._configurations.github_team
         self._github_api_base_url = "https://api.github.com"
+        self._http_transport = HttpTransport.shared()
+        self._max_concurrency = max(1, self._configurations.github_max_concurrency)
+        self._rate_governor = GithubRateGovernor.shared(self._github_api_token)
+        self._git_executor = GitExecutor.shared()
+        self._org_repos_index = None
+        self._org_repos_index_lock = threading.Lock()
+        self._graphql_ids = None
+        self._graphql_ids_lock = threading.Lock()
         if not all([self._github_api_token, self._github_organization,  self._github_team]):
             raise ValueError("Missing required parameters in .env file or in the exported envionment variables.")
         
-        github_ssh_key = Configurations.get_github_ssh_private_key()
+        github_ssh_key = self._configurations.github_ssh_private_key
         home_directory = os.path.expanduser("~")
         self.ssh_key_path = f"{home_directory}/.ssh/id_rsa"
 
@@ -43,7 +68,7 @@ class GithubConnector:
 
         except Exception as e:
             print(f"Error writing GitHub SSH key: {e}")
-            exit(1)
+            raise
             
     def get_repository_base_url(self):
         return f"https://github.com/{self._github_organization}".removesuffix('/')
@@ -69,43 +94,52 @@ class GithubConnector:
             print(f"No SSH key found at {rsa_key_path}")
         return ""
             
-    def _execute_github_command(self, uri, method="GET", data=None):
+    def _send_github_request(self, uri, method="GET", data=None, cache_ttl=None, invalidates=None):
         headers = {
             "Authorization": f"Bearer {self._github_api_token}",
             "Content-Type": "application/json",
         }
         url = f"{self._github_api_base_url}{uri}"
+        endpoint = MetricsRegistry.get_endpoint_label(uri, GithubConnector.ENDPOINT_IDENTIFIED_SEGMENTS)
         response = None
+        invalidated_urls = [f"{self._github_api_base_url}{invalidated_uri}" for invalidated_uri in invalidates] if invalidates else None
 
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers, data=data)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers)
-            else:
-                raise ValueError('Request method not supported in code')
+                # a fresh cached response costs nothing, it does not wait for the rate limit budget
+                response = self._http_transport.get_fresh_response(url, headers, cache_ttl, service="github")
+                if response is not None:
+                    return response
+            for attempt in range(GithubConnector.RATE_LIMIT_MAX_RETRIES + 1):
+                self._rate_governor.acquire(method)
+                if method == "GET":
+                    response = self._http_transport.request("GET", url, headers=headers, data=data, service="github", endpoint=endpoint, cache_ttl=cache_ttl)
+                elif method == "POST":
+                    response = self._http_transport.request("POST", url, headers=headers, json=data, service="github", endpoint=endpoint, invalidates=invalidated_urls)
+                elif method == "PUT":
+                    response = self._http_transport.request("PUT", url, headers=headers, json=data, service="github", endpoint=endpoint, invalidates=invalidated_urls)
+                elif method == "DELETE":
+                    response = self._http_transport.request("DELETE", url, headers=headers, service="github", endpoint=endpoint, invalidates=invalidated_urls)
+                else:
+                    raise ValueError('Request method not supported in code')
+                retry_delay = self._rate_governor.update(response)
+                if not retry_delay or attempt == GithubConnector.RATE_LIMIT_MAX_RETRIES:
+                    break
+                print(f"Warning: GitHub rate limit reached on {method} {uri}, retrying in {retry_delay:.0f}s...")
             response.raise_for_status()        
-            return response.json() if response.text else {}
+            return response
         
         except requests.exceptions.RequestException as e:
             print(f"Error executing Github command: {e}")
-            exit(1)
+            raise
+
+    def _execute_github_command(self, uri, method="GET", data=None, cache_ttl=None, invalidates=None):
+        response = self._send_github_request(uri, method=method, data=data, cache_ttl=cache_ttl, invalidates=invalidates)
+        return response.json() if response.text else {}
             
-    def _execute_git_command(self, command_list, repo_path=""):
-        if repo_path:
-            os.chdir(repo_path)
+    def _execute_git_command(self, command_list, repo_path="", input=None):
         command = " ".join(command_list)
-        result = subprocess.run(
-            command_list,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        result = self._git_executor.run(command_list, cwd=repo_path, input=input)
         if result.returncode == 0:
             print(f"Git command '{command}' succeeded")
         else:
@@ -114,18 +148,83 @@ class GithubConnector:
     
     def _get_repo(self, repo_name):
         uri = f"/repos/{self._github_organization}/{repo_name}"
-        return self._execute_bitbucket_command(uri, method="GET")
+        return self._execute_github_command(uri, method="GET", cache_ttl=GithubConnector.CACHE_TTL_SECONDS)
+
+    def _get_existing_repo(self, repo_name):
+        try:
+            return self._get_repo(repo_name)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def _get_last_page_number(self, response):
+        # github sends no link header when there is a single page, None tells that the page count is unknown
+        if not response.links:
+            return 1
+        try:
+            return int(parse_qs(urlsplit(response.links["last"]["url"]).query)["page"][0])
+        except (KeyError, IndexError, ValueError):
+            print(f"Warning: Unable to read the last page from the link header '{response.headers.get('Link', '')}', reading the pages one by one...")
+            return None
+
+    def _iterate_org_repos(self, repo_type="all"):
+        uri = f"/orgs/{self._github_organization}/repos?type={repo_type}&per_page={GithubConnector.ORG_REPOS_PAGE_SIZE}"
+        first_page = self._send_github_request(f"{uri}&page=1", method="GET", cache_ttl=GithubConnector.CACHE_TTL_SECONDS)
+        for repo in first_page.json():
+            yield repo
+        last_page_number = self._get_last_page_number(first_page)
+        if last_page_number is None:
+            # a page that is not full is the last one
+            repos = first_page.json()
+            page_number = 1
+            while len(repos) >= GithubConnector.ORG_REPOS_PAGE_SIZE:
+                page_number += 1
+                repos = self._execute_github_command(f"{uri}&page={page_number}", "GET", cache_ttl=GithubConnector.CACHE_TTL_SECONDS)
+                for repo in repos:
+                    yield repo
+            return
+        if last_page_number <= 1:
+            return
+        # the first page tells how many pages there are, the remaining ones are fetched concurrently
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            futures = [
+                executor.submit(self._execute_github_command, f"{uri}&page={page_number}", "GET", cache_ttl=GithubConnector.CACHE_TTL_SECONDS)
+                for page_number in range(2, last_page_number + 1)
+            ]
+            for future in as_completed(futures):
+                for repo in future.result():
+                    yield repo
     
     def get_repos_with_prefix(self, prefix):
-        uri = f"/orgs/{self._github_organization}/repos?type=private&&per-page=100"
-        response = self._execute_github_command(uri, method="GET")
         testing_repos = []
-        for repo in response:
+        for repo in self._iterate_org_repos(repo_type="private"):
             repo_name = repo.get("name")
             if repo_name.startswith(prefix):
                 testing_repos.append(repo_name)
         return testing_repos
 
+    def get_org_repos_index(self, refresh=False):
+        with self._org_repos_index_lock:
+            if self._org_repos_index is None or refresh:
+                org_repos_index = {}
+                for repo in self._iterate_org_repos():
+                    org_repos_index[repo["name"].lower()] = repo
+                self._org_repos_index = org_repos_index
+            return self._org_repos_index
+
+    def repository_exists(self, repo_name):
+        return repo_name.lower() in self.get_org_repos_index()
+
+    def _update_org_repos_index(self, repo_name, repo=None):
+        with self._org_repos_index_lock:
+            if self._org_repos_index is None:
+                return
+            if repo:
+                self._org_repos_index[repo_name.lower()] = repo
+            else:
+                self._org_repos_index.pop(repo_name.lower(), None)
+
     def _create_repo(self, repo_name):
         uri = f"/orgs/{self._github_organization}/repos"
         body = {
@@ -133,7 +232,9 @@ class GithubConnector:
             "homepage": "https://github.com",
             "private": True
         }
-        return self._execute_github_command(uri, method="POST", data=body)
+        repo = self._execute_github_command(uri, method="POST", data=body)
+        self._update_org_repos_index(repo_name, repo)
+        return repo
 
     def _add_repo_to_team(self, repo_name):
         uri = f"/orgs/{self._github_organization}/teams/{self._github_team}/repos/{self._github_organization}/{repo_name}"
@@ -148,59 +249,243 @@ class GithubConnector:
                     shutil.rmtree(local_repo_path)
                 except Exception as e:
                     print(f"Error while deleting exiting repository in {local_repo_path}: {e}")
-                    exit(1)
-            repo_url = f"git@github.com:{self._github_organization}/{repo_name}.git"
+                    raise
+            repo_url = self._get_push_url(repo_name)
             result = self._execute_git_command(["git", "clone", repo_url, local_repo_path])
             if result.returncode == 0:
                 print(f"Repository '{repo_name}' cloned successfully from GitHub.")
             else:
                 print(f"Cloning '{repo_name}' from GitHub has failed")
                 
-    def commit_and_push_repository(self, local_repo_path):
+    def clone_repository_without_checkout(self, repo_name, local_repo_path):
+        if os.path.exists(local_repo_path):
+            shutil.rmtree(local_repo_path)
+        # commits and trees are cloned, file contents are only downloaded for the paths checked out later
+        self._execute_git_command(["git", "clone", "--filter=blob:none", "--no-checkout", self._get_push_url(repo_name), local_repo_path])
+        print(f"Repository '{repo_name}' cloned from GitHub without checking out its files.")
+        try:
+            return self._execute_git_command(["git", "rev-parse", "HEAD"], local_repo_path).stdout.strip()
+        except subprocess.CalledProcessError:
+            # an empty repository has no commit to check out
+            return ""
+
+    def _get_sparse_checkout_pattern(self, path):
+        escaped_path = "".join(f"\\{character}" if character in "\\*?[!#" else character for character in path)
+        return f"/{escaped_path}"
+
+    def checkout_repository(self, local_repo_path, paths=None):
+        if paths is not None:
+            sparse_checkout_patterns = "\n".join(self._get_sparse_checkout_pattern(path) for path in paths)
+            self._execute_git_command(["git", "sparse-checkout", "set", "--no-cone", "--stdin"], local_repo_path, input=f"{sparse_checkout_patterns}\n")
+        self._execute_git_command(["git", "checkout"], local_repo_path)
+
+    def commit_and_push_repository(self, local_repo_path, commit_message="Update bitbucket urls to github urls in readme file"):
         unable_to_commit_and_push_message = f"Warning: Unable to commit and push repository in {local_repo_path}"
         if not os.path.exists(local_repo_path):
             print(unable_to_commit_and_push_message)
             return
-        result = self._execute_git_command(["git", "add", "."], local_repo_path)
-        if result.returncode != 0:
-            print(unable_to_commit_and_push_message)
-            return
-        commit_message = "Update bitbucket urls to github urls in readme file"
+        # new files are committed too, as with the former git add
+        self._execute_git_command(["git", "add", "-A"], local_repo_path)
         try:
-            result = self._execute_git_command(["git", "commit", "-m", commit_message], local_repo_path)
-            return_code = result.returncode
-        except Exception as e:
+            self._execute_git_command(["git", "commit", "-m", commit_message], local_repo_path)
+        except subprocess.CalledProcessError:
             print(f"Warning: Git commit command has failed, probably because there is nothing to commit")
-            return_code = 1
-        if return_code != 0:
-            print(unable_to_commit_and_push_message)
-            return
-        result = self._execute_git_command(['git', 'branch', '--show-current'], local_repo_path)
-        if result.returncode != 0:
-            print(unable_to_commit_and_push_message)
-            return
-        current_branch = result.stdout.strip()
-        result = self._execute_git_command(["git", "push", "origin", current_branch], local_repo_path)
-        if result.returncode != 0:
             print(unable_to_commit_and_push_message)
             return
+        # HEAD is pushed to the branch of the same name, the current branch does not have to be looked up
+        self._execute_git_command(["git", "push", "origin", "HEAD"], local_repo_path)
         
     def delete_repository(self, repo_name):
         uri = f"/repos/{self._github_organization}/{repo_name}"
-        return self._execute_github_command(uri, method="DELETE")
+        response = self._execute_github_command(uri, method="DELETE", invalidates=[uri, f"/orgs/{self._github_organization}/repos"])
+        self._update_org_repos_index(repo_name)
+        return response
     
     def push_repository(self, local_repo_path, repo_name):
-        if os.path.exists(local_repo_path):
-            print(f"Repository '{repo_name}' already exists. Skipping clone.")
+        if not os.path.exists(local_repo_path):
+            print(f"Warning: Local repository '{local_repo_path}' does not exist. Skipping push.")
             return False
-        github_repo_url = f"git@github.com:{self._github_organization}/{repo_name}.git"
-        os.chdir(local_repo_path)
-        subprocess.run(["git", "remote", "add", "github", github_repo_url])
-        subprocess.run(["git", "push", "github", "--all"])
-        subprocess.run(["git", "push", "github", "--tags"])
-        print("Repository pushed to GitHub successfully.")
+        github_repo_url = self._get_push_url(repo_name)
+        # push to the url instead of adding a remote, a resumed push reuses a mirror that may already have one
+        self._execute_git_command(["git", "push", github_repo_url, "--all"], local_repo_path)
+        self._execute_git_command(["git", "push", github_repo_url, "--tags"], local_repo_path)
+        print(f"Repository '{repo_name}' pushed to GitHub successfully.")
+        return True
+
+    def _get_push_url(self, repo_name):
+        return f"git@github.com:{self._github_organization}/{repo_name}.git"
+
+    def _get_local_refs(self, local_repo_path, refs_prefix):
+        result = self._execute_git_command(["git", "for-each-ref", "--format=%(objectname) %(refname)", refs_prefix], local_repo_path)
+        refs = {}
+        for line in result.stdout.splitlines():
+            object_name, ref_name = line.split(" ", 1)
+            refs[ref_name] = object_name
+        return refs
+
+    def _get_remote_refs(self, local_repo_path, github_repo_url):
+        result = self._execute_git_command(["git", "ls-remote", github_repo_url, "refs/heads/*", "refs/tags/*"], local_repo_path)
+        refs = {}
+        for line in result.stdout.splitlines():
+            object_name, ref_name = line.split("\t", 1)
+            refs[ref_name] = object_name
+        return refs
+
+    def _get_branch_checkpoints(self, local_repo_path, branch, chunk_size, pushed_commit=None):
+        revision_range = [branch]
+        # the chunks start after the commit github already has, even when it is not one of the checkpoints of this run
+        if pushed_commit and self._git_executor.get_object_info(local_repo_path, f"{pushed_commit}^{{commit}}"):
+            revision_range = [f"^{pushed_commit}", branch]
+        result = self._execute_git_command(["git", "rev-list", "--reverse", "--first-parent"] + revision_range, local_repo_path)
+        commits = result.stdout.split()
+        checkpoints = commits[chunk_size - 1::chunk_size]
+        if commits and (not checkpoints or checkpoints[-1] != commits[-1]):
+            checkpoints.append(commits[-1])
+        return checkpoints
+
+    def push_repository_in_chunks(self, local_repo_path, repo_name, chunk_size, refs_batch_size, pushed_refs=None, on_ref_pushed=None):
+        if not os.path.exists(local_repo_path):
+            print(f"Warning: Local repository '{local_repo_path}' does not exist. Skipping push.")
+            return False
+        github_repo_url = self._get_push_url(repo_name)
+        pushed_refs = dict(pushed_refs) if pushed_refs else {}
+        # what github already accepted wins over the recorded progress, a chunk is never sent twice
+        pushed_refs.update(self._get_remote_refs(local_repo_path, github_repo_url))
+
+        for branch in self._get_local_refs(local_repo_path, "refs/heads"):
+            checkpoints = self._get_branch_checkpoints(local_repo_path, branch, chunk_size, pushed_refs.get(branch))
+            for index in range(len(checkpoints)):
+                print(f"Pushing chunk {index + 1}/{len(checkpoints)} of '{branch}' to github '{repo_name}'...")
+                self._execute_git_command(["git", "push", github_repo_url, f"{checkpoints[index]}:{branch}"], local_repo_path)
+                if on_ref_pushed:
+                    on_ref_pushed(branch, checkpoints[index])
+
+        remaining_tags = []
+        for tag, object_name in self._get_local_refs(local_repo_path, "refs/tags").items():
+            if pushed_refs.get(tag) != object_name:
+                remaining_tags.append((tag, object_name))
+        for batch_start in range(0, len(remaining_tags), refs_batch_size):
+            tags_batch = remaining_tags[batch_start:batch_start + refs_batch_size]
+            print(f"Pushing tags {batch_start + 1}-{batch_start + len(tags_batch)}/{len(remaining_tags)} to github '{repo_name}'...")
+            self._execute_git_command(["git", "push", github_repo_url] + [tag for tag, _ in tags_batch], local_repo_path)
+            if on_ref_pushed:
+                for tag, object_name in tags_batch:
+                    on_ref_pushed(tag, object_name)
+        print(f"Repository '{repo_name}' pushed to GitHub successfully in chunks.")
+        return True
 
     def create_repository_in_team(self, repo_name):
-        self._create_repo(repo_name)
+        # the org repos are listed once per run, a repository created by an interrupted run is only granted again
+        if self.repository_exists(repo_name):
+            print(f"Repository '{repo_name}' already exists on github, granting its team access only...")
+        else:
+            self._create_repo(repo_name)
         self._add_repo_to_team(repo_name)
 
+    def _execute_graphql_query(self, query, variables, invalidates=None):
+        return self._execute_github_command(GithubConnector.GRAPHQL_URI, method="POST", data={"query": query, "variables": variables}, invalidates=invalidates)
+
+    def _get_graphql_ids(self):
+        with self._graphql_ids_lock:
+            if self._graphql_ids is None:
+                query = "query($organization: String!, $team: String!) { organization(login: $organization) { id team(slug: $team) { id } } }"
+                response = self._execute_graphql_query(query, {"organization": self._github_organization, "team": self._github_team})
+                organization = (response.get("data") or {}).get("organization")
+                if not organization or not organization.get("team"):
+                    raise ValueError(f"Unable to find the github organization '{self._github_organization}' and its team '{self._github_team}': {response.get('errors')}")
+                self._graphql_ids = {"owner": organization["id"], "team": organization["team"]["id"]}
+            return self._graphql_ids
+
+    def _get_graphql_errors(self, response):
+        # an aliased mutation that fails is reported under its alias, the other aliases of the request still succeed
+        errors = {}
+        for error in response.get("errors") or []:
+            alias = (error.get("path") or [None])[0]
+            errors.setdefault(alias, []).append(error.get("message", ""))
+        return errors
+
+    def _execute_aliased_mutations(self, declarations, mutations, variables, invalidates=None):
+        query = f"mutation({', '.join(declarations)}) {{ {' '.join(mutations)} }}"
+        response = self._execute_graphql_query(query, variables, invalidates=invalidates)
+        return response.get("data") or {}, self._get_graphql_errors(response)
+
+    def _create_repositories_batch(self, repo_names, graphql_ids):
+        declarations = ["$ownerId: ID!", "$teamId: ID!"]
+        variables = {"ownerId": graphql_ids["owner"], "teamId": graphql_ids["team"]}
+        mutations = []
+        for index, repo_name in enumerate(repo_names):
+            declarations.append(f"$name{index}: String!")
+            variables[f"name{index}"] = repo_name
+            mutations.append(
+                f"repo{index}: createRepository(input: {{name: $name{index}, ownerId: $ownerId, teamId: $teamId, visibility: PRIVATE, homepageUrl: \"https://github.com\"}}) "
+                "{ repository { id name url } }"
+            )
+        data, errors = self._execute_aliased_mutations(declarations, mutations, variables, invalidates=[f"/orgs/{self._github_organization}/repos"])
+        created_repositories = {}
+        for index, repo_name in enumerate(repo_names):
+            repository = (data.get(f"repo{index}") or {}).get("repository")
+            if repository:
+                created_repositories[repo_name] = repository
+                self._update_org_repos_index(repo_name, {"name": repository["name"], "node_id": repository["id"], "html_url": repository["url"], "private": True})
+            else:
+                print(f"Warning: Creating github repository '{repo_name}' with GraphQL has failed: {errors.get(f'repo{index}', errors.get(None))}")
+        return created_repositories
+
+    def _grant_team_write_permission_batch(self, repositories, graphql_ids):
+        # createRepository only grants the team its default access, the push permission of the REST path is set here
+        repo_names = list(repositories)
+        declarations = ["$teamIds: [ID!]!"]
+        variables = {"teamIds": [graphql_ids["team"]]}
+        mutations = []
+        for index, repo_name in enumerate(repo_names):
+            declarations.append(f"$repositoryId{index}: ID!")
+            variables[f"repositoryId{index}"] = repositories[repo_name]["id"]
+            mutations.append(f"repo{index}: updateTeamsRepository(input: {{teamIds: $teamIds, repositoryId: $repositoryId{index}, permission: WRITE}}) {{ clientMutationId }}")
+        if not mutations:
+            return []
+        data, errors = self._execute_aliased_mutations(declarations, mutations, variables)
+        granted_repo_names = []
+        for index, repo_name in enumerate(repo_names):
+            if f"repo{index}" in data and f"repo{index}" not in errors:
+                granted_repo_names.append(repo_name)
+            else:
+                print(f"Warning: Granting team '{self._github_team}' write access to '{repo_name}' with GraphQL has failed: {errors.get(f'repo{index}', errors.get(None))}")
+        return granted_repo_names
+
+    def create_repositories_in_team(self, repo_names, batch_size=None):
+        # two GraphQL requests per batch instead of two REST calls per repository, failed aliases are retried with REST
+        batch_size = max(1, batch_size if batch_size else self._configurations.github_bulk_create_batch_size)
+        graphql_ids = None
+        try:
+            graphql_ids = self._get_graphql_ids()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Warning: GraphQL is not available, creating the repositories with REST: {e}")
+        created_repo_names = []
+        for batch_start in range(0, len(repo_names), batch_size):
+            batch = repo_names[batch_start:batch_start + batch_size]
+            created_repositories = {}
+            granted_repo_names = []
+            if graphql_ids:
+                try:
+                    created_repositories = self._create_repositories_batch(batch, graphql_ids)
+                    granted_repo_names = self._grant_team_write_permission_batch(created_repositories, graphql_ids)
+                except requests.exceptions.RequestException as e:
+                    print(f"Warning: Creating a batch of {len(batch)} github repositories with GraphQL has failed, falling back to REST: {e}")
+            for repo_name in batch:
+                try:
+                    if repo_name not in created_repositories:
+                        # a GraphQL request that timed out may still have created the repository
+                        if graphql_ids and self._get_existing_repo(repo_name):
+                            print(f"Repository '{repo_name}' already exists on github, granting its team access only...")
+                            self._add_repo_to_team(repo_name)
+                        else:
+                            self.create_repository_in_team(repo_name)
+                    elif repo_name not in granted_repo_names:
+                        self._add_repo_to_team(repo_name)
+                    created_repo_names.append(repo_name)
+                # a single repository must not stop the others
+                except Exception as e:
+                    print(f"Error: Creating github repository '{repo_name}' has failed: {e}")
+            print(f"Created {len(created_repo_names)} of {batch_start + len(batch)} github repositories...")
+        return created_repo_names
+
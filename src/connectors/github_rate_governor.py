@@ -0,0 +1,80 @@
+import time
+import threading
+from src.configs.configurations import Configurations
+
+class GithubRateGovernor:
+
+    CONTENT_CREATING_METHODS = ["POST", "PATCH", "PUT", "DELETE"]
+    RATE_LIMIT_STATUS_CODES = [403, 429]
+    # GitHub asks to wait at least one minute when a secondary rate limit response has no Retry-After header
+    SECONDARY_RATE_LIMIT_DEFAULT_WAIT_SECONDS = 60
+
+    _shared_governors = {}
+    _shared_governors_lock = threading.Lock()
+
+    def __init__(self, content_creation_interval=None, configurations=None):
+        configurations = configurations if configurations else Configurations.snapshot()
+        self._content_creation_interval = content_creation_interval if content_creation_interval is not None else configurations.github_content_creation_interval_seconds
+        self._condition = threading.Condition()
+        self._remaining = None
+        self._reset_at = 0
+        self._paused_until = 0
+        self._next_content_creation_at = 0
+
+    def shared(api_token):
+        # the budget belongs to the token, every connector using the same token shares one governor
+        with GithubRateGovernor._shared_governors_lock:
+            if api_token not in GithubRateGovernor._shared_governors:
+                GithubRateGovernor._shared_governors[api_token] = GithubRateGovernor()
+            return GithubRateGovernor._shared_governors[api_token]
+
+    def _get_wait_until(self, now):
+        wait_until = self._paused_until
+        if self._remaining is not None and self._remaining <= 0 and self._reset_at > now:
+            wait_until = max(wait_until, self._reset_at)
+        return wait_until
+
+    def acquire(self, method):
+        with self._condition:
+            while True:
+                now = time.time()
+                wait_until = self._get_wait_until(now)
+                if wait_until <= now:
+                    break
+                self._condition.wait(wait_until - now)
+            if self._remaining is not None:
+                self._remaining -= 1
+            content_creation_delay = 0
+            if method in GithubRateGovernor.CONTENT_CREATING_METHODS:
+                scheduled_at = max(now, self._next_content_creation_at)
+                self._next_content_creation_at = scheduled_at + self._content_creation_interval
+                content_creation_delay = scheduled_at - now
+        if content_creation_delay > 0:
+            time.sleep(content_creation_delay)
+
+    def _get_retry_delay(self, response):
+        if response.status_code not in GithubRateGovernor.RATE_LIMIT_STATUS_CODES:
+            return 0
+        headers = response.headers
+        if "Retry-After" in headers:
+            return float(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0":
+            return max(1, float(headers.get("X-RateLimit-Reset", 0)) - time.time())
+        if "secondary rate limit" in response.text.lower():
+            return GithubRateGovernor.SECONDARY_RATE_LIMIT_DEFAULT_WAIT_SECONDS
+        return 0
+
+    def update(self, response):
+        headers = response.headers
+        retry_delay = self._get_retry_delay(response)
+        # the graphql api has its own points budget, only the rest budget is tracked
+        is_core_budget = headers.get("X-RateLimit-Resource", "core") == "core"
+        with self._condition:
+            if is_core_budget and "X-RateLimit-Remaining" in headers:
+                self._remaining = int(headers["X-RateLimit-Remaining"])
+            if is_core_budget and "X-RateLimit-Reset" in headers:
+                self._reset_at = float(headers["X-RateLimit-Reset"])
+            if retry_delay:
+                self._paused_until = max(self._paused_until, time.time() + retry_delay)
+            self._condition.notify_all()
+        return retry_delay
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+import requests
+from requests.structures import CaseInsensitiveDict
+
+class HttpResponseCache:
+
+    # headers describing the stored body, a 304 response must not replace them
+    BODY_HEADERS = ["content-length", "content-encoding", "transfer-encoding", "content-type"]
+
+    def __init__(self, max_entries=1000, directory=None):
+        self._max_entries = max(1, max_entries)
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        if self._directory:
+            os.makedirs(self._directory, exist_ok=True)
+            self._load_entries()
+
+    def get_key(url, authorization=""):
+        # responses depend on the credentials, two tokens never share an entry
+        return hashlib.sha256(f"{authorization}\n{url}".encode()).hexdigest()
+
+    def _get_entry_file_path(self, key):
+        return f"{self._directory}/{key}.json"
+
+    def _load_entries(self):
+        entries = []
+        for file_name in os.listdir(self._directory):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(f"{self._directory}/{file_name}", "r") as entry_file:
+                    entry = json.load(entry_file)
+                entry["content"] = base64.b64decode(entry["content"])
+                entries.append((file_name.removesuffix(".json"), entry))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Ignoring unreadable http cache entry '{file_name}': {e}")
+        for key, entry in sorted(entries, key=lambda item: item[1]["stored_at"])[-self._max_entries:]:
+            self._entries[key] = entry
+
+    def _write_entry(self, key, entry):
+        entry_file_path = self._get_entry_file_path(key)
+        temp_file_path = f"{entry_file_path}.{os.getpid()}.{threading.get_ident()}.temp"
+        with open(temp_file_path, "w") as entry_file:
+            json.dump(dict(entry, content=base64.b64encode(entry["content"]).decode()), entry_file)
+        os.replace(temp_file_path, entry_file_path)
+
+    def _remove_entry_file(self, key):
+        try:
+            os.remove(self._get_entry_file_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _get_entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get_fresh_response(self, key, ttl):
+        entry = self._get_entry(key)
+        if not entry or time.time() - entry["stored_at"] >= ttl:
+            return None
+        return self._get_response(entry)
+
+    def get_validation_headers(self, key):
+        entry = self._get_entry(key)
+        headers = {}
+        if not entry:
+            return headers
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def store(self, key, url, response):
+        entry = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": {name.lower(): value for name, value in response.headers.items()},
+            "encoding": response.encoding,
+            "content": response.content,
+            "stored_at": time.time()
+        }
+        self._put_entry(key, entry)
+
+    def revalidate(self, key, not_modified_response):
+        entry = self._get_entry(key)
+        if not entry:
+            return None
+        # the 304 headers (rate limit, validators) replace the stored ones, the body is kept
+        headers = dict(entry["headers"])
+        for name, value in not_modified_response.headers.items():
+            if name.lower() not in HttpResponseCache.BODY_HEADERS:
+                headers[name.lower()] = value
+        entry = dict(entry, headers=headers, stored_at=time.time())
+        self._put_entry(key, entry)
+        return self._get_response(entry)
+
+    def _put_entry(self, key, entry):
+        evicted_keys = []
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                evicted_keys.append(evicted_key)
+        if self._directory:
+            self._write_entry(key, entry)
+            # the directory only holds the entries kept in memory, so an invalidation reaches all of them
+            for evicted_key in evicted_keys:
+                self._remove_entry_file(evicted_key)
+
+    def invalidate(self, url_prefixes):
+        with self._lock:
+            invalidated_keys = [
+                key for key, entry in self._entries.items()
+                if any(entry["url"].startswith(url_prefix) for url_prefix in url_prefixes)
+            ]
+            for key in invalidated_keys:
+                del self._entries[key]
+        if self._directory:
+            for key in invalidated_keys:
+                self._remove_entry_file(key)
+        return len(invalidated_keys)
+
+    def _get_response(self, entry):
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response.url = entry["url"]
+        response.reason = "OK"
+        response._content = entry["content"]
+        return response
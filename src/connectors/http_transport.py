@@ -0,0 +1,160 @@
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from src.configs.configurations import Configurations
+from src.connectors.metrics_registry import MetricsRegistry
+from src.connectors.http_response_cache import HttpResponseCache
+
+class HttpTransport:
+
+    RETRY_STATUS_CODES = [500, 502, 503, 504]
+    IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS", "PUT", "DELETE"]
+    SAFE_METHODS = ["GET", "HEAD", "OPTIONS"]
+
+    _shared_transport = None
+    _shared_transport_lock = threading.Lock()
+
+    def __init__(
+            self,
+            pool_size=None,
+            timeout=None,
+            max_retries=None,
+            backoff_factor=None,
+            max_backoff=None,
+            response_cache=None,
+            configurations=None
+        ):
+        configurations = configurations if configurations else Configurations.snapshot()
+        self._pool_size = pool_size if pool_size else configurations.http_pool_size
+        self._timeout = timeout if timeout else configurations.http_timeout_seconds
+        self._max_retries = max_retries if max_retries is not None else configurations.http_max_retries
+        self._backoff_factor = backoff_factor if backoff_factor is not None else configurations.http_backoff_factor_seconds
+        self._max_backoff = max_backoff if max_backoff is not None else configurations.http_max_backoff_seconds
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self._metrics_registry = MetricsRegistry.shared()
+        self._response_cache = response_cache
+        if not self._response_cache and configurations.ff_enable_http_cache:
+            self._response_cache = HttpResponseCache(configurations.http_cache_max_entries, configurations.http_cache_directory)
+
+    def shared():
+        with HttpTransport._shared_transport_lock:
+            if HttpTransport._shared_transport is None:
+                HttpTransport._shared_transport = HttpTransport()
+            return HttpTransport._shared_transport
+
+    def _get_session(self, url):
+        url_parts = urlsplit(url)
+        host = f"{url_parts.scheme}://{url_parts.netloc}"
+        with self._sessions_lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return self._sessions[host]
+
+    def _can_retry(self, method, attempt, error=None):
+        if attempt >= self._max_retries:
+            return False
+        if method in HttpTransport.IDEMPOTENT_METHODS:
+            return True
+        # a non idempotent request is only replayed when it never reached the server
+        return HttpTransport._is_connect_error(error)
+
+    def _is_connect_error(error):
+        # a reset or read timeout can happen after the server has already processed the request
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+            return False
+        reason = error.args[0]
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        return isinstance(reason, NewConnectionError)
+
+    def _wait_before_retry(self, attempt):
+        backoff = min(self._max_backoff, self._backoff_factor * (2 ** attempt))
+        time.sleep(random.uniform(0, backoff))
+
+    def _get_cache_key(self, url, headers):
+        return HttpResponseCache.get_key(url, headers.get("Authorization", "") if headers else "")
+
+    def get_fresh_response(self, url, headers=None, cache_ttl=None, service="http"):
+        if not self._response_cache or cache_ttl is None:
+            return None
+        response = self._response_cache.get_fresh_response(self._get_cache_key(url, headers), cache_ttl)
+        if response is not None:
+            self._metrics_registry.count_http_cache(service, "hit")
+        return response
+
+    def _send(self, method, url, headers, json, data, timeout, service, endpoint):
+        session = self._get_session(url)
+        # the path of a webhook url is its secret, only the host and the endpoint label are printed
+        url_parts = urlsplit(url)
+        printed_url = f"{url_parts.scheme}://{url_parts.hostname}/{endpoint}"
+        attempt = 0
+        while True:
+            start_time = time.time()
+            try:
+                response = session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=json,
+                    data=data,
+                    timeout=timeout if timeout else self._timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._metrics_registry.observe_api_call(service, endpoint, method, type(e).__name__, time.time() - start_time)
+                if not self._can_retry(method, attempt, e):
+                    raise
+                print(f"Warning: {method} {printed_url} has failed with {type(e).__name__}, retrying ({attempt + 1}/{self._max_retries})...")
+            else:
+                self._metrics_registry.observe_api_call(service, endpoint, method, response.status_code, time.time() - start_time)
+                if response.status_code not in HttpTransport.RETRY_STATUS_CODES or not self._can_retry(method, attempt):
+                    return response
+                print(f"Warning: {method} {printed_url} has returned {response.status_code}, retrying ({attempt + 1}/{self._max_retries})...")
+            self._wait_before_retry(attempt)
+            attempt += 1
+
+    def _send_cached(self, url, headers, data, timeout, cache_ttl, service, endpoint):
+        response = self.get_fresh_response(url, headers, cache_ttl, service)
+        if response is not None:
+            return response
+        cache_key = self._get_cache_key(url, headers)
+        # a stale entry is revalidated, the server answers 304 without the body when it has not changed
+        request_headers = dict(headers if headers else {}, **self._response_cache.get_validation_headers(cache_key))
+        response = self._send("GET", url, request_headers, None, data, timeout, service, endpoint)
+        if response.status_code == 304:
+            cached_response = self._response_cache.revalidate(cache_key, response)
+            if cached_response is not None:
+                self._metrics_registry.count_http_cache(service, "revalidated")
+                return cached_response
+            # the entry was invalidated while the request was in flight
+            return self._send("GET", url, headers, None, data, timeout, service, endpoint)
+        self._metrics_registry.count_http_cache(service, "miss")
+        if response.status_code == 200:
+            self._response_cache.store(cache_key, url, response)
+        return response
+
+    def request(self, method, url, headers=None, json=None, data=None, timeout=None, service="http", endpoint="other", cache_ttl=None, invalidates=None):
+        # cache_ttl: seconds a GET response is served without asking the server, None to bypass the cache
+        # invalidates: url prefixes of the cached responses changed by a write, the written url by default
+        if self._response_cache and method == "GET" and cache_ttl is not None:
+            return self._send_cached(url, headers, data, timeout, cache_ttl, service, endpoint)
+        response = self._send(method, url, headers, json, data, timeout, service, endpoint)
+        if self._response_cache and method not in HttpTransport.SAFE_METHODS:
+            self._response_cache.invalidate(invalidates if invalidates else [url.split("?")[0]])
+        return response
+
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
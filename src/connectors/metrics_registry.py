@@ -0,0 +1,207 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+class MetricsRegistry:
+
+    API_CALL_DURATION_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+    STAGE_DURATION_BUCKETS = [1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200]
+    METRICS_DESCRIPTIONS = {
+        "migration_api_calls": "API calls by service, endpoint, method and status",
+        "migration_api_call_duration_seconds": "API call latency by service, endpoint, method and status",
+        "migration_stage_duration_seconds": "Migration stage durations by stage and status",
+        "migration_transferred_bytes": "Repository bytes transferred by direction",
+        "migration_repositories": "Migrated repositories by status",
+        "migration_http_cache_requests": "Cacheable GET requests by service and result (hit, revalidated, miss)"
+    }
+
+    _shared_registry = None
+    _shared_registry_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def shared():
+        with MetricsRegistry._shared_registry_lock:
+            if MetricsRegistry._shared_registry is None:
+                MetricsRegistry._shared_registry = MetricsRegistry()
+            return MetricsRegistry._shared_registry
+
+    def get_endpoint_label(uri, identified_segments):
+        # identifiers are replaced so that every repository, project or build type shares the same endpoint label
+        label_segments = []
+        identifiers_count = 0
+        for segment in uri.split("?")[0].split("/"):
+            if identifiers_count:
+                label_segments.append("{id}")
+                identifiers_count -= 1
+            elif ":" in segment or segment.isdigit():
+                label_segments.append("{id}")
+            else:
+                label_segments.append(segment)
+                identifiers_count = identified_segments.get(segment, 0)
+        return "/".join(label_segments)
+
+    def _get_labels_key(self, labels):
+        return tuple(sorted(labels.items()))
+
+    def increment(self, name, labels, value=1):
+        key = (name, self._get_labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, self._get_labels_key(labels))
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = {"buckets": buckets, "bucket_counts": [0] * len(buckets), "count": 0, "sum": 0}
+            histogram = self._histograms[key]
+            for index, bucket in enumerate(histogram["buckets"]):
+                if value <= bucket:
+                    histogram["bucket_counts"][index] += 1
+            histogram["count"] += 1
+            histogram["sum"] += value
+
+    def observe_api_call(self, service, endpoint, method, status, duration):
+        labels = {"service": service, "endpoint": endpoint, "method": method, "status": str(status)}
+        self.increment("migration_api_calls", labels)
+        self.observe("migration_api_call_duration_seconds", labels, duration, MetricsRegistry.API_CALL_DURATION_BUCKETS)
+
+    def observe_stage(self, stage, duration, status):
+        self.observe("migration_stage_duration_seconds", {"stage": stage, "status": status}, duration, MetricsRegistry.STAGE_DURATION_BUCKETS)
+
+    @contextmanager
+    def stage_timer(self, stage):
+        start_time = time.time()
+        try:
+            yield
+        except BaseException:
+            self.observe_stage(stage, time.time() - start_time, "failed")
+            raise
+        self.observe_stage(stage, time.time() - start_time, "succeeded")
+
+    def add_transferred_bytes(self, direction, transferred_bytes):
+        self.increment("migration_transferred_bytes", {"direction": direction}, transferred_bytes)
+
+    def count_repository(self, status):
+        self.increment("migration_repositories", {"status": status})
+
+    def count_http_cache(self, service, result):
+        self.increment("migration_http_cache_requests", {"service": service, "result": result})
+
+    def get_counter_total(self, name, labels=None):
+        # counters whose labels include all the given ones are summed up
+        labels = labels if labels else {}
+        with self._lock:
+            return sum(
+                value for (counter_name, labels_key), value in self._counters.items()
+                if counter_name == name and all(dict(labels_key).get(label) == label_value for label, label_value in labels.items())
+            )
+
+    def _format_labels(self, labels_key, extra_labels=()):
+        labels = list(labels_key) + list(extra_labels)
+        if not labels:
+            return ""
+        escaped_labels = []
+        for name, value in labels:
+            escaped_value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            escaped_labels.append(f"{name}=\"{escaped_value}\"")
+        return "{" + ",".join(escaped_labels) + "}"
+
+    def _format_value(self, value):
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+    def get_openmetrics_text(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(histogram, bucket_counts=list(histogram["bucket_counts"])) for key, histogram in self._histograms.items()}
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"# HELP {name} {MetricsRegistry.METRICS_DESCRIPTIONS.get(name, name)}")
+            for (counter_name, labels_key), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f"{name}_total{self._format_labels(labels_key)} {self._format_value(value)}")
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"# HELP {name} {MetricsRegistry.METRICS_DESCRIPTIONS.get(name, name)}")
+            for (histogram_name, labels_key), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if histogram_name != name:
+                    continue
+                for bucket, bucket_count in zip(histogram["buckets"], histogram["bucket_counts"]):
+                    lines.append(f"{name}_bucket{self._format_labels(labels_key, [('le', self._format_value(bucket))])} {bucket_count}")
+                lines.append(f"{name}_bucket{self._format_labels(labels_key, [('le', '+Inf')])} {histogram['count']}")
+                lines.append(f"{name}_count{self._format_labels(labels_key)} {histogram['count']}")
+                lines.append(f"{name}_sum{self._format_labels(labels_key)} {self._format_value(histogram['sum'])}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, textfile_path):
+        textfile_directory = os.path.dirname(textfile_path)
+        if textfile_directory:
+            os.makedirs(textfile_directory, exist_ok=True)
+        # the scraper must never read a half written file
+        temp_file_path = f"{textfile_path}.{os.getpid()}.{threading.get_ident()}.temp"
+        with open(temp_file_path, "w") as textfile:
+            textfile.write(self.get_openmetrics_text())
+        os.replace(temp_file_path, textfile_path)
+
+    def print_table(headers, rows):
+        widths = [max(len(value) for value in column) for column in zip(headers, *rows)]
+        separator = "+".join("-" * (width + 2) for width in widths)
+        print(separator)
+        print("|".join(f" {value.ljust(width)} " for value, width in zip(headers, widths)))
+        print(separator)
+        for row in rows:
+            print("|".join(f" {value.ljust(width)} " for value, width in zip(row, widths)))
+        print(separator)
+
+    def print_summary(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(histogram) for key, histogram in self._histograms.items()}
+        stages = {}
+        api_calls = {}
+        for (name, labels_key), histogram in histograms.items():
+            labels = dict(labels_key)
+            if name == "migration_stage_duration_seconds":
+                stage = stages.setdefault(labels["stage"], {"count": 0, "failed": 0, "sum": 0})
+                stage["count"] += histogram["count"]
+                stage["sum"] += histogram["sum"]
+                if labels["status"] == "failed":
+                    stage["failed"] += histogram["count"]
+            elif name == "migration_api_call_duration_seconds":
+                api_call = api_calls.setdefault((labels["service"], labels["endpoint"], labels["method"]), {"count": 0, "errors": 0, "sum": 0})
+                api_call["count"] += histogram["count"]
+                api_call["sum"] += histogram["sum"]
+                if not labels["status"].isdigit() or int(labels["status"]) >= 400:
+                    api_call["errors"] += histogram["count"]
+        print("Migration stages:")
+        MetricsRegistry.print_table(
+            ["stage", "count", "failed", "total", "average"],
+            [
+                [stage_name, str(stage["count"]), str(stage["failed"]), f"{stage['sum']:.1f}s", f"{stage['sum'] / stage['count']:.1f}s"]
+                for stage_name, stage in sorted(stages.items(), key=lambda item: item[1]["sum"], reverse=True)
+            ]
+        )
+        print("API calls:")
+        MetricsRegistry.print_table(
+            ["service", "endpoint", "method", "calls", "errors", "total", "average"],
+            [
+                [service, endpoint, method, str(api_call["count"]), str(api_call["errors"]), f"{api_call['sum']:.1f}s", f"{api_call['sum'] / api_call['count'] * 1000:.0f}ms"]
+                for (service, endpoint, method), api_call in sorted(api_calls.items(), key=lambda item: item[1]["sum"], reverse=True)
+            ]
+        )
+        transferred_bytes = {dict(labels_key)["direction"]: value for (name, labels_key), value in counters.items() if name == "migration_transferred_bytes"}
+        for direction, value in sorted(transferred_bytes.items()):
+            print(f"Transferred bytes ({direction}): {value / 1024 ** 2:.1f} MB")
+        http_cache_requests = {}
+        for (name, labels_key), value in counters.items():
+            if name == "migration_http_cache_requests":
+                labels = dict(labels_key)
+                http_cache_requests.setdefault(labels["service"], {})[labels["result"]] = value
+        for service, results in sorted(http_cache_requests.items()):
+            print(f"HTTP cache ({service}): {results.get('hit', 0)} hits, {results.get('revalidated', 0)} revalidated, {results.get('miss', 0)} misses")
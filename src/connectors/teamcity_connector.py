@@ -1,25 +1,41 @@
 import json
 import csv
 import requests
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from src.configs.configurations import Configurations
+from src.connectors.http_transport import HttpTransport
+from src.connectors.metrics_registry import MetricsRegistry
 
 class TeamcityConnector:
     
+    VCS_ROOTS_MAX_COUNT = 100000
+    BUILDTYPES_MAX_COUNT = 100000
+    # the project tree rarely changes during a run, vcs roots and features are revalidated on every read
+    PROJECT_TREE_CACHE_TTL_SECONDS = 300
+    SETTINGS_CACHE_TTL_SECONDS = 0
+    # path segments followed by an identifier, replaced in the metrics endpoint labels
+    ENDPOINT_IDENTIFIED_SEGMENTS = {"projects": 1, "buildTypes": 1, "vcs-roots": 1}
+
     def __init__(
             self,
             token=None,
             server_host=None,
-            bitbucket_server_host=None
+            bitbucket_server_host=None,
+            configurations=None
         ):
-        self._token = token if token else Configurations.get_teamcity_token()
-        self._server_host = server_host if server_host else Configurations.get_teamcity_server_host()
+        self._configurations = configurations if configurations else Configurations.snapshot()
+        self._token = token if token else self._configurations.teamcity_token
+        self._server_host = server_host if server_host else self._configurations.teamcity_server_host
         self._base_url = f"https://{self._server_host}/app/rest"
-        self._bitbucket_server_host = bitbucket_server_host if bitbucket_server_host else Configurations.get_teamcity_server_host()
-        self._teamcity_project_id = Configurations.get_teamcity_project_id()
+        self._http_transport = HttpTransport.shared()
+        self._bitbucket_server_host = bitbucket_server_host if bitbucket_server_host else self._configurations.bitbucket_server_host
+        self._teamcity_project_id = self._configurations.teamcity_project_id
+        self._max_concurrency = max(1, self._configurations.teamcity_max_concurrency)
         if not all([self._token, self._server_host]):
             raise ValueError("Missing required parameters in .env file or in the exported envionment variables.")
 
-    def _execute_teamcity_command(self, uri, method="GET", data=None, is_text=False):
+    def _execute_teamcity_command(self, uri, method="GET", data=None, is_text=False, cache_ttl=None, invalidates=None):
         headers = {
             "Authorization": f"Bearer {self._token}"
         }
@@ -30,15 +46,17 @@ class TeamcityConnector:
             headers["Content-Type"] = "application/json"
             headers["Accept"] = "application/json"
         url = f"{self._base_url}{uri}"
+        endpoint = MetricsRegistry.get_endpoint_label(uri, TeamcityConnector.ENDPOINT_IDENTIFIED_SEGMENTS)
+        invalidated_urls = [f"{self._base_url}{invalidated_uri}" for invalidated_uri in invalidates] if invalidates else None
         response = None
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers)
+                response = self._http_transport.request("GET", url, headers=headers, service="teamcity", endpoint=endpoint, cache_ttl=cache_ttl)
             elif method == "PUT":
                 if is_text:
-                    response = requests.put(url, headers=headers, data=data)
+                    response = self._http_transport.request("PUT", url, headers=headers, data=data, service="teamcity", endpoint=endpoint, invalidates=invalidated_urls)
                 else:
-                    response = requests.put(url, headers=headers, json=data)
+                    response = self._http_transport.request("PUT", url, headers=headers, json=data, service="teamcity", endpoint=endpoint, invalidates=invalidated_urls)
             else:
                 raise ValueError('Request method not supported in code')
             response.raise_for_status()
@@ -48,18 +66,47 @@ class TeamcityConnector:
                 return response.json() if response.text else {}
         except requests.exceptions.RequestException as e:
             print(f"Error executing TeamCity command: {e}")
-            exit(1)
+            raise
             
     def _get_sub_projects(self, project_id):
         uri = f"/projects/id:{project_id}?fields=projects(*)"
-        subprojects = self._execute_teamcity_command(uri, method="GET")
+        subprojects = self._execute_teamcity_command(uri, method="GET", cache_ttl=TeamcityConnector.PROJECT_TREE_CACHE_TTL_SECONDS)
         if "projects" in subprojects and "project" in subprojects["projects"]:
             return subprojects["projects"]["project"]
         return []
     
+    def _get_project_tree_items(self, project_id, get_project_items):
+        subprojects_ids = {}
+        project_items_futures = {}
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            pending_subprojects = {executor.submit(self._get_sub_projects, project_id): project_id}
+            project_items_futures[project_id] = executor.submit(get_project_items, project_id)
+            while pending_subprojects:
+                done, _ = wait(pending_subprojects, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent_project_id = pending_subprojects.pop(future)
+                    subprojects_ids[parent_project_id] = []
+                    for subproject in future.result():
+                        subproject_id = subproject["id"]
+                        subprojects_ids[parent_project_id].append(subproject_id)
+                        if subproject_id in project_items_futures:
+                            continue
+                        pending_subprojects[executor.submit(self._get_sub_projects, subproject_id)] = subproject_id
+                        project_items_futures[subproject_id] = executor.submit(get_project_items, subproject_id)
+        # keep the depth-first order of the former recursive traversal
+        project_items = {}
+        projects_to_visit = [project_id]
+        while projects_to_visit:
+            current_project_id = projects_to_visit.pop()
+            if current_project_id in project_items:
+                continue
+            project_items[current_project_id] = project_items_futures[current_project_id].result()
+            projects_to_visit.extend(reversed(subprojects_ids.get(current_project_id, [])))
+        return project_items
+
     def _get_project_buildtypes(self, project_id):
         uri = f"/projects/id:{project_id}/buildTypes"
-        buildtypes = self._execute_teamcity_command(uri, method="GET")
+        buildtypes = self._execute_teamcity_command(uri, method="GET", cache_ttl=TeamcityConnector.PROJECT_TREE_CACHE_TTL_SECONDS)
         if "buildType" in buildtypes:
             return buildtypes["buildType"]
         return []
@@ -67,7 +114,7 @@ class TeamcityConnector:
     def _get_vcs_roots_for_project(self, project_id):
         vcs_roots = []
         uri = f"/vcs-roots?locator=project:(id:{project_id})"
-        vcs_roots_response = self._execute_teamcity_command(uri, method="GET")
+        vcs_roots_response = self._execute_teamcity_command(uri, method="GET", cache_ttl=TeamcityConnector.PROJECT_TREE_CACHE_TTL_SECONDS)
         if "vcs-root" in vcs_roots_response:
             for vcs_root in vcs_roots_response["vcs-root"]:
                 vcs_roots.append(vcs_root)
@@ -75,38 +122,58 @@ class TeamcityConnector:
 
     def _get_vcs_root_properties(self, vcs_root_id):
         uri = f"/vcs-roots/{vcs_root_id}/properties"
-        properties = self._execute_teamcity_command(uri, method="GET")
+        properties = self._execute_teamcity_command(uri, method="GET", cache_ttl=TeamcityConnector.SETTINGS_CACHE_TTL_SECONDS)
         if "property" in properties:
             return properties["property"]
         return []
 
-    def get_vcs_root_url(self, vcs_root_href):
-        uri = f"{vcs_root_href}/properties/url"
-        return self._execute_teamcity_command(uri, method="GET", is_text=True)
+    def normalize_repository_url(repository_url):
+        repository_url = repository_url.strip().lower().removesuffix("/").removesuffix(".git")
+        url_parts = urlsplit(repository_url)
+        if url_parts.scheme and url_parts.hostname:
+            return f"{url_parts.hostname}{url_parts.path}"
+        # scp-like urls, e.g. git@host:project/repo
+        user_and_host, _, path = repository_url.partition(":")
+        return f"{user_and_host.split('@')[-1]}/{path.lstrip('/')}"
+
+    def get_vcs_roots_url_index(self, project_id):
+        uri = f"/vcs-roots?locator=affectedProject:(id:{project_id}),count:{TeamcityConnector.VCS_ROOTS_MAX_COUNT}&fields=vcs-root(id,href,properties(property(name,value)))"
+        vcs_roots_response = self._execute_teamcity_command(uri, method="GET")
+        vcs_roots_url_index = {}
+        for vcs_root in vcs_roots_response.get("vcs-root", []):
+            for property in vcs_root.get("properties", {}).get("property", []):
+                if property["name"] == "url" and property.get("value"):
+                    repository_url = TeamcityConnector.normalize_repository_url(property["value"])
+                    vcs_roots_url_index.setdefault(repository_url, []).append(vcs_root["href"])
+        return vcs_roots_url_index
 
     def _update_vcs_root_properties(self, vcs_root_id, properties):
         uri = f"/vcs-roots/{vcs_root_id}/properties"
-        return self._execute_teamcity_command(uri, method="PUT", data={"property": properties})
+        # the project listings embed the vcs root properties, they are invalidated too
+        return self._execute_teamcity_command(uri, method="PUT", data={"property": properties}, invalidates=["/vcs-roots"])
 
     def _get_buildtype_features(self, buildtype_id):
         uri = f"/buildTypes/id:{buildtype_id}/features"
-        features = self._execute_teamcity_command(uri, method="GET")
+        features = self._execute_teamcity_command(uri, method="GET", cache_ttl=TeamcityConnector.SETTINGS_CACHE_TTL_SECONDS)
         if "feature" in features:
             return features["feature"]
         return []
 
+    def _get_project_buildtypes_features(self, project_id):
+        uri = f"/buildTypes?locator=affectedProject:(id:{project_id}),count:{TeamcityConnector.BUILDTYPES_MAX_COUNT}&fields=buildType(id,features(feature(id,type,disabled,inherited,properties(property(name,value)))))"
+        buildtypes = self._execute_teamcity_command(uri, method="GET")
+        if "buildType" in buildtypes:
+            return buildtypes["buildType"]
+        return []
+
     def _update_buildtype_features(self, buildtype_id, features):
         uri = f"/buildTypes/id:{buildtype_id}/features"
-        return self._execute_teamcity_command(uri, method="PUT", data={"feature": features})
+        # only the build type's own features are cached, the project listings do not embed them and stay cached
+        return self._execute_teamcity_command(uri, method="PUT", data={"feature": features}, invalidates=[f"/buildTypes/id:{buildtype_id}/"])
 
     def generate_vcs_roots_csv(self, project_id, csv_file_path):
         try:
-            vcs_roots = {}
-            vcs_roots[project_id] = self._get_vcs_roots_for_project(project_id)
-            subprojects = self._get_sub_projects(project_id)
-            for subproject in subprojects:
-                subproject_vcs_roots = self.generate_vcs_roots_csv(subproject["id"], "")
-                vcs_roots.update(subproject_vcs_roots)
+            vcs_roots = self._get_project_tree_items(project_id, self._get_vcs_roots_for_project)
             if csv_file_path:
                 with open(csv_file_path, mode="w", newline='') as csv_file:
                     fieldnames = ["project", "vcs_id", "vcs_href"]
@@ -126,12 +193,7 @@ class TeamcityConnector:
 
     def generate_buildtypes_csv(self, project_id, csv_file_path):
         try:
-            buildTypes = {}
-            buildTypes[project_id] = self._get_project_buildtypes(project_id)
-            subprojects = self._get_sub_projects(project_id)
-            for subproject in subprojects:
-                subproject_buildtypes = self.generate_buildtypes_csv(subproject["id"], "")
-                buildTypes.update(subproject_buildtypes)
+            buildTypes = self._get_project_tree_items(project_id, self._get_project_buildtypes)
             if csv_file_path:
                 with open(csv_file_path, mode="w", newline='') as csv_file:
                     fieldnames = ["project", "buildtype_id", "buildtype_href"]
@@ -154,7 +216,8 @@ class TeamcityConnector:
             vcs_root_id = vcs_href.removeprefix("/app/rest/vcs-roots/id:")
             properties = self._get_vcs_root_properties(vcs_root_id)
             if not properties:
-                return
+                print(f"Error: No properties found in VCS root '{vcs_root_id}'")
+                return False
             updated_properties = []
             updated_properties_keys = []
             for original_property in properties:
@@ -208,12 +271,14 @@ class TeamcityConnector:
                     "value": "USERID"
                 })
             self._update_vcs_root_properties(vcs_root_id, updated_properties)
+            return True
         except Exception as e:
             print(f"Error: {e}")
+            return False
             
-    def update_buildtype_commit_status_publisher(self, buildtype_id):
-        buildtype_features = self._get_buildtype_features(buildtype_id)
+    def _get_updated_commit_status_publisher_features(self, buildtype_features):
         updated_features = []
+        is_changed = False
         for feature in buildtype_features:
             if feature["type"] != "commit-status-publisher":
                 updated_features.append(feature)
@@ -249,6 +314,43 @@ class TeamcityConnector:
                     })
                 feature["properties"]["property"] = updated_feature_properties
                 updated_features.append(feature)
+                is_changed = True
             else:
                 updated_features.append(feature)
+        return updated_features, is_changed
+
+    def update_buildtype_commit_status_publisher(self, buildtype_id):
+        buildtype_features = self._get_buildtype_features(buildtype_id)
+        updated_features, is_changed = self._get_updated_commit_status_publisher_features(buildtype_features)
+        if not is_changed:
+            print(f"Build type '{buildtype_id}' has no Bitbucket commit status publisher, skipping...")
+            return
         self._update_buildtype_features(buildtype_id, updated_features)
+
+    def update_buildtypes_commit_status_publisher(self, project_id):
+        buildtypes_features = self._get_project_buildtypes_features(project_id)
+        changed_buildtypes = []
+        for buildtype in buildtypes_features:
+            buildtype_features = buildtype.get("features", {}).get("feature", [])
+            updated_features, is_changed = self._get_updated_commit_status_publisher_features(buildtype_features)
+            if is_changed:
+                changed_buildtypes.append((buildtype["id"], updated_features))
+        failed_buildtypes = []
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            futures = {
+                executor.submit(self._update_buildtype_features, buildtype_id, updated_features): buildtype_id
+                for buildtype_id, updated_features in changed_buildtypes
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error: Updating commit status publisher of build type '{futures[future]}' has failed: {e}")
+                    failed_buildtypes.append(futures[future])
+        summary = {
+            "updated": len(changed_buildtypes) - len(failed_buildtypes),
+            "skipped": len(buildtypes_features) - len(changed_buildtypes),
+            "failed": failed_buildtypes
+        }
+        print(f"Commit status publishers in '{project_id}': {summary['updated']} updated, {summary['skipped']} skipped as unchanged, {len(failed_buildtypes)} failed")
+        return summary
@@ -1,15 +1,20 @@
 import requests
 from src.configs.configurations import Configurations
+from src.connectors.http_transport import HttpTransport
 
 class TeamsConnector:
     
-    def __init__(self, webhook_url=None):
-        self._webhook_url = webhook_url if webhook_url else Configurations.get_teams_webhook_url()
+    MESSAGE_COLORS = {"Success": "#00FF00", "Failure": "#FF0000", "Information": "#FFFF00"}
+
+    def __init__(self, webhook_url=None, configurations=None):
+        self._configurations = configurations if configurations else Configurations.snapshot()
+        self._webhook_url = webhook_url if webhook_url else self._configurations.teams_webhook_url
         if not self._webhook_url:
             raise ValueError("Missing TEAMS_WEBHOOK_URL in .env file or in the exported envionment variables.")
+        self._http_transport = HttpTransport.shared()
             
-    def _send_message(self, color, title, message, details=None):
-        payload = {
+    def get_message_card(self, color, title, message, facts=None):
+        return {
             "@type": "MessageCard",
             "@context": "http://schema.org/extensions",
             "themeColor": color,
@@ -19,26 +24,29 @@ class TeamsConnector:
                     "activityTitle": title,
                     "activitySubtitle": message,
                     "activityImage": "",
-                    "facts": [],
+                    "facts": facts if facts else [],
                 }
             ],
         }
-        
-        if details:
-            payload["sections"][0]["facts"].append({"name": "Details", "value": details})
-            
+
+    def post_message_card(self, message_card):
+        # the webhook url holds its secret in the path, it never becomes a metrics label
+        response = self._http_transport.request("POST", self._webhook_url, json=message_card, service="teams", endpoint="webhook")
+        response.raise_for_status()
+
+    def _send_message(self, color, title, message, details=None):
+        facts = [{"name": "Details", "value": details}] if details else []
         try:
-            response = requests.post(self._webhook_url, json=payload)
-            response.raise_for_status()
+            self.post_message_card(self.get_message_card(color, title, message, facts))
             print("Message sent successfully.")
         except requests.exceptions.RequestException as e:
             print(f"Error sending message: {e}")
 
     def send_success_message(self, message="Success", details=None):
-        self._send_message("#00FF00", "Success", message, details)
+        self._send_message(TeamsConnector.MESSAGE_COLORS["Success"], "Success", message, details)
 
     def send_failure_message(self, message="Failure", details=None):
-        self._send_message("#FF0000", "Failure", message, details)
+        self._send_message(TeamsConnector.MESSAGE_COLORS["Failure"], "Failure", message, details)
     
     def send_info_message(self, message="Information", details=None):
-        self._send_message("#FFFF00", "Information", message, details)
+        self._send_message(TeamsConnector.MESSAGE_COLORS["Information"], "Information", message, details)
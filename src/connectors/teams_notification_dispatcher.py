@@ -0,0 +1,135 @@
+import time
+import queue
+import random
+import atexit
+import threading
+from datetime import datetime
+import requests
+from src.configs.configurations import Configurations
+from src.connectors.teams_connector import TeamsConnector
+
+class TeamsNotificationDispatcher:
+
+    # teams truncates message cards with too many facts, larger bursts are split into several digests
+    DIGEST_MAX_NOTIFICATIONS = 50
+    RETRY_BACKOFF_FACTOR_SECONDS = 1
+    RETRY_MAX_BACKOFF_SECONDS = 60
+    POLL_INTERVAL_SECONDS = 0.5
+
+    def __init__(
+            self,
+            teams_connector=None,
+            queue_size=None,
+            digest_interval=None,
+            max_retries=None,
+            configurations=None
+        ):
+        configurations = configurations if configurations else Configurations.snapshot()
+        self._teams_connector = teams_connector if teams_connector else TeamsConnector(configurations=configurations)
+        self._queue = queue.Queue(maxsize=queue_size if queue_size else configurations.teams_notification_queue_size)
+        self._digest_interval = digest_interval if digest_interval is not None else configurations.teams_notification_digest_interval_seconds
+        self._max_retries = max_retries if max_retries is not None else configurations.teams_notification_max_retries
+        self._dropped_count = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def notify(self, title, message, details=None):
+        # the caller never waits for the webhook, when the queue is full the notification is only counted
+        try:
+            self._queue.put_nowait({"title": title, "message": message, "details": details, "time": time.time()})
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped_count += 1
+            return False
+
+    def notify_success(self, message, details=None):
+        return self.notify("Success", message, details)
+
+    def notify_failure(self, message, details=None):
+        return self.notify("Failure", message, details)
+
+    def notify_info(self, message, details=None):
+        return self.notify("Information", message, details)
+
+    def _get_notification(self, digest_deadline):
+        if self._closed.is_set():
+            return self._queue.get_nowait()
+        if digest_deadline is None:
+            return self._queue.get(timeout=TeamsNotificationDispatcher.POLL_INTERVAL_SECONDS)
+        return self._queue.get(timeout=max(0, min(TeamsNotificationDispatcher.POLL_INTERVAL_SECONDS, digest_deadline - time.time())))
+
+    def _collect_digest(self):
+        notifications = []
+        digest_deadline = None
+        while len(notifications) < TeamsNotificationDispatcher.DIGEST_MAX_NOTIFICATIONS:
+            if digest_deadline is not None and time.time() >= digest_deadline:
+                break
+            try:
+                notification = self._get_notification(digest_deadline)
+            except queue.Empty:
+                if self._closed.is_set():
+                    break
+                continue
+            notifications.append(notification)
+            if digest_deadline is None:
+                digest_deadline = time.time() + self._digest_interval
+        return notifications
+
+    def _get_digest_message_card(self, notifications, dropped_count):
+        titles = [notification["title"] for notification in notifications]
+        if "Failure" in titles:
+            title = "Failure"
+        elif titles and all(notification_title == "Success" for notification_title in titles):
+            title = "Success"
+        else:
+            title = "Information"
+        counts = [f"{titles.count(notification_title)} {notification_title.lower()}" for notification_title in TeamsConnector.MESSAGE_COLORS if notification_title in titles]
+        if dropped_count:
+            counts.append(f"{dropped_count} dropped")
+        facts = []
+        for notification in notifications:
+            value = notification["message"]
+            if notification["details"]:
+                value = f"{value}: {notification['details']}"
+            facts.append({
+                "name": f"{datetime.fromtimestamp(notification['time']).strftime('%H:%M:%S')} {notification['title']}",
+                "value": value
+            })
+        return self._teams_connector.get_message_card(TeamsConnector.MESSAGE_COLORS[title], title, ", ".join(counts), facts)
+
+    def _send_digest(self, notifications, dropped_count):
+        message_card = self._get_digest_message_card(notifications, dropped_count)
+        attempt = 0
+        while True:
+            try:
+                self._teams_connector.post_message_card(message_card)
+                return True
+            except requests.exceptions.RequestException as e:
+                if attempt >= self._max_retries:
+                    print(f"Error: Sending a digest of {len(notifications)} notifications to Teams has failed: {e}")
+                    return False
+                backoff = min(TeamsNotificationDispatcher.RETRY_MAX_BACKOFF_SECONDS, TeamsNotificationDispatcher.RETRY_BACKOFF_FACTOR_SECONDS * (2 ** attempt))
+                print(f"Warning: Sending a digest to Teams has failed with '{e}', retrying ({attempt + 1}/{self._max_retries})...")
+                time.sleep(random.uniform(0, backoff))
+                attempt += 1
+
+    def _run(self):
+        while True:
+            notifications = self._collect_digest()
+            with self._lock:
+                dropped_count = self._dropped_count
+                self._dropped_count = 0
+            if notifications or dropped_count:
+                self._send_digest(notifications, dropped_count)
+            if self._closed.is_set() and self._queue.empty():
+                return
+
+    def close(self, timeout=None):
+        # pending notifications are flushed right away instead of waiting for the digest interval
+        self._closed.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -0,0 +1,76 @@
+import os
+import uuid
+import queue
+import shutil
+import threading
+from src.connectors.git_executor import GitExecutor
+
+class DirectoryReaper:
+
+    def __init__(self, trash_directory):
+        self._trash_directory = trash_directory.removesuffix('/')
+        self._git_executor = GitExecutor.shared()
+        self._trash_queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._trash_emptied = threading.Condition(self._lock)
+        self._pending_count = 0
+        self._reaped_callbacks = []
+        self._thread = None
+        os.makedirs(self._trash_directory, exist_ok=True)
+        # directories left in the trash by an interrupted run are removed first
+        for entry in os.listdir(self._trash_directory):
+            self._enqueue(f"{self._trash_directory}/{entry}")
+
+    def add_reaped_callback(self, callback):
+        with self._lock:
+            self._reaped_callbacks.append(callback)
+
+    def get_pending_count(self):
+        with self._lock:
+            return self._pending_count
+
+    def _enqueue(self, trash_path):
+        with self._lock:
+            self._pending_count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._reap, name="directory-reaper", daemon=True)
+                self._thread.start()
+        self._trash_queue.put(trash_path)
+
+    def remove(self, path):
+        if not os.path.isdir(path):
+            return
+        # the processes of a repository must be closed before its directory is removed
+        self._git_executor.close(path)
+        trash_path = f"{self._trash_directory}/{os.path.basename(path.removesuffix('/'))}.{uuid.uuid4().hex}"
+        try:
+            # a rename within the volume is instant, the slow recursive delete happens in the background
+            os.rename(path, trash_path)
+        except OSError as e:
+            print(f"Warning: Unable to move '{path}' to the trash directory, removing it in place: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        self._enqueue(trash_path)
+
+    def _reap(self):
+        while True:
+            trash_path = self._trash_queue.get()
+            try:
+                if os.path.isdir(trash_path) and not os.path.islink(trash_path):
+                    shutil.rmtree(trash_path, ignore_errors=True)
+                elif os.path.lexists(trash_path):
+                    os.remove(trash_path)
+            except OSError as e:
+                print(f"Warning: Unable to remove '{trash_path}' from the trash directory: {e}")
+            with self._lock:
+                self._pending_count -= 1
+                if self._pending_count == 0:
+                    self._trash_emptied.notify_all()
+                reaped_callbacks = list(self._reaped_callbacks)
+            for callback in reaped_callbacks:
+                callback()
+
+    def drain(self):
+        # the reaper thread is a daemon, directories still in the trash at exit are removed by the next run
+        with self._trash_emptied:
+            self._trash_emptied.wait_for(lambda: self._pending_count == 0)
@@ -0,0 +1,53 @@
+import os
+import time
+import shutil
+import threading
+
+class DiskAdmissionController:
+
+    # free space is polled again at this interval, space can also be freed outside of the migration
+    POLL_INTERVAL_SECONDS = 5
+
+    def __init__(self, directory, min_free_bytes=0, directory_reaper=None):
+        self._directory = directory
+        self._min_free_bytes = min_free_bytes
+        self._directory_reaper = directory_reaper
+        self._condition = threading.Condition()
+        self._admitted = {}
+        os.makedirs(self._directory, exist_ok=True)
+        if self._directory_reaper:
+            self._directory_reaper.add_reaped_callback(self.notify)
+
+    def notify(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def get_free_bytes(self):
+        return shutil.disk_usage(self._directory).free
+
+    def _get_available_bytes(self):
+        # admitted repositories keep their whole reservation while they are written, so the estimate errs on the safe side
+        return self.get_free_bytes() - self._min_free_bytes - sum(self._admitted.values())
+
+    def _is_alone(self):
+        # with nothing else admitted and an empty trash no space will ever be freed, waiting longer would never end
+        return not self._admitted and not (self._directory_reaper and self._directory_reaper.get_pending_count())
+
+    def admit(self, name, expected_bytes):
+        start_time = time.time()
+        is_waiting = False
+        with self._condition:
+            while self._get_available_bytes() < expected_bytes and not self._is_alone():
+                if not is_waiting:
+                    print(f"Waiting for {expected_bytes / 1024 ** 2:.1f} MB of free disk space in '{self._directory}' before migrating '{name}'...")
+                    is_waiting = True
+                self._condition.wait(DiskAdmissionController.POLL_INTERVAL_SECONDS)
+            if self._get_available_bytes() < expected_bytes:
+                print(f"Warning: '{name}' is expected to need {expected_bytes / 1024 ** 2:.1f} MB but only {max(0, self._get_available_bytes()) / 1024 ** 2:.1f} MB are available, migrating it anyway")
+            self._admitted[name] = self._admitted.get(name, 0) + expected_bytes
+        return time.time() - start_time
+
+    def release(self, name):
+        with self._condition:
+            if self._admitted.pop(name, None) is not None:
+                self._condition.notify_all()
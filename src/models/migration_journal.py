@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+class MigrationJournal:
+
+    STAGE_CLONED = "cloned"
+    STAGE_CREATED = "created"
+    STAGE_PUSHED = "pushed"
+    STAGE_READ_ONLY = "read_only"
+    STAGE_VCS_UPDATED = "vcs_updated"
+    STAGES = [STAGE_CLONED, STAGE_CREATED, STAGE_PUSHED, STAGE_READ_ONLY, STAGE_VCS_UPDATED]
+
+    def __init__(self, journal_file_path):
+        journal_directory = os.path.dirname(journal_file_path)
+        if journal_directory:
+            os.makedirs(journal_directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(journal_file_path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS migration_stages ("
+                "bitbucket_repository TEXT NOT NULL, "
+                "github_repository TEXT NOT NULL, "
+                "stage TEXT NOT NULL, "
+                "details TEXT NOT NULL DEFAULT '', "
+                "completed_at TEXT NOT NULL, "
+                "PRIMARY KEY (bitbucket_repository, github_repository, stage))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pushed_refs ("
+                "github_repository TEXT NOT NULL, "
+                "ref TEXT NOT NULL, "
+                "pushed_commit TEXT NOT NULL, "
+                "pushed_at TEXT NOT NULL, "
+                "PRIMARY KEY (github_repository, ref))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS migration_measurements ("
+                "bitbucket_repository TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "refs_count INTEGER NOT NULL, "
+                "duration REAL NOT NULL, "
+                "measured_at TEXT NOT NULL)"
+            )
+
+    def get_completed_stages(self, bitbucket_repository, github_repository):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT stage, details FROM migration_stages WHERE bitbucket_repository = ? AND github_repository = ?",
+                (bitbucket_repository, github_repository)
+            ).fetchall()
+        return {stage: details for stage, details in rows}
+
+    def mark_stage_completed(self, bitbucket_repository, github_repository, stage, details=""):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO migration_stages (bitbucket_repository, github_repository, stage, details, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (bitbucket_repository, github_repository, stage, details, datetime.now().isoformat())
+            )
+
+    def get_pushed_refs(self, github_repository):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT ref, pushed_commit FROM pushed_refs WHERE github_repository = ?",
+                (github_repository,)
+            ).fetchall()
+        return {ref: pushed_commit for ref, pushed_commit in rows}
+
+    def mark_ref_pushed(self, github_repository, ref, pushed_commit):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pushed_refs (github_repository, ref, pushed_commit, pushed_at) VALUES (?, ?, ?, ?)",
+                (github_repository, ref, pushed_commit, datetime.now().isoformat())
+            )
+
+    def record_measurement(self, bitbucket_repository, size, refs_count, duration):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO migration_measurements (bitbucket_repository, size, refs_count, duration, measured_at) VALUES (?, ?, ?, ?, ?)",
+                (bitbucket_repository, size, refs_count, duration, datetime.now().isoformat())
+            )
+
+    def get_measurements(self):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT size, refs_count, duration FROM migration_measurements"
+            ).fetchall()
+        return [{"size": size, "refs_count": refs_count, "duration": duration} for size, refs_count, duration in rows]
+
+    def clear_github_repository(self, github_repository):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM migration_stages WHERE github_repository = ?",
+                (github_repository,)
+            )
+            self._connection.execute(
+                "DELETE FROM pushed_refs WHERE github_repository = ?",
+                (github_repository,)
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,85 @@
+import time
+import queue
+import threading
+
+class MigrationPipeline:
+
+    def __init__(self, stages, queue_size=2, on_completed=None, metrics_registry=None):
+        # stages are (name, function, workers_count) tuples, a stage function fails an item by raising
+        self._stages = [(name, function, max(1, workers_count)) for name, function, workers_count in stages]
+        self._queue_size = max(1, queue_size)
+        self._on_completed = on_completed
+        self._metrics_registry = metrics_registry
+        self._results = {}
+        self._results_lock = threading.Lock()
+        self._queues = []
+        self._running_workers = []
+        self._running_workers_lock = threading.Lock()
+
+    def get_description(self):
+        return ", ".join(f"{name}: {workers_count}" for name, _, workers_count in self._stages)
+
+    def _complete(self, index, item, error):
+        result = None
+        if self._on_completed:
+            try:
+                result = self._on_completed(item, error)
+            # a failing callback must not stop the worker, the pipeline would never drain
+            except Exception as e:
+                print(f"Error: Completing a migration pipeline item has failed: {e}")
+        with self._results_lock:
+            self._results[index] = result
+
+    def _run_stage_worker(self, stage_index):
+        name, function, _ = self._stages[stage_index]
+        input_queue = self._queues[stage_index]
+        output_queue = self._queues[stage_index + 1] if stage_index + 1 < len(self._stages) else None
+        while True:
+            entry = input_queue.get()
+            if entry is None:
+                break
+            index, item, queued_at = entry
+            if self._metrics_registry:
+                self._metrics_registry.observe_stage(f"{name}_queue", time.time() - queued_at, "succeeded")
+            try:
+                function(item)
+            # a single repository must not stop the stage
+            except Exception as e:
+                self._complete(index, item, e)
+                continue
+            if output_queue:
+                # a full queue blocks this stage until the next one catches up
+                output_queue.put((index, item, time.time()))
+            else:
+                self._complete(index, item, None)
+        with self._running_workers_lock:
+            self._running_workers[stage_index] -= 1
+            is_last_worker = self._running_workers[stage_index] == 0
+        # the last worker of a stage shuts down the next one, once everything it produced has been queued
+        if is_last_worker and output_queue:
+            for _ in range(self._stages[stage_index + 1][2]):
+                output_queue.put(None)
+
+    def run(self, items):
+        # items are consumed lazily, the next one is only taken when the first stage has room for it
+        self._results = {}
+        self._queues = [queue.Queue(maxsize=self._queue_size) for _ in self._stages]
+        self._running_workers = [workers_count for _, _, workers_count in self._stages]
+        threads = []
+        for stage_index, (name, _, workers_count) in enumerate(self._stages):
+            for worker_id in range(workers_count):
+                thread = threading.Thread(target=self._run_stage_worker, args=(stage_index,), name=f"migration-pipeline-{name}-{worker_id}", daemon=True)
+                thread.start()
+                threads.append(thread)
+        items_count = 0
+        try:
+            for index, item in enumerate(items):
+                self._queues[0].put((index, item, time.time()))
+                items_count += 1
+        finally:
+            # the workers drain what was queued even when producing the items has failed
+            for _ in range(self._stages[0][2]):
+                self._queues[0].put(None)
+            for thread in threads:
+                thread.join()
+        return [self._results.get(index) for index in range(items_count)]
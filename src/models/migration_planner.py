@@ -0,0 +1,154 @@
+import csv
+import time
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.configs.configurations import Configurations
+
+class MigrationPlanner:
+
+    def __init__(
+            self,
+            bitbucket_connector,
+            journal,
+            workers_count,
+            max_concurrency=None,
+            default_throughput=None,
+            repository_overhead=None,
+            seconds_per_ref=None,
+            configurations=None
+        ):
+        configurations = configurations if configurations else Configurations.snapshot()
+        self._bitbucket_connector = bitbucket_connector
+        self._journal = journal
+        self._workers_count = max(1, workers_count)
+        self._max_concurrency = max_concurrency if max_concurrency else configurations.bitbucket_max_concurrency
+        self._default_throughput = default_throughput if default_throughput else configurations.migration_estimated_throughput_mbps * 1024 ** 2
+        self._repository_overhead = repository_overhead if repository_overhead is not None else configurations.migration_estimated_repository_overhead_seconds
+        self._seconds_per_ref = seconds_per_ref if seconds_per_ref is not None else configurations.migration_estimated_seconds_per_ref
+        self._lock = threading.Lock()
+        self._tracking = None
+
+    def format_duration(seconds):
+        hours, remainder = divmod(int(round(seconds)), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+
+    def _get_repository_statistics(self, repo):
+        try:
+            return {
+                "size": self._bitbucket_connector.get_repository_size(repo['bitbucket']),
+                "refs_count": self._bitbucket_connector.get_repository_refs_count(repo['bitbucket'])
+            }
+        # a stale csv row must not stop the planning of the other repositories
+        except Exception as e:
+            print(f"Warning: Unable to get the size and refs count of bitbucket repository '{repo['bitbucket']}', it is planned as empty: {e}")
+            return {"size": 0, "refs_count": 0}
+
+    def _get_throughput(self):
+        measurements = self._journal.get_measurements()
+        transferred_bytes = sum(measurement["size"] for measurement in measurements)
+        if transferred_bytes <= 0:
+            return self._default_throughput, False
+        transfer_seconds = 0
+        for measurement in measurements:
+            fixed_seconds = self._repository_overhead + measurement["refs_count"] * self._seconds_per_ref
+            transfer_seconds += max(1, measurement["duration"] - fixed_seconds)
+        return transferred_bytes / transfer_seconds, True
+
+    def _estimate_duration(self, statistics, throughput):
+        return self._repository_overhead + statistics["refs_count"] * self._seconds_per_ref + statistics["size"] / throughput
+
+    def create_plan(self, repositories):
+        print(f"Collecting size and refs count of {len(repositories)} repositories from Bitbucket...")
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            repositories_statistics = list(executor.map(self._get_repository_statistics, repositories))
+        throughput, is_throughput_measured = self._get_throughput()
+        plan_items = []
+        for repo, statistics in zip(repositories, repositories_statistics):
+            plan_items.append({
+                "repository": repo,
+                "size": statistics["size"],
+                "refs_count": statistics["refs_count"],
+                "estimated_duration": self._estimate_duration(statistics, throughput)
+            })
+        # largest first, so the biggest repositories do not stretch the end of the run
+        plan_items.sort(key=lambda item: (item["size"], item["refs_count"]), reverse=True)
+        workers_available_at = [0.0] * self._workers_count
+        for item in plan_items:
+            item["estimated_start"] = heapq.heappop(workers_available_at)
+            item["estimated_finish"] = item["estimated_start"] + item["estimated_duration"]
+            heapq.heappush(workers_available_at, item["estimated_finish"])
+        return {
+            "repositories": plan_items,
+            "throughput": throughput,
+            "is_throughput_measured": is_throughput_measured,
+            "workers_count": self._workers_count,
+            "estimated_total_duration": max([item["estimated_finish"] for item in plan_items], default=0)
+        }
+
+    def print_plan(self, plan):
+        throughput_source = "measured in previous runs" if plan["is_throughput_measured"] else "configured default"
+        print(f"Migration plan for {len(plan['repositories'])} repositories on {plan['workers_count']} worker(s), throughput {plan['throughput'] / 1024 ** 2:.1f} MB/s ({throughput_source})")
+        print(f"{'#':>5}  {'bitbucket_repository':<40}  {'size_mb':>10}  {'refs':>7}  {'duration':>11}  {'eta':>11}")
+        for index, item in enumerate(plan["repositories"], 1):
+            print(
+                f"{index:>5}  {item['repository']['bitbucket']:<40}  {item['size'] / 1024 ** 2:>10.1f}  {item['refs_count']:>7}  "
+                f"{MigrationPlanner.format_duration(item['estimated_duration']):>11}  {MigrationPlanner.format_duration(item['estimated_finish']):>11}"
+            )
+        print(f"Predicted total duration: {MigrationPlanner.format_duration(plan['estimated_total_duration'])}")
+
+    def write_plan_csv(self, plan, csv_file_path):
+        with open(csv_file_path, mode="w", newline='') as csv_file:
+            fieldnames = [
+                "bitbucket_repository",
+                "github_repository",
+                "size_bytes",
+                "refs_count",
+                "estimated_duration_seconds",
+                "estimated_start_seconds",
+                "estimated_finish_seconds"
+            ]
+            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+            writer.writeheader()
+            for item in plan["repositories"]:
+                writer.writerow({
+                    "bitbucket_repository": item["repository"]["bitbucket"],
+                    "github_repository": item["repository"]["github"],
+                    "size_bytes": item["size"],
+                    "refs_count": item["refs_count"],
+                    "estimated_duration_seconds": round(item["estimated_duration"]),
+                    "estimated_start_seconds": round(item["estimated_start"]),
+                    "estimated_finish_seconds": round(item["estimated_finish"])
+                })
+        print(f"Migration plan saved to '{csv_file_path}'")
+
+    def start_tracking(self, plan):
+        with self._lock:
+            self._tracking = {
+                "items": {item["repository"]["bitbucket"]: item for item in plan["repositories"]},
+                "remaining_estimated": sum(item["estimated_duration"] for item in plan["repositories"]),
+                "completed_estimated": 0,
+                "completed_actual": 0,
+                "completed_count": 0,
+                "started_at": time.time()
+            }
+
+    def record_completion(self, bitbucket_repository, duration, is_measured):
+        with self._lock:
+            if not self._tracking or bitbucket_repository not in self._tracking["items"]:
+                return
+            item = self._tracking["items"][bitbucket_repository]
+            self._tracking["remaining_estimated"] -= item["estimated_duration"]
+            self._tracking["completed_estimated"] += item["estimated_duration"]
+            self._tracking["completed_actual"] += duration
+            self._tracking["completed_count"] += 1
+            # the remaining estimate is corrected by how far off the finished repositories were
+            correction = self._tracking["completed_actual"] / self._tracking["completed_estimated"] if self._tracking["completed_estimated"] else 1
+            remaining = self._tracking["remaining_estimated"] * correction / self._workers_count
+            elapsed = time.time() - self._tracking["started_at"]
+            completed_count = self._tracking["completed_count"]
+            total_count = len(self._tracking["items"])
+        if is_measured:
+            self._journal.record_measurement(bitbucket_repository, item["size"], item["refs_count"], duration)
+        print(f"Progress: {completed_count}/{total_count} repositories, elapsed {MigrationPlanner.format_duration(elapsed)}, estimated remaining {MigrationPlanner.format_duration(remaining)}")
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+import threading
+from src.connectors.git_executor import GitExecutor
+
+class MirrorCache:
+
+    def __init__(self, cache_directory, max_size_bytes, bitbucket_connector, directory_reaper=None):
+        self._cache_directory = cache_directory.removesuffix('/')
+        self._max_size_bytes = max_size_bytes
+        self._bitbucket_connector = bitbucket_connector
+        self._directory_reaper = directory_reaper
+        self._git_executor = GitExecutor.shared()
+        self._lock = threading.Lock()
+        self._repositories_locks = {}
+        self._repositories_in_use = {}
+        os.makedirs(self._cache_directory, exist_ok=True)
+
+    def get_mirror_path(self, repo_name):
+        return f"{self._cache_directory}/{repo_name}.git"
+
+    def _get_repository_lock(self, repo_name):
+        with self._lock:
+            if repo_name not in self._repositories_locks:
+                self._repositories_locks[repo_name] = threading.Lock()
+            return self._repositories_locks[repo_name]
+
+    def _get_directory_size(self, directory):
+        size = 0
+        for root, _, files in os.walk(directory):
+            for file in files:
+                try:
+                    size += os.lstat(os.path.join(root, file)).st_size
+                except FileNotFoundError:
+                    continue
+        return size
+
+    def _refresh_mirror(self, repo_name, mirror_path):
+        if os.path.isdir(mirror_path):
+            print(f"Fetching changes into cached mirror '{mirror_path}'...")
+            try:
+                self._bitbucket_connector.fetch_repository(repo_name, mirror_path)
+                return
+            except subprocess.CalledProcessError as e:
+                print(f"Warning: Fetching into cached mirror '{mirror_path}' has failed, cloning it again: {e.stderr}")
+        print(f"Cloning '{repo_name}' into the mirror cache '{mirror_path}'...")
+        self._bitbucket_connector.clone_repository(repo_name, mirror_path)
+
+    def grep_files(self, repo_name, commit, patterns):
+        mirror_path = self.get_mirror_path(repo_name)
+        # the lease keeps the mirror from being evicted while it is searched
+        self._acquire(repo_name)
+        try:
+            if not os.path.isdir(mirror_path):
+                return None
+            with self._get_repository_lock(repo_name):
+                # the mirror is long lived, its object lookups go through one cat-file process instead of a fork each
+                if not self._git_executor.get_object_info(mirror_path, f"{commit}^{{commit}}"):
+                    return None
+                command_list = ["git", "grep", "-l", "-z", "-I", "-i", "-F"]
+                for pattern in patterns:
+                    command_list.extend(["-e", pattern])
+                command_list.extend([commit, "--"])
+                result = self._git_executor.run(command_list, cwd=mirror_path, check=False, text=False)
+        finally:
+            self.release(repo_name)
+        # git grep exits with 1 when nothing matches
+        if result.returncode not in [0, 1]:
+            print(f"Warning: Searching '{mirror_path}' at '{commit}' has failed: {result.stderr.decode(errors='replace')}")
+            return None
+        commit_prefix = f"{commit}:"
+        return [
+            file_path.removeprefix(commit_prefix)
+            for file_path in result.stdout.decode(errors="surrogateescape").split("\0") if file_path
+        ]
+
+    def _acquire(self, repo_name):
+        with self._lock:
+            self._repositories_in_use[repo_name] = self._repositories_in_use.get(repo_name, 0) + 1
+
+    def checkout(self, repo_name):
+        self._acquire(repo_name)
+        mirror_path = self.get_mirror_path(repo_name)
+        try:
+            with self._get_repository_lock(repo_name):
+                self._refresh_mirror(repo_name, mirror_path)
+                # the directory modification time is the last use of the mirror for the LRU eviction
+                os.utime(mirror_path)
+        except BaseException:
+            self.release(repo_name)
+            raise
+        self.evict()
+        return mirror_path
+
+    def release(self, repo_name):
+        with self._lock:
+            self._repositories_in_use[repo_name] -= 1
+            if self._repositories_in_use[repo_name] <= 0:
+                del self._repositories_in_use[repo_name]
+
+    def evict(self):
+        with self._lock:
+            mirrors = []
+            for entry in os.listdir(self._cache_directory):
+                mirror_path = f"{self._cache_directory}/{entry}"
+                if not entry.endswith(".git") or not os.path.isdir(mirror_path):
+                    continue
+                mirrors.append({
+                    "repo_name": entry.removesuffix(".git"),
+                    "path": mirror_path,
+                    "last_used": os.path.getmtime(mirror_path)
+                })
+        # walking multi-GB mirrors must not block the checkouts and releases of the other workers
+        for mirror in mirrors:
+            mirror["size"] = self._get_directory_size(mirror["path"])
+        cache_size = sum(mirror["size"] for mirror in mirrors)
+        for mirror in sorted(mirrors, key=lambda mirror: mirror["last_used"]):
+            if cache_size <= self._max_size_bytes:
+                break
+            evicted_path = None
+            with self._lock:
+                if mirror["repo_name"] in self._repositories_in_use or not os.path.isdir(mirror["path"]):
+                    continue
+                print(f"Evicting cached mirror '{mirror['path']}' ({mirror['size']} bytes) to stay within the mirror cache budget...")
+                self._git_executor.close(mirror["path"])
+                if self._directory_reaper:
+                    self._directory_reaper.remove(mirror["path"])
+                else:
+                    # the rename hides the mirror from checkouts at once, the slow delete happens outside of the lock
+                    evicted_path = f"{mirror['path']}.evicted"
+                    os.rename(mirror["path"], evicted_path)
+            if evicted_path:
+                shutil.rmtree(evicted_path, ignore_errors=True)
+            cache_size -= mirror["size"]
+        return cache_size
@@ -0,0 +1,121 @@
+import os
+import re
+import mmap
+import shutil
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# the engine of a pool worker, sent once when the worker starts instead of with every file
+_worker_engine = None
+
+def _set_worker_engine(engine):
+    global _worker_engine
+    _worker_engine = engine
+
+def _rewrite_file_in_worker(file_path):
+    return _worker_engine.rewrite_file(file_path)
+
+class UrlRewriteEngine:
+
+    BINARY_DETECTION_BYTES = 8000
+    SKIPPED_DIRECTORIES = [".git"]
+    REPOSITORY_NAME_PATTERN = rb"[\w.-]+"
+
+    def __init__(self, bitbucket_base_urls, github_base_url, repositories, max_workers=None):
+        self._github_base_url = github_base_url.removesuffix('/').encode()
+        self._repositories = {
+            bitbucket_repo_name.lower().encode(): github_repo_name.encode()
+            for bitbucket_repo_name, github_repo_name in repositories.items()
+        }
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # one pass over the contents finds every bitbucket url whatever repository it points to,
+        # the repository name is then resolved with a dictionary lookup instead of one pattern per repository
+        self._base_urls = sorted({base_url.removesuffix('/').lower() for base_url in bitbucket_base_urls}, key=len, reverse=True)
+        base_urls_pattern = b"|".join(re.escape(base_url.encode()) for base_url in self._base_urls)
+        self._pattern = re.compile(
+            rb"(?:" + base_urls_pattern + rb")/(" + UrlRewriteEngine.REPOSITORY_NAME_PATTERN + rb")",
+            re.IGNORECASE
+        )
+
+    def get_search_patterns(self):
+        return [f"{base_url}/" for base_url in self._base_urls]
+
+    def _get_github_url(self, match):
+        repository = match.group(1)
+        # the name pattern is greedy, a clone url suffix and a trailing period belong to the text around the url
+        candidates = [(repository, b"")]
+        if repository.endswith(b"."):
+            candidates.append((repository.rstrip(b"."), repository[len(repository.rstrip(b".")):]))
+        for candidate, suffix in list(candidates):
+            if candidate.lower().endswith(b".git"):
+                candidates.append((candidate[:-4], candidate[-4:] + suffix))
+        for candidate, suffix in candidates:
+            github_repo_name = self._repositories.get(candidate.lower())
+            if github_repo_name is not None:
+                return self._github_base_url + b"/" + github_repo_name + suffix
+        return match.group(0)
+
+    def rewrite_contents(self, contents):
+        return self._pattern.sub(self._get_github_url, contents)
+
+    def rewrite_file(self, file_path):
+        if os.path.islink(file_path) or not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+            return False
+        with open(file_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                if b"\0" in contents[:UrlRewriteEngine.BINARY_DETECTION_BYTES]:
+                    return False
+                if not self._pattern.search(contents):
+                    return False
+                updated_contents = self.rewrite_contents(contents)
+                if updated_contents == contents[:]:
+                    return False
+        temp_file_path = f"{file_path}.url_rewrite.temp"
+        with open(temp_file_path, "wb") as temp_file:
+            temp_file.write(updated_contents)
+        shutil.copymode(file_path, temp_file_path)
+        os.replace(temp_file_path, file_path)
+        return True
+
+    def _get_files(self, directory):
+        for root, directories, files in os.walk(directory):
+            directories[:] = [directory for directory in directories if directory not in UrlRewriteEngine.SKIPPED_DIRECTORIES]
+            for file in files:
+                yield os.path.join(root, file)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_executor"] = None
+        state["_executor_lock"] = None
+        return state
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # forking the migration process would copy its threads (http pool, notifications, reaper) and git pipes,
+                # the workers are started from a clean server process and reused for every repository
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=_set_worker_engine,
+                    initargs=(self,)
+                )
+            return self._executor
+
+    def rewrite_directory(self, directory):
+        file_paths = list(self._get_files(directory))
+        if not file_paths:
+            return []
+        results = self._get_executor().map(_rewrite_file_in_worker, file_paths, chunksize=64)
+        return [file_path for file_path, is_rewritten in zip(file_paths, results) if is_rewritten]
+
+    def close(self):
+        with self._executor_lock:
+            executor = self._executor
+            self._executor = None
+        if executor:
+            executor.shutdown()
@@ -0,0 +1,141 @@
+import pytest
+import json
+import subprocess
+from unittest.mock import patch, MagicMock
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.configs.configurations import ConfigurationsSnapshot
+from src.connectors.bitbucket_connector import BitbucketConnector
+
+@pytest.fixture
+def bitbucket_connector():
+    configurations = ConfigurationsSnapshot(
+        bitbucket_username="user",
+        bitbucket_password="s3cret",
+        bitbucket_server_host="bitbucket.example.com",
+        bitbucket_clone_url="/scm/prj/",
+        bitbucket_project_key="PRJ"
+    )
+    bitbucket_connector = BitbucketConnector(configurations=configurations)
+    bitbucket_connector._git_executor = MagicMock()
+    return bitbucket_connector
+
+def test_clone_credentials_are_not_in_the_command(bitbucket_connector, tmp_path):
+    bitbucket_connector._git_executor.run.side_effect = lambda command_list, **kwargs: subprocess.CompletedProcess(command_list, 0)
+    bitbucket_connector.clone_repository("repo-1", str(tmp_path / "repo-1.git"))
+    bitbucket_connector.fetch_repository("repo-1", str(tmp_path / "repo-1.git"))
+    for call in bitbucket_connector._git_executor.run.call_args_list:
+        assert not any("s3cret" in argument or "user@" in argument for argument in call.args[0])
+    clone_call, _, fetch_call = bitbucket_connector._git_executor.run.call_args_list
+    assert clone_call.args[0][-2] == "https://bitbucket.example.com/scm/prj/repo-1.git"
+    # the credentials are given to git through its environment only
+    for call in [clone_call, fetch_call]:
+        assert call.kwargs["env"]["GIT_CONFIG_KEY_0"] == "http.extraHeader"
+        assert call.kwargs["env"]["GIT_CONFIG_VALUE_0"] == f"Authorization: {bitbucket_connector._get_authorization()}"
+
+def test_open_pull_requests_export_reports_unreadable_repositories(bitbucket_connector, tmp_path, capsys):
+    def iterate_open_pull_request_pages(repo_name):
+        yield [{"id": 1}]
+        if repo_name == "repo-2":
+            raise RuntimeError("server error")
+        yield [{"id": 2}]
+    bitbucket_connector._iterate_repository_pages = lambda: iter([[{"name": "repo-1"}, {"name": "repo-2"}, {"name": "repo-3"}]])
+    bitbucket_connector._iterate_open_pull_request_pages = iterate_open_pull_request_pages
+    bitbucket_connector._get_open_pull_request_row = lambda repo_name, pull_request: {"pull_request_repository": repo_name, "pull_request_number": pull_request["id"]}
+    csv_file_path = tmp_path / "pull_requests.csv"
+    bitbucket_connector.generate_open_pull_requests_csv(str(csv_file_path))
+    printed = capsys.readouterr().out
+    assert "saved" not in printed
+    assert "1 repositories could not be read: repo-2" in printed
+    rows = csv_file_path.read_text().splitlines()[1:]
+    assert sorted(row.split(",")[0] for row in rows) == ["repo-1", "repo-1", "repo-2", "repo-3", "repo-3"]
+
+def get_page_start(uri):
+    return int(uri.split("start=")[1].split("&")[0])
+
+def test_pages_are_followed_until_the_last_one(bitbucket_connector):
+    pages = {
+        0: {"values": [1, 2], "isLastPage": False, "nextPageStart": 2},
+        2: {"values": [3], "isLastPage": False, "nextPageStart": 5},
+        5: {"values": [], "isLastPage": True, "nextPageStart": 9}
+    }
+    requested_uris = []
+    def execute_bitbucket_command(uri, method="GET", cache_ttl=None):
+        requested_uris.append(uri)
+        return pages[get_page_start(uri)]
+    bitbucket_connector._execute_bitbucket_command = execute_bitbucket_command
+    assert list(bitbucket_connector._iterate_pages("/projects/PRJ/repos?state=OPEN")) == [[1, 2], [3], []]
+    assert requested_uris == [f"/projects/PRJ/repos?state=OPEN&start={start}&limit={BitbucketConnector.PAGE_LIMIT}" for start in [0, 2, 5]]
+
+@pytest.mark.parametrize("page", [{"values": [1]}, {"values": [1], "isLastPage": False}])
+def test_page_without_a_next_page_is_the_last_one(bitbucket_connector, page):
+    bitbucket_connector._execute_bitbucket_command = MagicMock(return_value=page)
+    assert list(bitbucket_connector._iterate_pages("/projects/PRJ/repos")) == [[1]]
+    bitbucket_connector._execute_bitbucket_command.assert_called_once()
+
+PERMISSIONS_URI = "/projects/PRJ/permissions"
+
+@pytest.fixture
+def project_permissions(bitbucket_connector):
+    grants = {
+        f"{PERMISSIONS_URI}/groups": [
+            {"group": {"name": "developers"}, "permission": "PROJECT_WRITE"},
+            {"group": {"name": "readers"}, "permission": "PROJECT_READ"}
+        ],
+        f"{PERMISSIONS_URI}/users": [
+            {"user": {"name": "admin"}, "permission": "PROJECT_ADMIN"},
+            {"user": {"name": "auditor"}, "permission": "PROJECT_READ"}
+        ]
+    }
+    updated_uris = []
+    def execute_bitbucket_command(uri, method="GET", cache_ttl=None):
+        if method == "GET":
+            return {"values": grants[uri.split("?")[0]], "isLastPage": True}
+        updated_uris.append(uri)
+        if "name=admin" in uri:
+            raise RuntimeError("forbidden")
+        return {}
+    bitbucket_connector._execute_bitbucket_command = execute_bitbucket_command
+    return updated_uris
+
+def test_only_writable_principals_are_set_read_only(bitbucket_connector, project_permissions, tmp_path):
+    snapshot_file_path = tmp_path / "snapshots" / "permissions.json"
+    assert bitbucket_connector.set_project_read_only(str(snapshot_file_path)) is False
+    assert sorted(project_permissions) == [
+        f"{PERMISSIONS_URI}/groups?name=developers&permission=PROJECT_READ",
+        f"{PERMISSIONS_URI}/users?name=admin&permission=PROJECT_READ"
+    ]
+    summary = bitbucket_connector._set_permissions_read_only({"PRJ": PERMISSIONS_URI}, "PROJECT_READ")
+    assert summary == {"updated": 1, "skipped": 2, "failed": 1}
+
+def test_permissions_snapshot_records_before_and_after(bitbucket_connector, project_permissions, tmp_path):
+    snapshot_file_path = tmp_path / "snapshots" / "permissions.json"
+    bitbucket_connector.set_project_read_only(str(snapshot_file_path))
+    snapshot = json.loads(snapshot_file_path.read_text())
+    assert snapshot["project_key"] == "PRJ"
+    assert snapshot["permission"] == "PROJECT_READ"
+    permissions = snapshot["permissions"]["PRJ"]
+    assert [(grant["name"], grant["permission"]) for grant in permissions["before"]] == [
+        ("developers", "PROJECT_WRITE"), ("readers", "PROJECT_READ"), ("admin", "PROJECT_ADMIN"), ("auditor", "PROJECT_READ")
+    ]
+    # the failed update keeps the former permission in the after list
+    assert [(grant["name"], grant["permission"]) for grant in permissions["after"]] == [
+        ("developers", "PROJECT_READ"), ("readers", "PROJECT_READ"), ("admin", "PROJECT_ADMIN"), ("auditor", "PROJECT_READ")
+    ]
+
+def test_unreadable_repository_permissions_count_as_one_failure(bitbucket_connector):
+    def execute_bitbucket_command(uri, method="GET", cache_ttl=None):
+        if "repo-2" in uri:
+            raise RuntimeError("not found")
+        return {"values": [{"user": {"name": "alice"}, "permission": "REPO_READ"}], "isLastPage": True}
+    bitbucket_connector._execute_bitbucket_command = execute_bitbucket_command
+    summary = bitbucket_connector.set_repositories_read_only(["repo-1", "repo-2"])
+    assert summary == {"updated": 0, "skipped": 1, "failed": 1}
+
+if __name__ == "__main__":
+    pytest.main()
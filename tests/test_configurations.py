@@ -0,0 +1,65 @@
+import pytest
+import time
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+import src.configs.configurations as configurations_module
+from src.configs.configurations import Configurations
+
+@pytest.fixture
+def dotenv_file(tmp_path, monkeypatch):
+    dotenv_file_path = tmp_path / ".env"
+    monkeypatch.setattr(configurations_module, "find_dotenv", lambda: str(dotenv_file_path))
+    for variable in ["GIT_REPOS_DIRECTORY", "MIGRATION_WORKERS_COUNT", "FF_ENABLE_MIRROR_CACHE", "MIRROR_CACHE_MAX_SIZE_GB", "CONFIGURATIONS_RELOAD_INTERVAL_SECONDS"]:
+        monkeypatch.delenv(variable, raising=False)
+    # every test loads its own snapshot, the class state is restored afterwards
+    for attribute in ["_snapshot", "_variables", "_dotenv_file_path", "_dotenv_file_mtime", "_next_reload_check_at"]:
+        monkeypatch.setattr(Configurations, attribute, getattr(Configurations, attribute))
+    Configurations._snapshot = None
+    return dotenv_file_path
+
+def test_variables_are_coerced_to_the_field_types(dotenv_file, monkeypatch):
+    dotenv_file.write_text(
+        'GIT_REPOS_DIRECTORY="/tmp/repos"\n'
+        'MIGRATION_WORKERS_COUNT="4"\n'
+        'FF_ENABLE_MIRROR_CACHE="1"\n'
+        'MIRROR_CACHE_MAX_SIZE_GB=""\n'
+    )
+    monkeypatch.setenv("MIGRATION_WORKERS_COUNT", "6")
+    snapshot = Configurations.snapshot()
+    assert snapshot.git_repos_directory == "/tmp/repos"
+    # exported variables take precedence over the .env file
+    assert snapshot.migration_workers_count == 6
+    assert snapshot.ff_enable_mirror_cache is True
+    assert snapshot.mirror_cache_max_size_gb == 100.0
+    assert snapshot.ff_enable_chunked_push is False
+
+def test_invalid_number_is_reported_with_its_variable(dotenv_file):
+    dotenv_file.write_text('MIGRATION_WORKERS_COUNT="four"\n')
+    with pytest.raises(ValueError, match="MIGRATION_WORKERS_COUNT"):
+        Configurations.snapshot()
+
+def test_changed_file_is_reloaded_after_the_interval(dotenv_file):
+    dotenv_file.write_text('CONFIGURATIONS_RELOAD_INTERVAL_SECONDS="60"\nMIGRATION_WORKERS_COUNT="2"\n')
+    first_snapshot = Configurations.snapshot()
+    dotenv_file.write_text('CONFIGURATIONS_RELOAD_INTERVAL_SECONDS="60"\nMIGRATION_WORKERS_COUNT="8"\n')
+    os.utime(dotenv_file, (time.time() + 10, time.time() + 10))
+    # the file is only checked again once the interval has elapsed
+    assert Configurations.snapshot() is first_snapshot
+    Configurations._next_reload_check_at = 0
+    assert Configurations.snapshot().migration_workers_count == 8
+    assert first_snapshot.migration_workers_count == 2
+
+def test_reload_is_disabled_by_default(dotenv_file):
+    dotenv_file.write_text('MIGRATION_WORKERS_COUNT="2"\n')
+    first_snapshot = Configurations.snapshot()
+    dotenv_file.write_text('MIGRATION_WORKERS_COUNT="8"\n')
+    Configurations._next_reload_check_at = 0
+    assert Configurations.snapshot() is first_snapshot
+
+if __name__ == "__main__":
+    pytest.main()
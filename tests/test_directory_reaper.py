@@ -0,0 +1,35 @@
+import pytest
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.directory_reaper import DirectoryReaper
+
+def create_repository_directory(path):
+    os.makedirs(f"{path}/objects/pack")
+    with open(f"{path}/objects/pack/pack-1.pack", "wb") as pack_file:
+        pack_file.write(b"0" * 1024)
+
+def test_removed_directory_is_moved_out_of_the_way_and_reaped(tmp_path):
+    repo_path = str(tmp_path / "repos" / "repo-1")
+    create_repository_directory(repo_path)
+    directory_reaper = DirectoryReaper(str(tmp_path / "repos" / ".trash"))
+    directory_reaper.remove(repo_path)
+    # the same path can be cloned again right away
+    assert not os.path.exists(repo_path)
+    directory_reaper.drain()
+    assert os.listdir(tmp_path / "repos" / ".trash") == []
+    directory_reaper.remove(str(tmp_path / "repos" / "missing"))
+
+def test_leftovers_of_an_interrupted_run_are_reaped(tmp_path):
+    create_repository_directory(str(tmp_path / "trash" / "repo-1.0123"))
+    directory_reaper = DirectoryReaper(str(tmp_path / "trash"))
+    directory_reaper.drain()
+    assert directory_reaper.get_pending_count() == 0
+    assert os.listdir(tmp_path / "trash") == []
+
+if __name__ == "__main__":
+    pytest.main()
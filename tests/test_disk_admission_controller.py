@@ -0,0 +1,57 @@
+import pytest
+import time
+import threading
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.disk_admission_controller import DiskAdmissionController
+from src.models.directory_reaper import DirectoryReaper
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    monkeypatch.setattr(DiskAdmissionController, "POLL_INTERVAL_SECONDS", 0.05)
+    controller = DiskAdmissionController(str(tmp_path / "repos"), min_free_bytes=100)
+    monkeypatch.setattr(controller, "get_free_bytes", lambda: 1100)
+    return controller
+
+def admit_in_thread(controller, name, expected_bytes):
+    admitted = threading.Event()
+    def admit():
+        controller.admit(name, expected_bytes)
+        admitted.set()
+    threading.Thread(target=admit, daemon=True).start()
+    return admitted
+
+def test_reservations_are_subtracted_from_the_free_space(controller):
+    controller.admit("repo-1", 600)
+    admitted = admit_in_thread(controller, "repo-2", 600)
+    assert not admitted.wait(0.2)
+    controller.release("repo-1")
+    assert admitted.wait(1)
+
+def test_oversized_repository_is_admitted_when_alone(controller, capsys):
+    controller.admit("huge-repo", 10000)
+    assert "migrating it anyway" in capsys.readouterr().out
+    controller.release("huge-repo")
+
+def test_reaped_directory_wakes_up_waiting_repositories(tmp_path, monkeypatch):
+    monkeypatch.setattr(DiskAdmissionController, "POLL_INTERVAL_SECONDS", 30)
+    directory_reaper = DirectoryReaper(str(tmp_path / "trash"))
+    controller = DiskAdmissionController(str(tmp_path / "repos"), directory_reaper=directory_reaper)
+    free_bytes = [0]
+    monkeypatch.setattr(controller, "get_free_bytes", lambda: free_bytes[0])
+    controller.admit("repo-1", 0)
+    admitted = admit_in_thread(controller, "repo-2", 500)
+    assert not admitted.wait(0.2)
+    free_bytes[0] = 1000
+    os.makedirs(tmp_path / "repos" / "repo-0")
+    directory_reaper.remove(str(tmp_path / "repos" / "repo-0"))
+    # woken up by the reaper, long before the poll interval
+    assert admitted.wait(5)
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,71 @@
+import pytest
+import subprocess
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.connectors.git_executor import GitExecutor
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com"
+}
+
+@pytest.fixture
+def git_executor():
+    git_executor = GitExecutor(timeout=30, max_batch_processes=2)
+    yield git_executor
+    git_executor.close()
+
+@pytest.fixture
+def repository(tmp_path, git_executor):
+    repo_path = str(tmp_path / "repo")
+    git_executor.run(["git", "init", "--quiet", "--initial-branch=main", repo_path])
+    with open(f"{repo_path}/README.md", "w") as readme_file:
+        readme_file.write("hello\n")
+    git_executor.run(["git", "add", "README.md"], cwd=repo_path)
+    git_executor.run(["git", "commit", "--quiet", "-m", "Initial commit"], cwd=repo_path, env=GIT_IDENTITY)
+    return repo_path
+
+def test_run_uses_the_given_directory_and_environment(repository, git_executor):
+    current_directory = os.getcwd()
+    result = git_executor.run(["git", "log", "--format=%an %s"], cwd=repository)
+    assert result.stdout.strip() == "Test Initial commit"
+    assert git_executor.get_environment()["GIT_TERMINAL_PROMPT"] == "0"
+    assert os.getcwd() == current_directory
+
+def test_failed_command_raises(repository, git_executor):
+    with pytest.raises(subprocess.CalledProcessError):
+        git_executor.run(["git", "rev-parse", "missing-branch"], cwd=repository)
+    assert git_executor.run(["git", "rev-parse", "missing-branch"], cwd=repository, check=False).returncode != 0
+
+def test_batch_queries_reuse_one_process(repository, git_executor):
+    head_sha = git_executor.run(["git", "rev-parse", "HEAD"], cwd=repository).stdout.strip()
+    objects_info = git_executor.get_objects_info(repository, ["HEAD", "HEAD:README.md", "0" * 40, "missing-branch"])
+    assert objects_info[0] == {"sha": head_sha, "type": "commit", "size": objects_info[0]["size"]}
+    assert objects_info[1]["type"] == "blob"
+    assert objects_info[2:] == [None, None]
+    batch_process = git_executor._get_batch_process(repository)
+    assert git_executor.get_object_info(repository, f"{head_sha}^{{commit}}")["sha"] == head_sha
+    assert git_executor._get_batch_process(repository) is batch_process
+
+def test_batch_processes_are_bounded_and_restarted(repository, git_executor):
+    batch_check_process = git_executor._get_batch_process(repository)
+    other_repository = f"{os.path.dirname(repository)}/other"
+    git_executor.run(["git", "init", "--quiet", other_repository])
+    git_executor.get_objects_info(f"{repository}/.git", ["HEAD"])
+    git_executor.get_objects_info(other_repository, ["HEAD"])
+    assert len(git_executor._batch_processes) == 2
+    assert not batch_check_process.is_alive()
+    with pytest.raises(RuntimeError):
+        batch_check_process.query(["HEAD"])
+    # the evicted repository gets a new process on its next query
+    assert git_executor.get_object_info(repository, "HEAD:README.md")["type"] == "blob"
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import patch, mock_open
+import requests
+from unittest.mock import patch, mock_open, MagicMock
 
 import os
 import sys
@@ -7,26 +8,31 @@ import sys
 parent_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(parent_dir))
 
+from src.configs.configurations import ConfigurationsSnapshot
 from src.connectors.github_connector import GithubConnector
 
 @pytest.fixture
 def mock_configurations(monkeypatch):
-    # Mock the Configurations class to return a dummy SSH key
-    def mock_get_variable_value(key):
-        if key == "GITHUB_SSH_PRIVATE_KEY":
-            return "dummy_key_content"
-    monkeypatch.setattr("src.connectors.GithubConnector.Configurations.get_variable_value", mock_get_variable_value)
+    # the ssh key is written to the home directory of the user running the migration
+    monkeypatch.setenv("HOME", "/home/user")
+    return ConfigurationsSnapshot(
+        github_api_token="dummy_token",
+        github_organization="dummy_organization",
+        github_team="dummy_team",
+        github_ssh_private_key="dummy_key_content"
+    )
 
 @pytest.mark.parametrize("key_exists", [True, False])
+@patch("os.makedirs")
 @patch("os.path.exists")
 @patch("builtins.open", new_callable=mock_open, read_data="dummy_key_content")
 @patch("subprocess.run")
-def test_init(mock_subprocess, mock_open, mock_path_exists, key_exists, mock_configurations):
+def test_init(mock_subprocess, mock_open, mock_path_exists, mock_makedirs, key_exists, mock_configurations):
     # Mock the behavior of os.path.exists based on the parameter
     mock_path_exists.return_value = key_exists
 
     # Initialize GithubConnector
-    github_connector = GithubConnector()
+    github_connector = GithubConnector(configurations=mock_configurations)
 
     # Assert the behavior based on whether the key exists
     if key_exists:
@@ -35,10 +41,201 @@ def test_init(mock_subprocess, mock_open, mock_path_exists, key_exists, mock_con
         mock_subprocess.assert_not_called()
     else:
         # The SSH key file does not exist, the tool should create it
-        mock_open.assert_called_with("/home/user/.ssh/id_rsa", "w")
+        mock_open.assert_any_call("/home/user/.ssh/id_rsa", "w")
+        mock_open().write.assert_any_call("dummy_key_content")
         mock_subprocess.assert_called()
-    
+
     assert github_connector is not None
 
+@patch("os.makedirs")
+@patch("os.path.exists", return_value=False)
+@patch("builtins.open", side_effect=PermissionError("read-only home directory"))
+def test_init_raises_when_the_ssh_key_cannot_be_written(mock_open, mock_path_exists, mock_makedirs, mock_configurations):
+    # the caller decides how to fail, the connector never exits the process itself
+    with pytest.raises(PermissionError):
+        GithubConnector(configurations=mock_configurations)
+
+@pytest.fixture
+def github_connector(mock_configurations):
+    with patch("os.path.exists", return_value=True):
+        return GithubConnector(configurations=mock_configurations)
+
+def get_graphql_response(uri, method="GET", data=None, cache_ttl=None, invalidates=None):
+    if uri != "/graphql":
+        return {}
+    if data["query"].startswith("query"):
+        return {"data": {"organization": {"id": "O_1", "team": {"id": "T_1"}}}}
+    response = {"data": {}, "errors": []}
+    for name, value in data["variables"].items():
+        alias = name.replace("name", "repo").replace("repositoryId", "repo")
+        if name.startswith("name") and value == "existing-repo":
+            response["data"][alias] = None
+            response["errors"].append({"path": [alias], "message": "Name already exists on this account"})
+        elif name.startswith("name"):
+            response["data"][alias] = {"repository": {"id": f"R_{value}", "name": value, "url": f"https://github.com/dummy_organization/{value}"}}
+        elif name.startswith("repositoryId"):
+            response["data"][alias] = {"clientMutationId": None}
+    return response
+
+def test_repositories_are_created_in_batches(github_connector):
+    with patch.object(GithubConnector, "_execute_github_command", side_effect=get_graphql_response) as mock_execute:
+        created_repo_names = github_connector.create_repositories_in_team(["repo-1", "repo-2", "repo-3"], batch_size=2)
+    assert created_repo_names == ["repo-1", "repo-2", "repo-3"]
+    # the ids lookup, then a create and a permission mutation per batch
+    assert [call.args[0] for call in mock_execute.call_args_list] == ["/graphql"] * 5
+    permission_mutation = mock_execute.call_args_list[2].kwargs["data"]
+    assert "permission: WRITE" in permission_mutation["query"]
+    assert permission_mutation["variables"] == {"teamIds": ["T_1"], "repositoryId0": "R_repo-1", "repositoryId1": "R_repo-2"}
+
+def test_failed_aliases_fall_back_to_rest(github_connector):
+    with patch.object(GithubConnector, "_execute_github_command", side_effect=get_graphql_response), \
+        patch.object(GithubConnector, "create_repository_in_team", side_effect=Exception("422 Client Error")) as mock_create:
+        created_repo_names = github_connector.create_repositories_in_team(["repo-1", "existing-repo"])
+        mock_create.assert_called_once_with("existing-repo")
+    assert created_repo_names == ["repo-1"]
+    with patch.object(GithubConnector, "_execute_github_command", side_effect=requests.exceptions.ConnectionError("unreachable")), \
+        patch.object(GithubConnector, "create_repository_in_team") as mock_create:
+        github_connector._graphql_ids = None
+        assert github_connector.create_repositories_in_team(["repo-1", "repo-2"]) == ["repo-1", "repo-2"]
+        assert mock_create.call_count == 2
+
+def test_repositories_created_by_a_failed_request_only_get_the_team_grant(github_connector):
+    def execute_github_command(uri, method="GET", data=None, cache_ttl=None, invalidates=None):
+        if uri == "/graphql" and data["query"].startswith("mutation"):
+            raise requests.exceptions.ReadTimeout("timed out")
+        if uri == "/repos/dummy_organization/repo-2":
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.exceptions.HTTPError("404 Client Error", response=response)
+        return get_graphql_response(uri, method, data) if uri == "/graphql" else {"name": uri.split("/")[-1]}
+    with patch.object(GithubConnector, "_execute_github_command", side_effect=execute_github_command), \
+        patch.object(GithubConnector, "_add_repo_to_team") as mock_add_to_team, \
+        patch.object(GithubConnector, "create_repository_in_team") as mock_create:
+        assert github_connector.create_repositories_in_team(["repo-1", "repo-2"]) == ["repo-1", "repo-2"]
+        mock_add_to_team.assert_called_once_with("repo-1")
+        mock_create.assert_called_once_with("repo-2")
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com"
+}
+
+def add_commits(git_executor, repo_path, count):
+    for _ in range(count):
+        git_executor.run(["git", "commit", "--quiet", "--allow-empty", "-m", "commit"], cwd=repo_path, env=GIT_IDENTITY)
+
+@pytest.fixture
+def chunked_push_repositories(tmp_path, github_connector):
+    git_executor = github_connector._git_executor
+    local_repo_path = str(tmp_path / "mirror")
+    github_repo_path = str(tmp_path / "github.git")
+    git_executor.run(["git", "init", "--quiet", "--initial-branch=main", local_repo_path])
+    git_executor.run(["git", "init", "--quiet", "--bare", github_repo_path])
+    add_commits(git_executor, local_repo_path, 5)
+    git_executor.run(["git", "tag", "v1"], cwd=local_repo_path)
+    with patch.object(GithubConnector, "_get_push_url", return_value=github_repo_path):
+        yield git_executor, local_repo_path, github_repo_path
+    git_executor.close()
+
+def get_ref(git_executor, repo_path, ref):
+    return git_executor.run(["git", "rev-parse", ref], cwd=repo_path).stdout.strip()
+
+def test_chunked_push_pushes_every_checkpoint(github_connector, chunked_push_repositories):
+    git_executor, local_repo_path, github_repo_path = chunked_push_repositories
+    pushed_refs = []
+    github_connector.push_repository_in_chunks(local_repo_path, "repo", 2, 10, on_ref_pushed=lambda ref, object_name: pushed_refs.append(ref))
+    assert pushed_refs == ["refs/heads/main"] * 3 + ["refs/tags/v1"]
+    assert get_ref(git_executor, github_repo_path, "main") == get_ref(git_executor, local_repo_path, "main")
+    assert get_ref(git_executor, github_repo_path, "v1") == get_ref(git_executor, local_repo_path, "v1")
+
+@pytest.mark.parametrize("chunk_size", [2, 3])
+def test_resumed_chunked_push_continues_after_the_remote_tip(github_connector, chunked_push_repositories, chunk_size):
+    git_executor, local_repo_path, github_repo_path = chunked_push_repositories
+    github_connector.push_repository_in_chunks(local_repo_path, "repo", 2, 10)
+    # the mirror gained commits since, the old remote tip is no longer one of the new checkpoints
+    add_commits(git_executor, local_repo_path, 2)
+    pushed_refs = []
+    github_connector.push_repository_in_chunks(local_repo_path, "repo", chunk_size, 10, on_ref_pushed=lambda ref, object_name: pushed_refs.append(ref))
+    assert pushed_refs == ["refs/heads/main"]
+    assert get_ref(git_executor, github_repo_path, "main") == get_ref(git_executor, local_repo_path, "main")
+
+def test_commit_and_push_includes_new_files(github_connector, chunked_push_repositories):
+    git_executor, local_repo_path, github_repo_path = chunked_push_repositories
+    git_executor.run(["git", "remote", "add", "origin", github_repo_path], cwd=local_repo_path)
+    with open(f"{local_repo_path}/NEW.md", "w") as new_file:
+        new_file.write("https://github.com/org/repo\n")
+    with patch.dict(os.environ, GIT_IDENTITY):
+        github_connector.commit_and_push_repository(local_repo_path)
+    assert get_ref(git_executor, github_repo_path, "refs/heads/main") == get_ref(git_executor, local_repo_path, "HEAD")
+    assert git_executor.run(["git", "show", "main:NEW.md"], cwd=github_repo_path).stdout == "https://github.com/org/repo\n"
+
+def test_sparse_checkout_contains_only_the_candidate_files(github_connector, tmp_path):
+    git_executor = github_connector._git_executor
+    source_repo_path = str(tmp_path / "source")
+    git_executor.run(["git", "init", "--quiet", "--initial-branch=main", source_repo_path])
+    for file_name in ["[links].md", "a*b.md", "ab.md", "other.md"]:
+        with open(f"{source_repo_path}/{file_name}", "w") as file:
+            file.write(file_name)
+    git_executor.run(["git", "add", "-A"], cwd=source_repo_path)
+    git_executor.run(["git", "commit", "--quiet", "-m", "files"], cwd=source_repo_path, env=GIT_IDENTITY)
+    local_repo_path = str(tmp_path / "github-repo")
+    with patch.object(GithubConnector, "_get_push_url", return_value=f"file://{source_repo_path}"):
+        head_commit = github_connector.clone_repository_without_checkout("repo", local_repo_path)
+    assert head_commit == get_ref(git_executor, source_repo_path, "HEAD")
+    # glob characters in the paths are matched literally
+    github_connector.checkout_repository(local_repo_path, ["[links].md", "a*b.md"])
+    assert sorted(entry for entry in os.listdir(local_repo_path) if entry != ".git") == ["[links].md", "a*b.md"]
+    git_executor.close()
+
+def test_existing_repository_is_only_granted_to_the_team(github_connector):
+    with patch.object(GithubConnector, "get_org_repos_index", return_value={"repo-1": {"name": "Repo-1"}}), \
+        patch.object(GithubConnector, "_create_repo") as mock_create_repo, \
+        patch.object(GithubConnector, "_add_repo_to_team") as mock_add_to_team:
+        github_connector.create_repository_in_team("Repo-1")
+        github_connector.create_repository_in_team("repo-2")
+    mock_create_repo.assert_called_once_with("repo-2")
+    assert [call.args[0] for call in mock_add_to_team.call_args_list] == ["Repo-1", "repo-2"]
+
+def get_org_repos_page(page_number, links=None, link_header=""):
+    response = MagicMock()
+    response.json.return_value = [{"name": f"repo-{page_number}-{index}"} for index in range(2)]
+    response.links = links if links else {}
+    response.headers = {"Link": link_header}
+    return response
+
+def iterate_org_repos(github_connector, first_page, last_page_number=3):
+    requested_pages = []
+    def execute_github_command(uri, method="GET", cache_ttl=None):
+        page_number = int(uri.split("page=")[-1])
+        requested_pages.append(page_number)
+        return get_org_repos_page(page_number).json() if page_number < last_page_number else [{"name": f"repo-{page_number}-0"}]
+    with patch.object(GithubConnector, "ORG_REPOS_PAGE_SIZE", 2), \
+        patch.object(GithubConnector, "_send_github_request", return_value=first_page), \
+        patch.object(GithubConnector, "_execute_github_command", side_effect=execute_github_command):
+        repo_names = sorted(repo["name"] for repo in github_connector._iterate_org_repos())
+    return repo_names, sorted(requested_pages)
+
+def test_org_repos_pages_are_read_up_to_the_last_link(github_connector):
+    first_page = get_org_repos_page(1, {"last": {"url": "https://api.github.com/orgs/org/repos?type=all&per_page=2&page=3"}})
+    repo_names, requested_pages = iterate_org_repos(github_connector, first_page)
+    assert requested_pages == [2, 3]
+    assert repo_names == ["repo-1-0", "repo-1-1", "repo-2-0", "repo-2-1", "repo-3-0"]
+
+def test_org_repos_without_link_header_have_a_single_page(github_connector):
+    repo_names, requested_pages = iterate_org_repos(github_connector, get_org_repos_page(1))
+    assert requested_pages == []
+    assert repo_names == ["repo-1-0", "repo-1-1"]
+
+@pytest.mark.parametrize("links", [
+    {"next": {"url": "https://api.github.com/orgs/org/repos?page=2"}},
+    {"last": {"url": "https://api.github.com/orgs/org/repos?page=last"}}
+])
+def test_org_repos_with_malformed_link_header_are_read_one_by_one(github_connector, links):
+    repo_names, requested_pages = iterate_org_repos(github_connector, get_org_repos_page(1, links, "<malformed>"))
+    assert requested_pages == [2, 3]
+    assert repo_names == ["repo-1-0", "repo-1-1", "repo-2-0", "repo-2-1", "repo-3-0"]
+
 if __name__ == "__main__":
-    pytest.main()
\ No newline at end of file
+    pytest.main()
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.connectors.github_rate_governor import GithubRateGovernor
+
+def mock_response(status_code, headers, text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers
+    response.text = text
+    return response
+
+@patch("time.sleep")
+@patch("time.time", return_value=1000.0)
+def test_content_creating_calls_are_spaced(mock_time, mock_sleep):
+    governor = GithubRateGovernor(content_creation_interval=1)
+    governor.acquire("POST")
+    governor.acquire("DELETE")
+    governor.acquire("GET")
+    mock_sleep.assert_called_once_with(1.0)
+
+@patch("time.time", return_value=1000.0)
+def test_retry_after_pauses_the_budget(mock_time):
+    governor = GithubRateGovernor(content_creation_interval=0)
+    retry_delay = governor.update(mock_response(429, {"Retry-After": "30"}))
+    assert retry_delay == 30
+    assert governor._get_wait_until(1000.0) == 1030.0
+
+@patch("time.time", return_value=1000.0)
+def test_exhausted_primary_budget_waits_for_reset(mock_time):
+    governor = GithubRateGovernor(content_creation_interval=0)
+    retry_delay = governor.update(mock_response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1100"}))
+    assert retry_delay == 0
+    assert governor._get_wait_until(1000.0) == 1100.0
+
+@patch("time.time", return_value=1000.0)
+def test_permission_error_is_not_retried(mock_time):
+    governor = GithubRateGovernor(content_creation_interval=0)
+    retry_delay = governor.update(mock_response(403, {"X-RateLimit-Remaining": "4000"}, "Must have admin rights"))
+    assert retry_delay == 0
+
+@patch("time.time", return_value=1000.0)
+def test_graphql_budget_does_not_replace_the_rest_budget(mock_time):
+    governor = GithubRateGovernor(content_creation_interval=0)
+    governor.update(mock_response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1100", "X-RateLimit-Resource": "graphql"}))
+    assert governor._get_wait_until(1000.0) == 0
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,155 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from src.connectors.http_transport import HttpTransport
+from src.connectors.http_response_cache import HttpResponseCache
+
+def mock_response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+def cacheable_response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = requests.structures.CaseInsensitiveDict(headers if headers else {})
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+@pytest.fixture
+def cached_transport():
+    return HttpTransport(pool_size=2, timeout=5, max_retries=0, backoff_factor=0, max_backoff=0, response_cache=HttpResponseCache(max_entries=10))
+
+@pytest.fixture
+def transport():
+    return HttpTransport(pool_size=2, timeout=5, max_retries=3, backoff_factor=0, max_backoff=0)
+
+def test_session_is_reused_per_host(transport):
+    first_session = transport._get_session("https://example.com/rest/api/latest/projects")
+    second_session = transport._get_session("https://example.com/rest/api/latest/repos")
+    other_session = transport._get_session("https://api.github.com/orgs")
+    assert first_session is second_session
+    assert first_session is not other_session
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_retry_on_server_error(mock_request, mock_sleep, transport):
+    mock_request.side_effect = [mock_response(502), mock_response(503), mock_response(200)]
+    response = transport.request("GET", "https://example.com/resource")
+    assert response.status_code == 200
+    assert mock_request.call_count == 3
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_retries_are_bounded(mock_request, mock_sleep, transport):
+    mock_request.return_value = mock_response(500)
+    response = transport.request("PUT", "https://example.com/resource")
+    assert response.status_code == 500
+    assert mock_request.call_count == 4
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_post_is_not_replayed_on_server_error(mock_request, mock_sleep, transport):
+    mock_request.return_value = mock_response(502)
+    response = transport.request("POST", "https://example.com/resource", json={})
+    assert response.status_code == 502
+    assert mock_request.call_count == 1
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_post_is_retried_when_the_connection_cannot_be_established(mock_request, mock_sleep, transport):
+    connection_error = NewConnectionError(None, "Connection refused")
+    mock_request.side_effect = [
+        requests.exceptions.ConnectionError(MaxRetryError(None, "https://example.com/resource", connection_error)),
+        requests.exceptions.ConnectTimeout("connect timeout"),
+        mock_response(201)
+    ]
+    response = transport.request("POST", "https://example.com/resource", json={})
+    assert response.status_code == 201
+    assert mock_request.call_count == 3
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_post_is_not_replayed_on_connection_reset(mock_request, mock_sleep, transport):
+    mock_request.side_effect = [requests.exceptions.ConnectionError("reset"), mock_response(201)]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.request("POST", "https://example.com/resource", json={})
+    assert mock_request.call_count == 1
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_get_is_retried_on_connection_reset(mock_request, mock_sleep, transport):
+    mock_request.side_effect = [requests.exceptions.ConnectionError("reset"), mock_response(200)]
+    response = transport.request("GET", "https://example.com/resource")
+    assert response.status_code == 200
+    assert mock_request.call_count == 2
+
+@patch("time.sleep")
+@patch("requests.Session.request")
+def test_retry_warning_does_not_print_the_url_path(mock_request, mock_sleep, transport, capsys):
+    webhook_url = "https://example.webhook.office.com/webhookb2/secret-token"
+    mock_request.side_effect = [
+        requests.exceptions.ConnectTimeout(f"Max retries exceeded with url: {webhook_url}"),
+        mock_response(200)
+    ]
+    transport.request("POST", webhook_url, json={}, service="teams", endpoint="webhook")
+    printed = capsys.readouterr().out
+    assert "secret-token" not in printed
+    assert "POST https://example.webhook.office.com/webhook has failed with ConnectTimeout" in printed
+
+@patch("requests.Session.request")
+def test_stale_response_is_revalidated_with_its_etag(mock_request, cached_transport):
+    mock_request.side_effect = [
+        cacheable_response(200, b'{"name": "repo"}', {"ETag": '"v1"', "X-RateLimit-Remaining": "10"}),
+        cacheable_response(304, headers={"ETag": '"v1"', "X-RateLimit-Remaining": "9"})
+    ]
+    first_response = cached_transport.request("GET", "https://example.com/repos/repo", cache_ttl=0)
+    second_response = cached_transport.request("GET", "https://example.com/repos/repo", cache_ttl=0)
+    assert mock_request.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert first_response.json() == second_response.json() == {"name": "repo"}
+    assert second_response.status_code == 200
+    assert second_response.headers["X-RateLimit-Remaining"] == "9"
+
+@patch("requests.Session.request")
+def test_fresh_response_is_served_from_the_cache_until_a_write_invalidates_it(mock_request, cached_transport):
+    mock_request.side_effect = [
+        cacheable_response(200, b'{"permission": "REPO_WRITE"}'),
+        cacheable_response(204),
+        cacheable_response(200, b'{"permission": "REPO_READ"}')
+    ]
+    listing_url = "https://example.com/repos/repo/permissions/groups?start=0"
+    assert cached_transport.request("GET", listing_url, cache_ttl=60).json() == {"permission": "REPO_WRITE"}
+    assert cached_transport.request("GET", listing_url, cache_ttl=60).json() == {"permission": "REPO_WRITE"}
+    assert mock_request.call_count == 1
+    cached_transport.request("PUT", "https://example.com/repos/repo/permissions/groups?name=developers&permission=REPO_READ")
+    assert cached_transport.request("GET", listing_url, cache_ttl=60).json() == {"permission": "REPO_READ"}
+    assert mock_request.call_count == 3
+
+@patch("requests.Session.request")
+def test_responses_are_cached_per_credentials(mock_request, cached_transport):
+    mock_request.side_effect = [cacheable_response(200, b"[1]"), cacheable_response(200, b"[2]")]
+    assert cached_transport.request("GET", "https://example.com/orgs/org/repos", headers={"Authorization": "Bearer a"}, cache_ttl=60).json() == [1]
+    assert cached_transport.request("GET", "https://example.com/orgs/org/repos", headers={"Authorization": "Bearer b"}, cache_ttl=60).json() == [2]
+
+def test_disk_cache_is_reloaded_and_invalidated(tmp_path):
+    response_cache = HttpResponseCache(max_entries=1, directory=str(tmp_path))
+    response_cache.store("first", "https://example.com/projects/a", cacheable_response(200, b"a", {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}))
+    response_cache.store("second", "https://example.com/projects/b", cacheable_response(200, b"b"))
+    assert sorted(os.listdir(tmp_path)) == ["second.json"]
+
+    reloaded_cache = HttpResponseCache(max_entries=1, directory=str(tmp_path))
+    assert reloaded_cache.get_fresh_response("second", 60).content == b"b"
+    assert reloaded_cache.invalidate(["https://example.com/projects"]) == 1
+    assert os.listdir(tmp_path) == []
+
+if __name__ == "__main__":
+    pytest.main()
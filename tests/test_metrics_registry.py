@@ -0,0 +1,59 @@
+import pytest
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.connectors.metrics_registry import MetricsRegistry
+
+def test_endpoint_label_replaces_identifiers():
+    identified_segments = {"repos": 2, "orgs": 1, "teams": 1}
+    assert MetricsRegistry.get_endpoint_label("/orgs/my-org/teams/my-team/repos/my-org/my-repo", identified_segments) == "/orgs/{id}/teams/{id}/repos/{id}/{id}"
+    assert MetricsRegistry.get_endpoint_label("/orgs/my-org/repos?type=all&page=2", identified_segments) == "/orgs/{id}/repos"
+    assert MetricsRegistry.get_endpoint_label("/app/rest/vcs-roots/id:Project_Repo/properties/url", {}) == "/app/rest/vcs-roots/{id}/properties/url"
+
+def test_openmetrics_text_has_counters_and_cumulative_buckets():
+    metrics_registry = MetricsRegistry()
+    metrics_registry.observe_api_call("github", "/orgs/{id}/repos", "GET", 200, 0.2)
+    metrics_registry.observe_api_call("github", "/orgs/{id}/repos", "GET", 200, 3)
+    metrics_registry.add_transferred_bytes("pushed", 2048)
+
+    lines = metrics_registry.get_openmetrics_text().splitlines()
+
+    labels = 'endpoint="/orgs/{id}/repos",method="GET",service="github",status="200"'
+    assert f"migration_api_calls_total{{{labels}}} 2" in lines
+    assert f"migration_api_call_duration_seconds_bucket{{{labels},le=\"0.25\"}} 1" in lines
+    assert f"migration_api_call_duration_seconds_bucket{{{labels},le=\"5\"}} 2" in lines
+    assert f"migration_api_call_duration_seconds_bucket{{{labels},le=\"+Inf\"}} 2" in lines
+    assert f"migration_api_call_duration_seconds_sum{{{labels}}} 3.2" in lines
+    assert 'migration_transferred_bytes_total{direction="pushed"} 2048' in lines
+    assert lines[-1] == "# EOF"
+
+def test_stage_timer_records_failed_stages(tmp_path):
+    metrics_registry = MetricsRegistry()
+    with metrics_registry.stage_timer("push"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics_registry.stage_timer("push"):
+            raise RuntimeError("push rejected")
+    textfile_path = str(tmp_path / "metrics" / "migration.prom")
+    metrics_registry.write_textfile(textfile_path)
+
+    with open(textfile_path) as textfile:
+        contents = textfile.read()
+    assert 'migration_stage_duration_seconds_count{stage="push",status="failed"} 1' in contents
+    assert 'migration_stage_duration_seconds_count{stage="push",status="succeeded"} 1' in contents
+    assert os.listdir(tmp_path / "metrics") == ["migration.prom"]
+
+def test_counter_total_sums_matching_labels():
+    metrics_registry = MetricsRegistry()
+    metrics_registry.observe_api_call("github", "/orgs/{id}/repos", "POST", 201, 0.1)
+    metrics_registry.observe_api_call("github", "/repos/{id}/{id}", "GET", 404, 0.1)
+    metrics_registry.observe_api_call("bitbucket", "/projects/{id}/repos", "GET", 200, 0.1)
+
+    assert metrics_registry.get_counter_total("migration_api_calls") == 3
+    assert metrics_registry.get_counter_total("migration_api_calls", {"service": "github"}) == 2
+    assert metrics_registry.get_counter_total("migration_api_calls", {"service": "github", "status": "404"}) == 1
+    assert metrics_registry.get_counter_total("migration_repositories") == 0
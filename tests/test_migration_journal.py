@@ -0,0 +1,44 @@
+import pytest
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.migration_journal import MigrationJournal
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = MigrationJournal(str(tmp_path / "journal" / "migration_journal.sqlite"))
+    yield journal
+    journal.close()
+
+def test_completed_stages_survive_reopening(tmp_path):
+    journal_file_path = str(tmp_path / "migration_journal.sqlite")
+    journal = MigrationJournal(journal_file_path)
+    journal.mark_stage_completed("repo", "mock.migration.repo", MigrationJournal.STAGE_CLONED, "/tmp/repo")
+    journal.mark_stage_completed("repo", "mock.migration.repo", MigrationJournal.STAGE_CREATED)
+    journal.close()
+
+    reopened_journal = MigrationJournal(journal_file_path)
+    completed_stages = reopened_journal.get_completed_stages("repo", "mock.migration.repo")
+    reopened_journal.close()
+    assert completed_stages == {MigrationJournal.STAGE_CLONED: "/tmp/repo", MigrationJournal.STAGE_CREATED: ""}
+
+def test_stages_are_tracked_per_repository(journal):
+    journal.mark_stage_completed("repo", "repo", MigrationJournal.STAGE_PUSHED)
+    assert MigrationJournal.STAGE_PUSHED in journal.get_completed_stages("repo", "repo")
+    assert journal.get_completed_stages("repo", "mock.migration.repo") == {}
+    assert journal.get_completed_stages("other", "other") == {}
+
+def test_clear_github_repository(journal):
+    journal.mark_stage_completed("repo", "repo", MigrationJournal.STAGE_CREATED)
+    journal.mark_stage_completed("repo", "repo", MigrationJournal.STAGE_PUSHED)
+    journal.mark_ref_pushed("repo", "refs/heads/main", "0" * 40)
+    journal.clear_github_repository("repo")
+    assert journal.get_completed_stages("repo", "repo") == {}
+    assert journal.get_pushed_refs("repo") == {}
+
+if __name__ == "__main__":
+    pytest.main()
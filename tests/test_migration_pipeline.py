@@ -0,0 +1,81 @@
+import pytest
+import time
+import threading
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.migration_pipeline import MigrationPipeline
+
+class StageRecorder:
+
+    def __init__(self, name, duration=0, failing_items=()):
+        self.name = name
+        self.duration = duration
+        self.failing_items = failing_items
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.items = []
+
+    def __call__(self, item):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.duration)
+        with self.lock:
+            self.running -= 1
+            self.items.append(item["name"])
+        item["stages"].append(self.name)
+        if item["name"] in self.failing_items:
+            raise RuntimeError(f"{self.name} has failed")
+
+def get_items(count):
+    return [{"name": f"repo-{index}", "stages": []} for index in range(count)]
+
+def test_results_are_returned_in_input_order():
+    stages = [StageRecorder("fetch"), StageRecorder("push")]
+    pipeline = MigrationPipeline(
+        [(stage.name, stage, 2) for stage in stages],
+        on_completed=lambda item, error: (item["name"], item["stages"], error)
+    )
+    results = pipeline.run(get_items(5))
+    assert [result[0] for result in results] == [f"repo-{index}" for index in range(5)]
+    assert all(result[1] == ["fetch", "push"] and result[2] is None for result in results)
+
+def test_failed_item_skips_the_next_stages():
+    fetch, create, push = StageRecorder("fetch"), StageRecorder("create", failing_items=["repo-1"]), StageRecorder("push")
+    pipeline = MigrationPipeline(
+        [("fetch", fetch, 1), ("create", create, 1), ("push", push, 1)],
+        on_completed=lambda item, error: error
+    )
+    results = pipeline.run(get_items(3))
+    assert isinstance(results[1], RuntimeError)
+    assert results[0] is None and results[2] is None
+    assert sorted(push.items) == ["repo-0", "repo-2"]
+
+def test_stages_overlap_within_their_workers_count():
+    fetch, push = StageRecorder("fetch", duration=0.05), StageRecorder("push", duration=0.05)
+    pipeline = MigrationPipeline([("fetch", fetch, 1), ("push", push, 3)], queue_size=1)
+    start_time = time.time()
+    pipeline.run(get_items(6))
+    # sequential stages would take 12 * 0.05s, the pipeline is bounded by the single fetch worker
+    assert time.time() - start_time < 0.55
+    assert fetch.max_running == 1
+    assert push.max_running <= 3
+
+def test_failing_items_source_drains_the_queued_items():
+    def get_failing_items():
+        yield {"name": "repo-0", "stages": []}
+        raise ValueError("journal is unreadable")
+    fetch = StageRecorder("fetch")
+    pipeline = MigrationPipeline([("fetch", fetch, 2)])
+    with pytest.raises(ValueError):
+        pipeline.run(get_failing_items())
+    assert fetch.items == ["repo-0"]
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,41 @@
+import pytest
+from unittest.mock import MagicMock
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.configs.configurations import ConfigurationsSnapshot
+from src.models.migration_planner import MigrationPlanner
+
+REPOSITORIES = [{"bitbucket": "repo-1", "github": "repo-1"}, {"bitbucket": "stale-repo", "github": "stale-repo"}]
+
+@pytest.fixture
+def planner():
+    bitbucket_connector = MagicMock()
+    def get_repository_size(repo_name):
+        if repo_name == "stale-repo":
+            raise Exception("404 Client Error: Not Found")
+        return 1024 ** 2
+    bitbucket_connector.get_repository_size.side_effect = get_repository_size
+    bitbucket_connector.get_repository_refs_count.return_value = 3
+    journal = MagicMock()
+    journal.get_measurements.return_value = []
+    return MigrationPlanner(bitbucket_connector, journal, 2, configurations=ConfigurationsSnapshot())
+
+def test_unreachable_repository_is_planned_as_empty(planner):
+    plan = planner.create_plan(REPOSITORIES)
+    sizes = {item["repository"]["bitbucket"]: (item["size"], item["refs_count"]) for item in plan["repositories"]}
+    assert sizes == {"repo-1": (1024 ** 2, 3), "stale-repo": (0, 0)}
+
+def test_only_measured_completions_are_recorded(planner):
+    planner.start_tracking(planner.create_plan(REPOSITORIES))
+    planner.record_completion("stale-repo", 5, False)
+    planner._journal.record_measurement.assert_not_called()
+    planner.record_completion("repo-1", 12, True)
+    planner._journal.record_measurement.assert_called_once_with("repo-1", 1024 ** 2, 3, 12)
+
+if __name__ == "__main__":
+    pytest.main()
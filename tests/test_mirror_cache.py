@@ -0,0 +1,53 @@
+import pytest
+import time
+from unittest.mock import MagicMock
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.mirror_cache import MirrorCache
+
+def create_mirror(mirror_cache, repo_name, size, last_used):
+    mirror_path = mirror_cache.get_mirror_path(repo_name)
+    os.makedirs(f"{mirror_path}/objects")
+    with open(f"{mirror_path}/objects/pack", "wb") as pack_file:
+        pack_file.write(b"0" * size)
+    os.utime(mirror_path, (last_used, last_used))
+
+def test_least_recently_used_mirrors_are_evicted_without_blocking_checkouts(tmp_path):
+    mirror_cache = MirrorCache(str(tmp_path / "mirrors"), 2500, MagicMock())
+    now = time.time()
+    create_mirror(mirror_cache, "oldest", 1000, now - 300)
+    create_mirror(mirror_cache, "in-use", 1000, now - 200)
+    create_mirror(mirror_cache, "recent", 1000, now - 100)
+    mirror_cache._repositories_in_use["in-use"] = 1
+    get_directory_size = mirror_cache._get_directory_size
+    def get_unlocked_directory_size(directory):
+        # checkouts and releases take the cache lock, walking the mirrors must not hold it
+        assert not mirror_cache._lock.locked()
+        return get_directory_size(directory)
+    mirror_cache._get_directory_size = get_unlocked_directory_size
+    assert mirror_cache.evict() == 2000
+    assert sorted(os.listdir(tmp_path / "mirrors")) == ["in-use.git", "recent.git"]
+
+def test_searched_mirror_is_not_evicted(tmp_path):
+    mirror_cache = MirrorCache(str(tmp_path / "mirrors"), 0, MagicMock())
+    create_mirror(mirror_cache, "searched", 1000, time.time())
+    evicted_sizes = []
+    def get_object_info(repo_path, object_name):
+        # another worker evicts the cache while the mirror is searched
+        evicted_sizes.append(mirror_cache.evict())
+        return None
+    mirror_cache._git_executor = MagicMock()
+    mirror_cache._git_executor.get_object_info.side_effect = get_object_info
+    assert mirror_cache.grep_files("searched", "0" * 40, ["https://bitbucket.example.com/"]) is None
+    assert evicted_sizes == [1000]
+    assert os.listdir(tmp_path / "mirrors") == ["searched.git"]
+    assert mirror_cache._repositories_in_use == {}
+    assert mirror_cache.evict() == 0
+
+if __name__ == "__main__":
+    pytest.main()
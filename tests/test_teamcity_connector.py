@@ -0,0 +1,117 @@
+import pytest
+import json
+import time
+import requests
+from unittest.mock import patch
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.configs.configurations import ConfigurationsSnapshot
+from src.connectors.teamcity_connector import TeamcityConnector
+from src.connectors.http_transport import HttpTransport
+from src.connectors.http_response_cache import HttpResponseCache
+
+def json_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    response.encoding = "utf-8"
+    return response
+
+@pytest.fixture
+def teamcity_connector():
+    configurations = ConfigurationsSnapshot(teamcity_token="dummy_token", teamcity_server_host="teamcity.example.com")
+    teamcity_connector = TeamcityConnector(configurations=configurations)
+    teamcity_connector._http_transport = HttpTransport(max_retries=0, response_cache=HttpResponseCache(max_entries=10), configurations=configurations)
+    return teamcity_connector
+
+def get_cached_urls(teamcity_connector):
+    return sorted(entry["url"].removeprefix(teamcity_connector._base_url) for entry in teamcity_connector._http_transport._response_cache._entries.values())
+
+@patch("requests.Session.request")
+def test_features_update_invalidates_only_the_buildtype_features(mock_request, teamcity_connector):
+    mock_request.side_effect = [
+        json_response(200, {"buildType": [{"id": "Build"}, {"id": "Test"}]}),
+        json_response(200, {"feature": []}),
+        json_response(200, {"feature": []}),
+        json_response(200, {})
+    ]
+    teamcity_connector._get_project_buildtypes("Project")
+    teamcity_connector._get_buildtype_features("Build")
+    teamcity_connector._get_buildtype_features("Test")
+    teamcity_connector._update_buildtype_features("Build", [])
+    # the project tree listings do not embed the features, a bulk update keeps them cached
+    assert get_cached_urls(teamcity_connector) == ["/buildTypes/id:Test/features", "/projects/id:Project/buildTypes"]
+
+PROJECT_TREE = {"Root": ["Slow", "Fast"], "Slow": ["SlowChild"], "Fast": ["FastChild"], "SlowChild": [], "FastChild": []}
+
+def test_project_tree_keeps_the_depth_first_order(teamcity_connector):
+    def get_sub_projects(project_id):
+        # the first subproject answers last, the crawl order differs from the depth-first order
+        time.sleep(0.05 if project_id == "Slow" else 0)
+        return [{"id": subproject_id} for subproject_id in PROJECT_TREE[project_id]]
+    teamcity_connector._get_sub_projects = get_sub_projects
+    project_items = teamcity_connector._get_project_tree_items("Root", lambda project_id: [f"{project_id}-item"])
+    assert list(project_items) == ["Root", "Slow", "SlowChild", "Fast", "FastChild"]
+    assert project_items["FastChild"] == ["FastChild-item"]
+
+@pytest.mark.parametrize("repository_url", [
+    "https://bitbucket.example.com/scm/prj/repo-1",
+    "https://User@Bitbucket.Example.com:7990/scm/PRJ/Repo-1.git/",
+    " ssh://git@bitbucket.example.com:7999/scm/prj/repo-1.git ",
+    "git@bitbucket.example.com:scm/prj/repo-1.git"
+])
+def test_repository_urls_are_normalized(repository_url):
+    assert TeamcityConnector.normalize_repository_url(repository_url) == "bitbucket.example.com/scm/prj/repo-1"
+
+def test_vcs_roots_are_indexed_by_normalized_url(teamcity_connector):
+    def get_vcs_root(vcs_root_id, properties):
+        return {"id": vcs_root_id, "href": f"/app/rest/vcs-roots/id:{vcs_root_id}", "properties": {"property": properties}}
+    teamcity_connector._execute_teamcity_command = lambda uri, method="GET": {"vcs-root": [
+        get_vcs_root("Https", [{"name": "branch", "value": "main"}, {"name": "url", "value": "https://bitbucket.example.com/scm/prj/repo-1.git"}]),
+        get_vcs_root("Ssh", [{"name": "url", "value": "git@bitbucket.example.com:scm/PRJ/repo-1.git"}]),
+        get_vcs_root("Other", [{"name": "url", "value": "https://bitbucket.example.com/scm/prj/repo-2"}]),
+        get_vcs_root("Empty", [{"name": "url", "value": ""}]),
+        get_vcs_root("Missing", [])
+    ]}
+    assert teamcity_connector.get_vcs_roots_url_index("Root") == {
+        "bitbucket.example.com/scm/prj/repo-1": ["/app/rest/vcs-roots/id:Https", "/app/rest/vcs-roots/id:Ssh"],
+        "bitbucket.example.com/scm/prj/repo-2": ["/app/rest/vcs-roots/id:Other"]
+    }
+
+def get_buildtype(buildtype_id, stash_base_url):
+    publisher = {
+        "id": "BUILD_EXT_1",
+        "type": "commit-status-publisher",
+        "properties": {"property": [{"name": "stashBaseUrl", "value": stash_base_url}, {"name": "vcsRootId", "value": f"{buildtype_id}_Root"}]}
+    }
+    return {"id": buildtype_id, "features": {"feature": [{"id": "swabra", "type": "swabra"}, publisher]}}
+
+def test_commit_status_publishers_are_counted(teamcity_connector):
+    teamcity_connector._bitbucket_server_host = "bitbucket.example.com"
+    teamcity_connector._get_project_buildtypes_features = lambda project_id: [
+        get_buildtype("Build", "https://bitbucket.example.com"),
+        get_buildtype("Failing", "https://bitbucket.example.com"),
+        get_buildtype("Migrated", "https://api.github.com"),
+        {"id": "Empty"}
+    ]
+    updated_features = {}
+    def update_buildtype_features(buildtype_id, features):
+        if buildtype_id == "Failing":
+            raise RuntimeError("forbidden")
+        updated_features[buildtype_id] = features
+    teamcity_connector._update_buildtype_features = update_buildtype_features
+    summary = teamcity_connector.update_buildtypes_commit_status_publisher("Root")
+    assert summary == {"updated": 1, "skipped": 2, "failed": ["Failing"]}
+    swabra, publisher = updated_features["Build"]
+    assert swabra == {"id": "swabra", "type": "swabra"}
+    publisher_properties = {property["name"]: property["value"] for property in publisher["properties"]["property"]}
+    assert publisher_properties["publisherId"] == "githubStatusPublisher"
+    assert publisher_properties["vcsRootId"] == "Build_Root"
+
+if __name__ == "__main__":
+    pytest.main()
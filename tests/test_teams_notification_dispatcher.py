@@ -0,0 +1,62 @@
+import pytest
+
+import os
+import sys
+import requests
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.connectors.teams_connector import TeamsConnector
+from src.connectors.teams_notification_dispatcher import TeamsNotificationDispatcher
+
+class FakeTeamsConnector(TeamsConnector):
+
+    def __init__(self, failures_count=0):
+        self.message_cards = []
+        self.failures_count = failures_count
+
+    def post_message_card(self, message_card):
+        if self.failures_count:
+            self.failures_count -= 1
+            raise requests.exceptions.ConnectionError("Connection reset")
+        self.message_cards.append(message_card)
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    monkeypatch.setattr(TeamsNotificationDispatcher, "RETRY_BACKOFF_FACTOR_SECONDS", 0)
+
+def test_notifications_are_sent_as_one_digest_on_close():
+    teams_connector = FakeTeamsConnector()
+    dispatcher = TeamsNotificationDispatcher(teams_connector=teams_connector, queue_size=10, digest_interval=60, max_retries=0)
+    dispatcher.notify_success("Repository 'a' migrated")
+    dispatcher.notify_failure("Repository 'b' has failed to migrate", "CalledProcessError")
+    dispatcher.close()
+
+    assert len(teams_connector.message_cards) == 1
+    message_card = teams_connector.message_cards[0]
+    assert message_card["summary"] == "Failure"
+    assert message_card["sections"][0]["activitySubtitle"] == "1 success, 1 failure"
+    assert [fact["value"] for fact in message_card["sections"][0]["facts"]] == [
+        "Repository 'a' migrated",
+        "Repository 'b' has failed to migrate: CalledProcessError"
+    ]
+
+def test_notifications_above_the_queue_size_are_dropped_and_reported():
+    teams_connector = FakeTeamsConnector()
+    dispatcher = TeamsNotificationDispatcher(teams_connector=teams_connector, queue_size=1, digest_interval=60, max_retries=0)
+    results = [dispatcher.notify_info(f"Event {index}") for index in range(200)]
+    dispatcher.close()
+
+    assert not all(results)
+    dropped_count = results.count(False)
+    assert any(f"{dropped_count} dropped" in message_card["sections"][0]["activitySubtitle"] for message_card in teams_connector.message_cards)
+
+def test_failed_digest_is_retried():
+    teams_connector = FakeTeamsConnector(failures_count=2)
+    dispatcher = TeamsNotificationDispatcher(teams_connector=teams_connector, queue_size=10, digest_interval=0, max_retries=3)
+    dispatcher.notify_info("Migration has started")
+    dispatcher.close()
+
+    assert len(teams_connector.message_cards) == 1
+    assert teams_connector.failures_count == 0
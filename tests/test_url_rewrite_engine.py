@@ -0,0 +1,68 @@
+import pytest
+
+import os
+import sys
+# Append the path to the parent directory (project root) to sys.path
+parent_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+from src.models.url_rewrite_engine import UrlRewriteEngine
+
+@pytest.fixture
+def engine():
+    engine = UrlRewriteEngine(
+        ["https://bitbucket.example.com/projects/KEY/repos", "https://bitbucket.example.com/scm/key"],
+        "https://github.com/my-org",
+        {"tool": "tool", "tool.map": "tool-map", "other": "renamed-other"},
+        max_workers=2
+    )
+    yield engine
+    engine.close()
+
+def test_rewrites_every_repository_of_the_mapping(engine):
+    contents = (
+        b"clone https://bitbucket.example.com/scm/key/tool.git\n"
+        b"see https://Bitbucket.example.com/projects/KEY/repos/OTHER/browse.\n"
+        b"and https://bitbucket.example.com/scm/key/tool.map\n"
+    )
+    assert engine.rewrite_contents(contents) == (
+        b"clone https://github.com/my-org/tool.git\n"
+        b"see https://github.com/my-org/renamed-other/browse.\n"
+        b"and https://github.com/my-org/tool-map\n"
+    )
+
+def test_leaves_unknown_repositories_and_longer_names_untouched(engine):
+    contents = b"https://bitbucket.example.com/scm/key/tool-extra and https://bitbucket.example.com/scm/key/unknown.git"
+    assert engine.rewrite_contents(contents) == contents
+
+def test_rewrite_file_keeps_a_trailing_period(engine, tmp_path):
+    file_path = tmp_path / "README.md"
+    file_path.write_bytes(b"Moved from https://bitbucket.example.com/scm/key/tool.")
+    assert engine.rewrite_file(str(file_path))
+    assert file_path.read_bytes() == b"Moved from https://github.com/my-org/tool."
+
+def test_rewrite_directory_skips_binary_unchanged_and_git_files(engine, tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "docs" / "setup.sh").write_bytes(b"git clone https://bitbucket.example.com/scm/key/other.git\n")
+    (tmp_path / "image.bin").write_bytes(b"\0https://bitbucket.example.com/scm/key/other.git")
+    (tmp_path / "unchanged.txt").write_bytes(b"nothing to rewrite")
+    (tmp_path / ".git" / "config").write_bytes(b"url = https://bitbucket.example.com/scm/key/other.git")
+    (tmp_path / "empty.txt").write_bytes(b"")
+
+    rewritten_files = engine.rewrite_directory(str(tmp_path))
+
+    assert rewritten_files == [str(tmp_path / "docs" / "setup.sh")]
+    assert (tmp_path / "docs" / "setup.sh").read_bytes() == b"git clone https://github.com/my-org/renamed-other.git\n"
+    assert (tmp_path / "image.bin").read_bytes() == b"\0https://bitbucket.example.com/scm/key/other.git"
+    assert (tmp_path / ".git" / "config").read_bytes() == b"url = https://bitbucket.example.com/scm/key/other.git"
+
+def test_worker_processes_are_reused_across_repositories(engine, tmp_path):
+    for repository in ["repo-1", "repo-2"]:
+        (tmp_path / repository).mkdir()
+        (tmp_path / repository / "README.md").write_bytes(b"https://bitbucket.example.com/scm/key/tool")
+    assert engine.rewrite_directory(str(tmp_path / "repo-1")) == [str(tmp_path / "repo-1" / "README.md")]
+    executor = engine._executor
+    assert engine.rewrite_directory(str(tmp_path / "repo-2")) == [str(tmp_path / "repo-2" / "README.md")]
+    assert engine._executor is executor
+    assert (tmp_path / "repo-2" / "README.md").read_bytes() == b"https://github.com/my-org/tool"